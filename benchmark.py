@@ -0,0 +1,351 @@
+"""
+Benchmark các script xử lý văn bản: thời gian, RSS đỉnh, cấp phát bộ nhớ
+
+Mỗi benchmark chạy trong một tiến trình con riêng (RSS đỉnh không lẫn giữa các bài):
+phần chuẩn bị (tạo dữ liệu, import) không tính giờ; đo wall time qua nhiều lần lặp,
+sau đó chạy thêm một lần dưới tracemalloc để lấy đỉnh cấp phát và số block còn sống
+(cấp phát phía Python — bộ nhớ C của lxml chỉ thấy qua RSS).
+
+Các bài đo:
+    docx_to_markdown:*     văn bản 30/2020/NĐ-CP (+ phụ lục) và nghị định tổng hợp lớn
+    convert_to_word:*      render Markdown demo → .docx (python-docx và bản streaming)
+    add_table:*            convert_to_word.add_table 1k / 10k / 100k hàng
+    favicon:*              create-favicon.py: master 1024 px + bộ .ico
+
+Cách dùng:
+    python benchmark.py                              # chạy tất cả, in bảng
+    python benchmark.py -k add_table -o result.json  # lọc theo tên, ghi JSON
+    python benchmark.py --save-baseline baseline.json
+    python benchmark.py --compare baseline.json      # exit 1 nếu chậm/tốn hơn ngưỡng
+    python benchmark.py --list
+"""
+import os
+import sys
+import gc
+import json
+import time
+import platform
+import argparse
+import statistics
+import subprocess
+import tracemalloc
+import importlib.util
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+LEGAL_DIR = SCRIPT_DIR / "docs" / "van-ban-phap-quy"
+DEMO_DIR = SCRIPT_DIR / "docs" / "demo"
+SOURCE_30_2020 = LEGAL_DIR / "nghi-dinh" / "30-2020-ND-CP" / "van-ban-goc" / "30.2020.NĐ-CP"
+CACHE_DIR = SCRIPT_DIR / ".bench-cache"
+RESULT_VERSION = 1
+DEFAULT_THRESHOLD = 0.10           # chậm/tốn hơn baseline >10% → regression
+# So sánh theo thời gian nhỏ nhất — ít nhiễu hơn trung vị khi máy đang bận
+COMPARED_METRICS = ("wall_min_s", "rss_peak_mb", "alloc_peak_mb")
+
+for path in (LEGAL_DIR, DEMO_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+
+# ============================================================
+# ĐO
+# ============================================================
+def peak_rss_mb():
+    """RSS đỉnh của tiến trình hiện tại (MB); None nếu nền tảng không hỗ trợ."""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / 2**20
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: byte
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def measure(fn, repeats):
+    """Gọi fn() repeats lần tính giờ, rồi một lần dưới tracemalloc → dict số đo."""
+    rss_start = peak_rss_mb()
+    times = []
+    for _ in range(repeats):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    rss_peak = peak_rss_mb()
+
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, alloc_peak = tracemalloc.get_traced_memory()
+    alloc_blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+    return {
+        "repeats": repeats,
+        "wall_s": [round(t, 6) for t in times],
+        "wall_min_s": round(min(times), 6),
+        "wall_median_s": round(statistics.median(times), 6),
+        "rss_start_mb": None if rss_start is None else round(rss_start, 1),
+        "rss_peak_mb": None if rss_peak is None else round(rss_peak, 1),
+        "alloc_peak_mb": round(alloc_peak / 2**20, 3),
+        "alloc_live_blocks": alloc_blocks,
+    }
+
+
+# ============================================================
+# DỮ LIỆU
+# ============================================================
+def synthetic_decree(path, articles=2000):
+    """Văn bản tổng hợp lớn từ generate_corpus.py (seed cố định, cache theo tham số)."""
+    path = Path(path)
+    if not path.is_file():
+        from generate_corpus import CorpusConfig, generate_document, write_docx
+        _, body = generate_document(seed=0, index=0, config=CorpusConfig(articles=(articles, articles)))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_docx(body, path)
+    return path
+
+
+def _load_favicon_module():
+    spec = importlib.util.spec_from_file_location("create_favicon", SCRIPT_DIR / "create-favicon.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ============================================================
+# CÁC BÀI ĐO — setup() trả về hàm được đo
+# ============================================================
+def _bench_docx_to_markdown(paths):
+    def setup(workdir):
+        from convert_word_to_md import iter_markdown
+        files = [str(p) for p in paths(workdir)]
+
+        def run():
+            for f in files:
+                for _ in iter_markdown(f):
+                    pass
+        return run
+    return setup
+
+
+def _bench_render(stream):
+    def setup(workdir):
+        sources = sorted(DEMO_DIR.glob("*.md"))
+        if stream:
+            from docx_stream import render_markdown_stream as render
+        else:
+            from convert_to_word import render_markdown as render
+
+        def run():
+            for i, md in enumerate(sources):
+                render(str(md), str(Path(workdir) / f"{i}.docx"))
+        return run
+    return setup
+
+
+def _bench_add_table(rows):
+    def setup(workdir):
+        from docx import Document
+        from convert_to_word import add_table, setup_page
+        headers = ["STT", "Họ và tên", "Đơn vị", "Chức vụ", "Ghi chú"]
+        data = [[str(i), f"Nguyễn Văn {i}", "UBND xã", "Công chức", ""] for i in range(rows)]
+
+        def run():
+            doc = Document()
+            setup_page(doc)
+            add_table(doc, headers, data, col_widths=[1.5, 5, 4, 3.5, 3])
+        return run
+    return setup
+
+
+def _bench_favicon(part):
+    def setup(workdir):
+        favicon = _load_favicon_module()
+        if part == "master":
+            return lambda: favicon.render_master(1024)
+
+        def run():
+            with open(os.devnull, "w") as null, redirect_stdout(null):
+                favicon.create_favicon(str(Path(workdir) / "favicon.ico"))
+        return run
+    return setup
+
+
+BENCHMARKS = {
+    # tên: (setup, số lần lặp)
+    "docx_to_markdown:30-2020":
+        (_bench_docx_to_markdown(lambda w: [SOURCE_30_2020 / "30_2020_ND_CP.docx"]), 5),
+    "docx_to_markdown:30-2020-phu-luc":
+        (_bench_docx_to_markdown(lambda w: sorted(SOURCE_30_2020.glob("Phuluc*.docx"))), 5),
+    "docx_to_markdown:synthetic-2k-dieu":
+        (_bench_docx_to_markdown(lambda w: [synthetic_decree(CACHE_DIR / "synthetic-2000.docx", 2000)]), 3),
+    "convert_to_word:render_markdown": (_bench_render(stream=False), 3),
+    "convert_to_word:render_markdown_stream": (_bench_render(stream=True), 3),
+    "add_table:1k": (_bench_add_table(1_000), 5),
+    "add_table:10k": (_bench_add_table(10_000), 3),
+    "add_table:100k": (_bench_add_table(100_000), 1),
+    "favicon:master-1024": (_bench_favicon("master"), 5),
+    "favicon:create_favicon": (_bench_favicon("ico"), 5),
+}
+
+
+def run_one(name, repeats=None):
+    """Chạy một benchmark trong tiến trình hiện tại."""
+    import tempfile
+    setup, default_repeats = BENCHMARKS[name]
+    with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+        fn = setup(workdir)
+        result = measure(fn, repeats or default_repeats)
+    return result
+
+
+def run_isolated(name, repeats=None, timeout=None):
+    """Chạy một benchmark trong tiến trình con; trả về dict số đo hoặc {"error": ...}."""
+    import tempfile
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        out = f.name
+    cmd = [sys.executable, str(Path(__file__).resolve()), "--child", name, "--child-output", out]
+    if repeats:
+        cmd += ["--repeats", str(repeats)]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        if proc.returncode != 0:
+            return {"error": (proc.stderr.strip().splitlines() or ["exit %d" % proc.returncode])[-1]}
+        with open(out, encoding="utf-8") as f:
+            return json.load(f)
+    except subprocess.TimeoutExpired:
+        return {"error": f"quá {timeout}s"}
+    finally:
+        if os.path.exists(out):
+            os.remove(out)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPT_DIR,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(names, repeats=None, timeout=None, progress=print):
+    results = {}
+    for name in names:
+        progress(f"⏱️  {name} ...")
+        results[name] = run_isolated(name, repeats, timeout)
+    return {
+        "version": RESULT_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+
+
+# ============================================================
+# SO SÁNH VỚI BASELINE
+# ============================================================
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """[(benchmark, metric, baseline, current, tỉ lệ, regression?)] cho các số đo chung."""
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or "error" in base or "error" in result:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = base.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            rows.append((name, metric, old, new, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def print_results(suite):
+    print(f"\n{'benchmark':<42} {'median':>10} {'min':>10} {'RSS đỉnh':>10} {'alloc đỉnh':>11}")
+    for name, r in suite["results"].items():
+        if "error" in r:
+            print(f"{name:<42} ❌ {r['error']}")
+            continue
+        rss = "-" if r["rss_peak_mb"] is None else f"{r['rss_peak_mb']:.1f} MB"
+        print(f"{name:<42} {r['wall_median_s'] * 1000:>8.1f}ms {r['wall_min_s'] * 1000:>8.1f}ms "
+              f"{rss:>10} {r['alloc_peak_mb']:>8.2f} MB")
+
+
+def print_comparison(rows, threshold):
+    print(f"\n{'benchmark':<42} {'số đo':<14} {'baseline':>11} {'hiện tại':>11} {'tỉ lệ':>7}")
+    for name, metric, old, new, ratio, regressed in rows:
+        mark = "⚠️" if regressed else ("✅" if ratio < 1 - threshold else "  ")
+        print(f"{name:<42} {metric:<14} {old:>11.4g} {new:>11.4g} {ratio:>6.2f}x {mark}")
+
+
+def _write_json(data, path):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark các script chuyển đổi văn bản")
+    parser.add_argument("-k", "--filter", action="append", help="Chỉ chạy benchmark có tên chứa chuỗi này")
+    parser.add_argument("-r", "--repeats", type=int, help="Ghi đè số lần lặp của mọi benchmark")
+    parser.add_argument("-o", "--output", help="Ghi kết quả JSON")
+    parser.add_argument("--save-baseline", metavar="FILE", help="Ghi kết quả làm baseline")
+    parser.add_argument("--compare", metavar="FILE", help="So với baseline, exit 1 nếu có regression")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Ngưỡng regression, tỉ lệ (mặc định {DEFAULT_THRESHOLD} = {DEFAULT_THRESHOLD * 100:.0f}%%)")
+    parser.add_argument("--timeout", type=float, help="Giới hạn giây cho mỗi benchmark")
+    parser.add_argument("--list", action="store_true", help="Liệt kê benchmark")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--child-output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _write_json(run_one(args.child, args.repeats), args.child_output)
+        sys.exit(0)
+
+    names = [n for n in BENCHMARKS if not args.filter or any(k in n for k in args.filter)]
+    if args.list:
+        for name in names:
+            print(f"  {name:<42} × {BENCHMARKS[name][1]}")
+        sys.exit(0)
+    if not names:
+        print(f"❌ Không có benchmark khớp: {', '.join(args.filter)}")
+        sys.exit(1)
+    baseline = None
+    if args.compare:
+        if not os.path.isfile(args.compare):
+            print(f"❌ Không tìm thấy baseline: {args.compare}")
+            sys.exit(1)
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    suite = run_suite(names, args.repeats, args.timeout)
+    print_results(suite)
+    for path in (args.output, args.save_baseline):
+        if path:
+            _write_json(suite, path)
+            print(f"✅ Đã ghi kết quả: {path}")
+
+    failed = [n for n, r in suite["results"].items() if "error" in r]
+    if baseline is not None:
+        rows = compare(suite, baseline, args.threshold)
+        print_comparison(rows, args.threshold)
+        regressions = [r for r in rows if r[5]]
+        if regressions:
+            print(f"\n⚠️ {len(regressions)} số đo vượt baseline quá {args.threshold:.0%} "
+                  f"(baseline commit {baseline.get('commit')})")
+            sys.exit(1)
+        print(f"\n🎉 Không có regression so với baseline (commit {baseline.get('commit')})")
+    if failed:
+        sys.exit(1)
@@ -1,71 +1,186 @@
 """
 Tạo favicon.ico cho VanBanPlus website
 Chữ "V" trắng trên nền gradient xanh, giống logo trên Navbar
+
+Mọi kích thước được thu nhỏ từ MỘT ảnh master độ phân giải cao (mặc định 1024 px):
+nền gradient và mặt nạ bo góc tính bằng mảng NumPy, khử răng cưa bằng siêu lấy mẫu
+(supersample × supersample điểm mỗi pixel) thay cho vòng lặp putpixel từng điểm.
+
+Cách dùng:
+    python create-favicon.py                                   # → vanbanplus-api/public/favicon.ico
+    python create-favicon.py -o favicon.ico --png-dir icons/   # + bộ PNG 16..1024
+    python create-favicon.py --font /usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf
 """
 from PIL import Image, ImageDraw, ImageFont
+import numpy as np
+import argparse
 import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(SCRIPT_DIR, "vanbanplus-api", "public", "favicon.ico")
+ICO_SIZES = [16, 32, 48, 64, 128, 256]
+PNG_SIZES = [16, 32, 48, 64, 128, 180, 192, 256, 512, 1024]
+MASTER_SIZE = 1024
+SUPERSAMPLE = 4
+
+# Gradient background (primary-500 to primary-700: #3b82f6 to #1d4ed8)
+COLOR_TOP = (59, 130, 246)
+COLOR_BOTTOM = (29, 78, 216)
+LETTER = "V"
+LETTER_SCALE = 0.65
+CORNER_RATIO = 0.2                # bán kính bo góc = size // 5
 
-def create_favicon():
-    sizes = [16, 32, 48, 64, 128, 256]
-    images = []
-    
-    for size in sizes:
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
-        # Gradient background (primary-500 to primary-700: #3b82f6 to #1d4ed8)
-        for y in range(size):
-            ratio = y / size
-            r = int(59 + (29 - 59) * ratio)
-            g = int(130 + (78 - 130) * ratio)
-            b = int(246 + (216 - 246) * ratio)
-            for x in range(size):
-                # Rounded corners
-                corner_radius = size // 5
-                in_rect = True
-                # Check corners
-                for cx, cy in [(corner_radius, corner_radius), 
-                               (size - corner_radius - 1, corner_radius),
-                               (corner_radius, size - corner_radius - 1), 
-                               (size - corner_radius - 1, size - corner_radius - 1)]:
-                    if (x < corner_radius or x > size - corner_radius - 1) and \
-                       (y < corner_radius or y > size - corner_radius - 1):
-                        dx = x - cx
-                        dy = y - cy
-                        if dx * dx + dy * dy > corner_radius * corner_radius:
-                            in_rect = False
-                            break
-                if in_rect:
-                    img.putpixel((x, y), (r, g, b, 255))
-        
-        # Draw "V" letter
+# Font chữ đậm theo thứ tự ưu tiên: Windows, Linux (DejaVu/Liberation), macOS
+FONT_CANDIDATES = [
+    "C:/Windows/Fonts/arialbd.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+    "/Library/Fonts/Arial Bold.ttf",
+    "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+]
+
+
+def load_font(font_size, font_path=None):
+    """font_path (hoặc biến môi trường FAVICON_FONT) → font hệ thống → font mặc định của Pillow."""
+    candidates = [p for p in (font_path, os.environ.get("FAVICON_FONT")) if p] + FONT_CANDIDATES
+    for path in candidates:
         try:
-            font_size = int(size * 0.65)
-            font = ImageFont.truetype("C:/Windows/Fonts/arialbd.ttf", font_size)
-        except:
-            font = ImageFont.load_default()
-        
-        bbox = draw.textbbox((0, 0), "V", font=font)
-        text_w = bbox[2] - bbox[0]
-        text_h = bbox[3] - bbox[1]
-        x = (size - text_w) // 2
-        y = (size - text_h) // 2 - bbox[1]
-        
-        draw.text((x, y), "V", fill=(255, 255, 255, 255), font=font)
-        images.append(img)
-    
-    # Save as .ico
-    output_path = os.path.join("D:\\AIVanBanCaNhan", "vanbanplus-api", "public", "favicon.ico")
-    # ICO format: save the largest, include all sizes
-    images[-1].save(
-        output_path, 
-        format='ICO', 
-        sizes=[(s, s) for s in sizes],
-        append_images=images[:-1]
-    )
+            return ImageFont.truetype(path, font_size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size=font_size)
+    except TypeError:             # Pillow < 10.1: font bitmap cố định
+        return ImageFont.load_default()
+
+
+def gradient(size):
+    """Mảng (size, size, 3) uint8: gradient dọc COLOR_TOP → COLOR_BOTTOM."""
+    ratio = np.arange(size, dtype=np.float32) / size
+    top = np.array(COLOR_TOP, dtype=np.float32)
+    bottom = np.array(COLOR_BOTTOM, dtype=np.float32)
+    rows = (top + (bottom - top) * ratio[:, None]).astype(np.uint8)      # (size, 3)
+    return np.broadcast_to(rows[:, None, :], (size, size, 3))
+
+
+def rounded_mask(size, radius, supersample=SUPERSAMPLE):
+    """
+    Mặt nạ alpha (size, size) uint8 của hình vuông bo góc.
+
+    Chỉ bốn ô góc (cạnh ⌈radius⌉) cần khử răng cưa: tính một góc với supersample²
+    điểm mẫu mỗi pixel (khoảng cách tách được theo trục → hai vector + broadcast),
+    ba góc còn lại là ảnh lật của nó; phần còn lại của mặt nạ là 255.
+    """
+    mask = np.full((size, size), 255, dtype=np.uint8)
+    k = min(int(np.ceil(radius)), size // 2)
+    if k <= 0:
+        return mask
+    coords = (np.arange(k * supersample, dtype=np.float32) + 0.5) / supersample   # tâm điểm mẫu
+    d = np.maximum(radius - coords, 0)                     # khoảng vượt ra ngoài tâm góc
+    inside = (d[:, None] ** 2 + d[None, :] ** 2) <= radius * radius
+    coverage = inside.reshape(k, supersample, k, supersample).sum(axis=(1, 3), dtype=np.uint32)
+    corner = (coverage * 255 // (supersample * supersample)).astype(np.uint8)
+    mask[:k, :k] = corner
+    mask[:k, -k:] = corner[:, ::-1]
+    mask[-k:, :k] = corner[::-1, :]
+    mask[-k:, -k:] = corner[::-1, ::-1]
+    return mask
+
+
+def render_master(size=MASTER_SIZE, supersample=SUPERSAMPLE, font_path=None):
+    """Ảnh RGBA size×size: nền gradient bo góc + chữ V trắng căn giữa."""
+    rgba = np.empty((size, size, 4), dtype=np.uint8)
+    rgba[..., :3] = gradient(size)
+    rgba[..., 3] = rounded_mask(size, size * CORNER_RATIO, supersample)
+    img = Image.fromarray(rgba, "RGBA")
+
+    draw = ImageDraw.Draw(img)
+    font = load_font(int(size * LETTER_SCALE), font_path)
+    bbox = draw.textbbox((0, 0), LETTER, font=font)
+    text_w = bbox[2] - bbox[0]
+    text_h = bbox[3] - bbox[1]
+    x = (size - text_w) // 2 - bbox[0]
+    y = (size - text_h) // 2 - bbox[1]
+    draw.text((x, y), LETTER, fill=(255, 255, 255, 255), font=font)
+    return img
+
+
+def render_sizes(master, sizes):
+    """
+    {size: Image} thu nhỏ từ master bằng Lanczos (Pillow tự nhân alpha trước khi lọc).
+
+    Đi từ lớn đến nhỏ, mỗi kích thước lấy nguồn là ảnh nhỏ nhất đã có mà còn ≥ 2 lần
+    nó (256 → 128 → 64...) thay vì luôn từ master, giữ chất lượng mà bớt phần lớn phép lọc.
+    """
+    out = {}
+    sources = [master]
+    for size in sorted(set(sizes), reverse=True):
+        if size == master.width:
+            out[size] = master
+            continue
+        src = min((im for im in sources if im.width >= 2 * size), key=lambda im: im.width, default=master)
+        out[size] = src.resize((size, size), Image.LANCZOS)
+        sources.append(out[size])
+    return out
+
+
+def save_ico(images, output_path):
+    """images: {size: Image} → một file .ico nhiều kích thước."""
+    sizes = sorted(images)
+    largest = images[sizes[-1]]
+    largest.save(output_path, format="ICO", sizes=[(s, s) for s in sizes],
+                 append_images=[images[s] for s in sizes[:-1]])
+    return output_path
+
+
+def save_png_set(images, output_dir, pattern="icon-{size}.png"):
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for size, img in sorted(images.items()):
+        path = os.path.join(output_dir, pattern.format(size=size))
+        img.save(path, format="PNG", optimize=True)
+        paths.append(path)
+    return paths
+
+
+def create_favicon(output_path=DEFAULT_OUTPUT, sizes=ICO_SIZES, master=None, font_path=None):
+    """Tạo favicon.ico (mọi kích thước trong sizes) từ master; trả về master để dùng lại."""
+    if master is None:
+        master = render_master(max(MASTER_SIZE, max(sizes)), font_path=font_path)
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    save_ico(render_sizes(master, sizes), output_path)
     print(f"✅ Favicon created: {output_path}")
-    print(f"   Sizes: {', '.join(f'{s}x{s}' for s in sizes)}")
+    print(f"   Sizes: {', '.join(f'{s}x{s}' for s in sorted(sizes))}")
     print(f"   File size: {os.path.getsize(output_path) / 1024:.1f} KB")
+    return master
+
+
+def _parse_sizes(text):
+    return [int(s) for s in text.split(",") if s.strip()]
+
 
 if __name__ == "__main__":
-    create_favicon()
+    parser = argparse.ArgumentParser(description="Tạo favicon/icon VanBanPlus từ một master độ phân giải cao")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="File .ico đầu ra")
+    parser.add_argument("--sizes", default=",".join(map(str, ICO_SIZES)), help="Kích thước trong .ico")
+    parser.add_argument("--png-dir", help="Ghi thêm bộ PNG (icon-<size>.png) vào thư mục này")
+    parser.add_argument("--png-sizes", default=",".join(map(str, PNG_SIZES)), help="Kích thước bộ PNG")
+    parser.add_argument("--master-size", type=int, default=MASTER_SIZE, help="Cạnh ảnh master (px)")
+    parser.add_argument("--supersample", type=int, default=SUPERSAMPLE, help="Số điểm mẫu mỗi cạnh pixel")
+    parser.add_argument("--font", help="Font .ttf cho chữ V (mặc định dò font hệ thống)")
+    args = parser.parse_args()
+
+    ico_sizes = _parse_sizes(args.sizes)
+    png_sizes = _parse_sizes(args.png_sizes) if args.png_dir else []
+    largest = max(ico_sizes + png_sizes)
+    if args.master_size < largest:
+        print(f"❌ --master-size {args.master_size} nhỏ hơn kích thước lớn nhất cần tạo ({largest})")
+        sys.exit(1)
+
+    master = render_master(args.master_size, args.supersample, args.font)
+    create_favicon(args.output, ico_sizes, master)
+    if png_sizes:
+        paths = save_png_set(render_sizes(master, png_sizes), args.png_dir)
+        print(f"✅ PNG: {len(paths)} file → {args.png_dir}")
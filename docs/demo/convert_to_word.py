@@ -1,8 +1,13 @@
 """
 Convert demo handout documents from Markdown to professionally formatted Word (.docx) files.
-Run: python docs/demo/convert_to_word.py
-Output: docs/demo/01_TO_GIOI_THIEU_SAN_PHAM.docx
-        docs/demo/02_HUONG_DAN_SU_DUNG_NHANH.docx
+Run: python docs/demo/convert_to_word.py                 # mọi .md trong docs/demo, chỉ file đã đổi
+     python docs/demo/convert_to_word.py a.md b.md -j 4  # file cụ thể, 4 tiến trình
+     python docs/demo/convert_to_word.py --force         # build lại tất cả
+Output: <tên file>.docx cạnh file .md (hoặc trong -o <thư mục>)
+
+Markdown được đọc một lượt thành dòng sự kiện (heading, para, bullet, numbered,
+table, code, align...) rồi render thẳng bằng các helper add_heading_styled /
+add_para / add_bullet / add_table — sửa nội dung chỉ cần sửa file .md.
 """
 
 from docx import Document
@@ -12,7 +17,14 @@ from docx.enum.table import WD_TABLE_ALIGNMENT
 from docx.enum.section import WD_ORIENT
 from docx.oxml.ns import qn, nsdecls
 from docx.oxml import parse_xml
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from copy import deepcopy
+from functools import lru_cache
+import argparse
+import hashlib
+import json
 import os
+import re
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
@@ -29,43 +41,42 @@ TABLE_HEADER_BG = "1B4F72"                     # hex for table header shading
 TABLE_ALT_BG = "EBF5FB"                        # hex for alternate row
 FONT_NAME = "Times New Roman"
 FONT_NAME_HEADING = "Arial"
-
-
-def set_cell_shading(cell, hex_color):
-    """Set background shading for a table cell."""
-    shading = parse_xml(f'<w:shd {nsdecls("w")} w:fill="{hex_color}"/>')
-    cell._tc.get_or_add_tcPr().append(shading)
-
-
-def add_table_borders(table):
-    """Add thin borders to all cells in a table."""
-    tbl = table._tbl
-    tblPr = tbl.tblPr if tbl.tblPr is not None else parse_xml(f'<w:tblPr {nsdecls("w")}/>')
-    borders = parse_xml(
-        f'<w:tblBorders {nsdecls("w")}>'
-        '  <w:top w:val="single" w:sz="4" w:space="0" w:color="BFBFBF"/>'
-        '  <w:left w:val="single" w:sz="4" w:space="0" w:color="BFBFBF"/>'
-        '  <w:bottom w:val="single" w:sz="4" w:space="0" w:color="BFBFBF"/>'
-        '  <w:right w:val="single" w:sz="4" w:space="0" w:color="BFBFBF"/>'
-        '  <w:insideH w:val="single" w:sz="4" w:space="0" w:color="BFBFBF"/>'
-        '  <w:insideV w:val="single" w:sz="4" w:space="0" w:color="BFBFBF"/>'
-        '</w:tblBorders>'
-    )
-    tblPr.append(borders)
+TABLE_BORDER = "BFBFBF"
+TABLE_STYLE = "VBP Table"              # table style: viền, header, dải màu xen kẽ
+TABLE_TEXT_STYLE = "VBP Table Text"    # paragraph style cho chữ trong ô
+TABLE_STYLE_ID = "VBPTable"
+TABLE_TEXT_STYLE_ID = "VBPTableText"
 
 
 def make_run(paragraph, text, bold=False, italic=False, size=12, color=BLACK, font=FONT_NAME):
     run = paragraph.add_run(text)
-    run.bold = bold
-    run.italic = italic
-    run.font.size = Pt(size)
-    run.font.color.rgb = color
-    run.font.name = font
-    r = run._element
-    r.rPr.rFonts.set(qn('w:eastAsia'), font)
+    if bold:
+        run.bold = True
+    if italic:
+        run.italic = True
+    # Normal style (setup_page) đã là Times New Roman 12pt, kể cả eastAsia —
+    # chỉ ghi rPr cho thuộc tính khác mặc định.
+    if size != 12:
+        run.font.size = Pt(size)
+    if color != BLACK:
+        run.font.color.rgb = color
+    if font != FONT_NAME:
+        run.font.name = font
+        run._element.rPr.rFonts.set(qn('w:eastAsia'), font)
     return run
 
 
+def add_runs(paragraph, text, bold=False, italic=False, size=12, color=BLACK, font=FONT_NAME):
+    """text là chuỗi, hoặc list inline [(text, bold, italic)] từ parse_inline ("\n" = xuống dòng)."""
+    if isinstance(text, str):
+        return make_run(paragraph, text, bold=bold, italic=italic, size=size, color=color, font=font)
+    for t, b, i in text:
+        if t == "\n":
+            paragraph.add_run().add_break()
+        else:
+            make_run(paragraph, t, bold=bold or b, italic=italic or i, size=size, color=color, font=font)
+
+
 def add_heading_styled(doc, text, level=1):
     p = doc.add_paragraph()
     p.alignment = WD_ALIGN_PARAGRAPH.LEFT
@@ -94,86 +105,103 @@ def add_para(doc, text="", bold=False, italic=False, size=12, color=BLACK, align
     p.alignment = align
     p.space_after = Pt(space_after)
     if text:
-        make_run(p, text, bold=bold, italic=italic, size=size, color=color)
+        add_runs(p, text, bold=bold, italic=italic, size=size, color=color)
     return p
 
 
-def add_bullet(doc, text, bold_prefix="", size=12):
-    p = doc.add_paragraph(style='List Bullet')
+def add_bullet(doc, text, bold_prefix="", size=12, level=0):
+    p = doc.add_paragraph(style='List Bullet' if level == 0 else 'List Bullet 2')
     if bold_prefix:
         make_run(p, bold_prefix, bold=True, size=size)
-        make_run(p, text, size=size)
-    else:
-        make_run(p, text, size=size)
+    add_runs(p, text, size=size)
     return p
 
 
-def add_table(doc, headers, rows, col_widths=None):
-    """Add a formatted table with headers and data rows."""
-    table = doc.add_table(rows=1 + len(rows), cols=len(headers))
-    table.alignment = WD_TABLE_ALIGNMENT.CENTER
-    add_table_borders(table)
-
-    # Header row
-    for i, h in enumerate(headers):
-        cell = table.rows[0].cells[i]
-        cell.text = ""
-        p = cell.paragraphs[0]
-        make_run(p, h, bold=True, size=11, color=WHITE, font=FONT_NAME)
-        set_cell_shading(cell, TABLE_HEADER_BG)
-
-    # Data rows
-    for r_idx, row_data in enumerate(rows):
-        for c_idx, val in enumerate(row_data):
-            cell = table.rows[r_idx + 1].cells[c_idx]
-            cell.text = ""
-            p = cell.paragraphs[0]
-            # Bold first column
-            is_bold = (c_idx == 0)
-            make_run(p, val, bold=is_bold, size=11)
-            if r_idx % 2 == 1:
-                set_cell_shading(cell, TABLE_ALT_BG)
-
-    # Column widths
-    if col_widths:
-        for row in table.rows:
-            for i, w in enumerate(col_widths):
-                row.cells[i].width = Cm(w)
+# ============================================================
+# TABLE ENGINE — style có tên + fragment XML dựng sẵn
+# ============================================================
+# Header, dải màu xen kẽ và cột đầu in đậm nằm trong conditional formatting của
+# table style (tblStylePr), chữ trong ô dùng paragraph style TABLE_TEXT_STYLE —
+# mỗi ô chỉ còn <w:p><w:r><w:t>, không có tcPr/rPr riêng. Mỗi hàng là bản
+# deepcopy của một <w:tr> mẫu đã parse sẵn, nên bảng N hàng dựng trong O(N).
+W_T = qn('w:t')
+
+
+def _table_styles_xml():
+    border = f'w:val="single" w:sz="4" w:space="0" w:color="{TABLE_BORDER}"'
+    return (
+        f'<w:style {nsdecls("w")} w:type="paragraph" w:customStyle="1" w:styleId="{TABLE_TEXT_STYLE_ID}">'
+        f'<w:name w:val="{TABLE_TEXT_STYLE}"/><w:basedOn w:val="Normal"/><w:qFormat/>'
+        '<w:pPr><w:spacing w:before="0" w:after="0" w:line="240" w:lineRule="auto"/></w:pPr>'
+        f'<w:rPr><w:rFonts w:ascii="{FONT_NAME}" w:hAnsi="{FONT_NAME}" w:eastAsia="{FONT_NAME}"/>'
+        '<w:sz w:val="22"/><w:szCs w:val="22"/></w:rPr></w:style>',
+
+        f'<w:style {nsdecls("w")} w:type="table" w:customStyle="1" w:styleId="{TABLE_STYLE_ID}">'
+        f'<w:name w:val="{TABLE_STYLE}"/><w:basedOn w:val="TableNormal"/><w:uiPriority w:val="59"/>'
+        '<w:tblPr><w:tblStyleRowBandSize w:val="1"/><w:jc w:val="center"/>'
+        f'<w:tblBorders><w:top {border}/><w:left {border}/><w:bottom {border}/>'
+        f'<w:right {border}/><w:insideH {border}/><w:insideV {border}/></w:tblBorders>'
+        '<w:tblCellMar><w:left w:w="108" w:type="dxa"/><w:right w:w="108" w:type="dxa"/></w:tblCellMar>'
+        '</w:tblPr>'
+        '<w:tblStylePr w:type="firstRow"><w:rPr><w:b/><w:bCs/>'
+        f'<w:color w:val="{WHITE}"/></w:rPr><w:trPr><w:tblHeader/></w:trPr>'
+        f'<w:tcPr><w:shd w:val="clear" w:color="auto" w:fill="{TABLE_HEADER_BG}"/></w:tcPr></w:tblStylePr>'
+        '<w:tblStylePr w:type="firstCol"><w:rPr><w:b/><w:bCs/></w:rPr></w:tblStylePr>'
+        '<w:tblStylePr w:type="band2Horz">'
+        f'<w:tcPr><w:shd w:val="clear" w:color="auto" w:fill="{TABLE_ALT_BG}"/></w:tcPr></w:tblStylePr>'
+        '</w:style>',
+    )
 
-    doc.add_paragraph()  # spacing after table
-    return table
 
+def ensure_table_styles(doc):
+    """Thêm TABLE_STYLE / TABLE_TEXT_STYLE vào styles.xml của doc (một lần mỗi tài liệu)."""
+    styles = doc.styles.element
+    if styles.find(f"{qn('w:style')}[@{qn('w:styleId')}='{TABLE_STYLE_ID}']") is not None:
+        return
+    for xml in _table_styles_xml():
+        styles.append(parse_xml(xml))
 
-def add_beta_watermark(doc):
-    """Add a prominent beta/confidentiality notice at top."""
-    # Warning box
-    p = doc.add_paragraph()
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p.space_before = Pt(0)
-    p.space_after = Pt(2)
-    make_run(p, "⚠ TÀI LIỆU NỘI BỘ — KHÔNG LƯU HÀNH CÔNG KHAI ⚠", bold=True, size=12, color=RED_BETA, font=FONT_NAME_HEADING)
 
-    p2 = doc.add_paragraph()
-    p2.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p2.space_after = Pt(12)
-    make_run(p2, "Phần mềm đang trong giai đoạn thử nghiệm (Beta). Nội dung có thể thay đổi khi phát hành chính thức.", italic=True, size=10, color=RED_BETA)
+@lru_cache(maxsize=64)
+def _row_template(widths_twips, header=False):
+    """<w:tr> mẫu với số ô/độ rộng cho trước — parse một lần, sau đó chỉ deepcopy."""
+    cells = "".join(
+        f'<w:tc><w:tcPr><w:tcW w:w="{w}" w:type="dxa"/></w:tcPr>'
+        f'<w:p><w:pPr><w:pStyle w:val="{TABLE_TEXT_STYLE_ID}"/></w:pPr>'
+        '<w:r><w:t xml:space="preserve"></w:t></w:r></w:p></w:tc>'
+        for w in widths_twips
+    )
+    tr_pr = "<w:trPr><w:tblHeader/></w:trPr>" if header else ""
+    return parse_xml(f'<w:tr {nsdecls("w")}>{tr_pr}{cells}</w:tr>')
 
 
-def add_footer_beta(doc):
-    """Add beta confidentiality reminder at the bottom."""
-    doc.add_paragraph()
-    p = doc.add_paragraph()
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    make_run(p, "─" * 60, size=8, color=GRAY_LIGHT)
+def _append_row(tbl, template, values):
+    tr = deepcopy(template)
+    for t, val in zip(tr.iter(W_T), values):
+        t.text = "" if val is None else str(val)
+    tbl.append(tr)
+
 
-    p2 = doc.add_paragraph()
-    p2.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p2.space_after = Pt(2)
-    make_run(p2, "⚠ Tài liệu nội bộ — Phiên bản Beta, chưa phát hành chính thức.", italic=True, size=9, color=RED_BETA)
+def add_table(doc, headers, rows, col_widths=None, total_width=17.0):
+    """Add a formatted table with headers and data rows (named style, banded rows)."""
+    ensure_table_styles(doc)
+    table = doc.add_table(rows=0, cols=len(headers))
+    table.style = TABLE_STYLE
+    table.alignment = WD_TABLE_ALIGNMENT.CENTER
+
+    widths = col_widths or [total_width / len(headers)] * len(headers)
+    twips = tuple(int(round(w / 2.54 * 1440)) for w in widths)
+    tbl = table._tbl
+    for grid_col, w in zip(tbl.tblGrid.iter(qn('w:gridCol')), twips):
+        grid_col.set(qn('w:w'), str(w))
 
-    p3 = doc.add_paragraph()
-    p3.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    make_run(p3, "Không sao chép, phân phối khi chưa được sự đồng ý của đơn vị phát triển.", italic=True, size=9, color=GRAY_LIGHT)
+    _append_row(tbl, _row_template(twips, header=True), headers)
+    template = _row_template(twips)
+    for row_data in rows:
+        _append_row(tbl, template, row_data)
+
+    doc.add_paragraph()  # spacing after table
+    return table
 
 
 def setup_page(doc, orientation="portrait"):
@@ -200,421 +228,327 @@ def setup_page(doc, orientation="portrait"):
 
 
 # ============================================================
-# DOCUMENT 1: TỜ GIỚI THIỆU SẢN PHẨM
+# MARKDOWN → EVENT STREAM
 # ============================================================
-def create_doc1():
-    doc = Document()
-    setup_page(doc)
-    add_beta_watermark(doc)
-
-    # ── TITLE ──
-    p = doc.add_paragraph()
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p.space_before = Pt(12)
-    make_run(p, "PHẦN MỀM QUẢN LÝ VĂN BẢN THÔNG MINH", bold=True, size=14, color=BLUE_PRIMARY, font=FONT_NAME_HEADING)
-
-    p2 = doc.add_paragraph()
-    p2.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p2.space_after = Pt(4)
-    make_run(p2, "VANBANPLUS", bold=True, size=22, color=BLUE_ACCENT, font=FONT_NAME_HEADING)
-
-    p3 = doc.add_paragraph()
-    p3.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p3.space_after = Pt(2)
-    make_run(p3, "Phiên bản Beta — Tháng 02/2026", bold=True, size=11, color=GRAY_LIGHT)
-
-    p4 = doc.add_paragraph()
-    p4.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p4.space_after = Pt(2)
-    make_run(p4, "Đơn vị phát triển: Công ty TNHH Gia Kiệm Số", italic=True, size=11)
-    p5 = doc.add_paragraph()
-    p5.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p5.space_after = Pt(2)
-    make_run(p5, "Website công ty: https://giakiemso.com", italic=True, size=11, color=BLUE_ACCENT)
-    p6 = doc.add_paragraph()
-    p6.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p6.space_after = Pt(12)
-    make_run(p6, "Website phần mềm: https://vanbanplus.giakiemso.com", italic=True, size=11, color=BLUE_ACCENT)
-
-    # ── SECTION: Giới thiệu ──
-    add_heading_styled(doc, "Phần mềm VanBanPlus là gì?", level=1)
-    add_para(doc, "VanBanPlus là công cụ hỗ trợ cá nhân dành cho cán bộ, công chức, viên chức — giúp quản lý, theo dõi văn bản và soạn thảo văn bản nhanh hơn nhờ ứng dụng trí tuệ nhân tạo (AI).")
-    add_para(doc, "Phần mềm được cài đặt trên máy tính cá nhân. Dữ liệu lưu tại máy người dùng, đảm bảo an toàn thông tin.")
-    add_para(doc, "⚠ Lưu ý: VanBanPlus là sổ tay công việc cá nhân — không thay thế hệ thống quản lý văn bản tập trung của cơ quan (eGov, iDesk, VNPT-iOffice...).", italic=True, size=11, color=GRAY_LIGHT)
-
-    # ── Đối tượng ──
-    add_heading_styled(doc, "Đối tượng sử dụng", level=1)
-    add_table(doc,
-        headers=["Đối tượng", "Dùng VanBanPlus để"],
-        rows=[
-            ["Cán bộ Văn phòng – Thống kê", "Nhập văn bản đến (scan PDF), AI soạn văn bản trả lời, theo dõi deadline, xuất báo cáo"],
-            ["Lãnh đạo (Chủ tịch, Phó CT)", "Xem văn bản đến, ghi chú phân công, theo dõi tiến độ xử lý, duyệt nội dung"],
-            ["Văn thư", "AI scan hàng loạt file PDF/ảnh, lưu sổ theo dõi, xuất danh sách văn bản"],
-            ["Cán bộ chuyên môn", "Quản lý văn bản theo lĩnh vực, AI soạn chuyên ngành, lưu ảnh hiện trường"],
-        ],
-        col_widths=[5, 12]
-    )
-    add_para(doc, "Hỗ trợ hơn 70 loại hình cơ quan: UBND xã/huyện/tỉnh, HĐND, Đảng ủy, MTTQ, Hội Nông dân, Hội Phụ nữ, Đoàn Thanh niên, Hội Cựu chiến binh, các Sở ban ngành, Trường học, Trạm Y tế, Bệnh viện...", italic=True, size=11)
-
-    # ── NHÓM 1 ──
-    add_heading_styled(doc, "Nhóm 1 — Quản lý văn bản và cuộc họp", level=1)
-    add_para(doc, "Không cần Internet. Hoạt động hoàn toàn trên máy tính.", italic=True, size=11, color=GRAY_LIGHT)
-
-    add_table(doc,
-        headers=["Chức năng", "Mô tả"],
-        rows=[
-            ["Quản lý VB đi/đến/nội bộ", "Tiếp nhận, phân loại, lưu trữ, tra cứu. Hỗ trợ đầy đủ 29 loại văn bản theo Điều 7, NĐ 30/2020/NĐ-CP"],
-            ["Cây thư mục phân cấp", "Văn bản đến / Đi / Nội bộ / Lưu trữ. Tạo thư mục con không giới hạn"],
-            ["Tìm kiếm và lọc", "Tìm theo từ khóa (hỗ trợ không dấu), lọc theo loại, ngày, người ký, hướng VB"],
-            ["File đính kèm", "Đính kèm Word, PDF, Excel, ảnh. Đánh dấu file chính"],
-            ["Sao văn bản", "Sao y, Sao lục, Trích sao — theo Điều 25–27, NĐ 30/2020"],
-            ["Xuất file Word", "Đúng thể thức NĐ 30/2020 và TT 01/2011/TT-BNV. In trình ký được ngay"],
-            ["Quản lý cuộc họp", "22 loại cuộc họp. Theo dõi người tham dự, nhiệm vụ, tiến độ. Xuất biên bản, kết luận"],
-            ["Lịch tổng hợp", "Gom deadline văn bản, cuộc họp, nhiệm vụ vào 1 lịch. Phân biệt theo màu"],
-            ["Thống kê", "So sánh theo tháng/quý/năm. Xuất Excel"],
-            ["Album ảnh", "Lưu ảnh theo danh mục cơ quan. Upload/tải từ website"],
-            ["Tra cứu pháp quy", "NĐ 30/2020 toàn văn, 38 Điều, 7 Chương, 6 Phụ lục. Tìm kiếm nhanh"],
-            ["Sao lưu tự động", "Tự động sao lưu mỗi lần mở phần mềm. Khôi phục 1 bước"],
-        ],
-        col_widths=[5, 12]
-    )
-
-    # ── NHÓM 2 ──
-    add_heading_styled(doc, "Nhóm 2 — Trí tuệ nhân tạo (AI)", level=1)
-    add_para(doc, "Cần kết nối Internet khi sử dụng.", italic=True, size=11, color=GRAY_LIGHT)
-
-    add_table(doc,
-        headers=["Chức năng AI", "Mô tả", "Thời gian"],
-        rows=[
-            ["AI Scan trích xuất", "Chọn file PDF hoặc ảnh scan → AI tự đọc và điền 14 trường thông tin. Hỗ trợ xử lý nhiều file cùng lúc", "~15 giây/file"],
-            ["AI Soạn thảo", "Chọn mẫu (41 mẫu có sẵn) → nhập thông tin chính → AI soạn bản nháp hoàn chỉnh, đúng thể thức NĐ 30/2020", "~20 giây"],
-            ["AI Kiểm tra", "Kiểm tra 8 nhóm lỗi: chính tả, ngữ pháp, thể thức, căn cứ pháp lý, văn phong, nơi nhận, xung đột, gợi ý", "~15 giây"],
-            ["AI Tham mưu", "Phân tích VB đến → đề xuất: ai xử lý, deadline, cần phúc đáp bằng gì, rủi ro nếu chậm trễ", "~15 giây"],
-            ["AI Tóm tắt", "Tóm tắt VB dài (Nghị định, Thông tư) thành 10 mục: nội dung chính, đối tượng, thời hạn, tác động...", "~20 giây"],
-            ["AI Báo cáo định kỳ", "Nhập số liệu thô → AI viết báo cáo hoàn chỉnh: kết quả, đánh giá, phương hướng. Tự tính tỷ lệ", "~30 giây"],
-        ],
-        col_widths=[4, 10, 3]
-    )
-
-    # ── Hiệu quả ──
-    add_heading_styled(doc, "Hiệu quả ước tính", level=1)
-
-    add_table(doc,
-        headers=["Công việc", "Cách làm hiện tại", "Với VanBanPlus"],
-        rows=[
-            ["Nhập 1 VB từ file PDF", "10–15 phút", "2 phút"],
-            ["Soạn 1 VB hành chính", "45–90 phút", "5–10 phút"],
-            ["Kiểm tra VB trước trình ký", "Bị trả sửa 2–3 lần", "Giảm 70% lỗi"],
-            ["Phân tích 1 VB đến", "30–60 phút", "3 phút"],
-            ["Tóm tắt 1 VB dài", "2–3 giờ", "1 phút"],
-            ["Viết 1 báo cáo định kỳ", "3–4 giờ", "15 phút"],
-            ["Tra cứu VB cũ", "10–15 phút", "Vài giây"],
-        ],
-        col_widths=[5, 5, 5]
-    )
-    add_para(doc, "Ước tính cho 1 cán bộ Văn phòng: Tiết kiệm khoảng 3–5 giờ mỗi ngày.", bold=True, size=12, color=BLUE_PRIMARY)
-
-    # ── Yêu cầu hệ thống ──
-    add_heading_styled(doc, "Yêu cầu hệ thống", level=1)
-    add_table(doc,
-        headers=["Yêu cầu", "Chi tiết"],
-        rows=[
-            ["Hệ điều hành", "Windows 10 trở lên (64-bit)"],
-            ["RAM", "Tối thiểu 4 GB"],
-            ["Ổ cứng", "Khoảng 200 MB cho phần mềm"],
-            ["Internet", "Không bắt buộc cho quản lý. Cần có cho chức năng AI"],
-            ["Cài đặt", "1 lần, khoảng 5 phút"],
-        ],
-        col_widths=[5, 12]
-    )
-
-    # ── FAQ ──
-    add_heading_styled(doc, "Câu hỏi thường gặp", level=1)
-
-    faqs = [
-        ("Dữ liệu có được bảo mật không?", "Dữ liệu lưu hoàn toàn trên máy tính của anh/chị, không lưu trên máy chủ bên ngoài."),
-        ("Phần mềm có thay thế hệ thống eGov không?", "Không. VanBanPlus là công cụ hỗ trợ cá nhân, bổ sung cho hệ thống tập trung. Số văn bản chính thức vẫn do Văn thư cấp theo quy định."),
-        ("AI có chính xác hoàn toàn không?", "AI đạt độ chính xác khoảng 95%. Cán bộ luôn cần kiểm tra lại kết quả trước khi sử dụng chính thức."),
-        ("Máy tính bị hỏng thì dữ liệu có mất không?", 'Phần mềm tự động sao lưu mỗi lần khởi động. Có thể copy file sao lưu ra USB. Khi cài máy mới, chỉ cần nhấn "Khôi phục" là toàn bộ dữ liệu được phục hồi.'),
-    ]
-    for q, a in faqs:
-        p = doc.add_paragraph()
-        make_run(p, f"❓ {q}", bold=True, size=12, color=BLUE_PRIMARY)
-        p2 = doc.add_paragraph()
-        make_run(p2, f"→ {a}", size=11)
-        p2.space_after = Pt(8)
-
-    # ── FOOTER ──
-    add_para(doc, "")
-    p = doc.add_paragraph()
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    make_run(p, "Công ty TNHH Gia Kiệm Số", bold=True, size=12, color=BLUE_PRIMARY)
-    p2 = doc.add_paragraph()
-    p2.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    make_run(p2, "Website công ty: https://giakiemso.com", size=11, color=BLUE_ACCENT)
-    p3 = doc.add_paragraph()
-    p3.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    make_run(p3, "Website phần mềm: https://vanbanplus.giakiemso.com", size=11, color=BLUE_ACCENT)
-
-    add_footer_beta(doc)
-
-    out_path = os.path.join(SCRIPT_DIR, "01_TO_GIOI_THIEU_SAN_PHAM.docx")
-    doc.save(out_path)
-    print(f"✅ Đã tạo: {out_path}")
-    return out_path
+RENDERER_VERSION = "1"
+MANIFEST_NAME = ".render-manifest.json"
+
+_HEADING_RE = re.compile(r'^(#{1,6})\s+(.*?)\s*#*$')
+_RULE_RE = re.compile(r'^(?:-{3,}|\*{3,}|_{3,})$')
+_BULLET_RE = re.compile(r'^(\s*)[-*+]\s+(.*)$')
+_NUMBERED_RE = re.compile(r'^(\s*)(\d+)[.)]\s+(.*)$')
+_TABLE_SEP_RE = re.compile(r'^\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?$')
+_INLINE_RE = re.compile(r'\*\*(.+?)\*\*|\*(.+?)\*')
+_DIV_OPEN_RE = re.compile(r'^<div\s+align="?center"?\s*>$', re.IGNORECASE)
+
+
+def parse_inline(text):
+    """'Nhấn **"Lưu"** *ngay*' → [('Nhấn ', F, F), ('"Lưu"', T, F), (' ', F, F), ('ngay', F, T)]"""
+    out = []
+    pos = 0
+    for m in _INLINE_RE.finditer(text):
+        if m.start() > pos:
+            out.append((text[pos:m.start()], False, False))
+        if m.group(1) is not None:
+            out.append((m.group(1), True, False))
+        else:
+            out.append((m.group(2), False, True))
+        pos = m.end()
+    if pos < len(text):
+        out.append((text[pos:], False, False))
+    return out
+
+
+def plain_text(inlines):
+    return "".join(t for t, _, _ in inlines)
+
+
+def _split_row(line):
+    cells = line.strip().strip("|").split("|")
+    return [plain_text(parse_inline(c.strip())) for c in cells]
+
+
+def iter_md_events(lines):
+    """
+    Đọc Markdown một lượt, sinh sự kiện:
+        ("heading", level, inlines)    ("para", inlines, "text"|"quote")
+        ("bullet", level, inlines)     ("numbered", level, n, inlines)
+        ("table", headers, rows)       ("code", [dòng])
+        ("align", "center"|None)       ("rule",)
+    Hỗ trợ phần Markdown mà các tờ hướng dẫn dùng: heading, **đậm**, *nghiêng*,
+    xuống dòng bằng 2 dấu cách cuối dòng, blockquote, danh sách lồng, bảng,
+    code fence, <div align="center"> và comment HTML (bỏ qua).
+    """
+    para = []          # [(dòng, xuống dòng cứng?)]
+    para_kind = "text"
+    table = []
+    code = None        # (indent, [dòng]) khi đang trong code fence
+    in_comment = False
+
+    def flush():
+        nonlocal para, table
+        if para:
+            inlines = []
+            for idx, (line, hard_break) in enumerate(para):
+                inlines.extend(parse_inline(line))
+                if idx < len(para) - 1:
+                    inlines.append(("\n" if hard_break else " ", False, False))
+            yield ("para", inlines, para_kind)
+            para = []
+        if table:
+            yield ("table", table[0], table[1:])
+            table = []
+
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        stripped = line.strip()
+        if in_comment:
+            in_comment = "-->" not in line
+            continue
+        if code is not None:
+            if stripped.startswith("```"):
+                yield ("code", code[1])
+                code = None
+            else:
+                code[1].append(line[code[0]:] if line[:code[0]].strip() == "" else stripped)
+            continue
+
+        if stripped.startswith("|"):
+            if para:
+                yield from flush()
+            if not _TABLE_SEP_RE.match(stripped):
+                table.append(_split_row(stripped))
+            continue
+        if table:
+            yield from flush()
+
+        if not stripped:
+            yield from flush()
+        elif stripped.startswith("<!--"):
+            yield from flush()
+            in_comment = "-->" not in stripped
+        elif _DIV_OPEN_RE.match(stripped):
+            yield from flush()
+            yield ("align", "center")
+        elif stripped.lower() == "</div>":
+            yield from flush()
+            yield ("align", None)
+        elif stripped.startswith("```"):
+            yield from flush()
+            code = (len(line) - len(line.lstrip()), [])
+        elif _HEADING_RE.match(stripped):
+            yield from flush()
+            m = _HEADING_RE.match(stripped)
+            yield ("heading", len(m.group(1)), parse_inline(m.group(2)))
+        elif _RULE_RE.match(stripped):
+            yield from flush()
+            yield ("rule",)
+        elif _BULLET_RE.match(line):
+            yield from flush()
+            m = _BULLET_RE.match(line)
+            yield ("bullet", min(len(m.group(1)) // 2, 1), parse_inline(m.group(2).strip()))
+        elif _NUMBERED_RE.match(line):
+            yield from flush()
+            m = _NUMBERED_RE.match(line)
+            yield ("numbered", min(len(m.group(1)) // 2, 1), int(m.group(2)), parse_inline(m.group(3).strip()))
+        elif stripped.startswith(">"):
+            if para and para_kind != "quote":
+                yield from flush()
+            para_kind = "quote"
+            para.append((stripped[1:].strip(), line.endswith("  ")))
+        else:
+            if para and para_kind != "text":
+                yield from flush()
+            para_kind = "text"
+            para.append((stripped, line.endswith("  ")))
+
+    if code is not None:
+        yield ("code", code[1])
+    yield from flush()
 
 
 # ============================================================
-# DOCUMENT 2: HƯỚNG DẪN SỬ DỤNG NHANH
+# EVENT STREAM → DOCX
 # ============================================================
-def create_doc2():
+def _auto_col_widths(headers, rows, total=17.0, minimum=3.0):
+    """Chia bề rộng (cm) theo độ dài nội dung dài nhất của từng cột."""
+    lengths = [max([len(headers[i])] + [len(r[i]) for r in rows if i < len(r)]) for i in range(len(headers))]
+    weights = [max(n, 1) ** 0.5 for n in lengths]
+    widths = [max(minimum, total * w / sum(weights)) for w in weights]
+    scale = total / sum(widths)
+    return [round(w * scale, 2) for w in widths]
+
+
+class DocxRenderer:
+    """Nhận sự kiện từ iter_md_events, gọi helper tương ứng trên doc."""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.center = False
+
+    def render(self, events):
+        for event in events:
+            getattr(self, "on_" + event[0])(*event[1:])
+        return self.doc
+
+    def _align(self):
+        return WD_ALIGN_PARAGRAPH.CENTER if self.center else WD_ALIGN_PARAGRAPH.LEFT
+
+    def on_align(self, value):
+        self.center = value == "center"
+
+    def on_rule(self):
+        pass  # heading cấp 1 đã có thanh gạch dưới
+
+    def on_heading(self, level, inlines):
+        text = plain_text(inlines)
+        if level == 1:
+            # Tiêu đề tài liệu: chữ to, căn giữa; dòng toàn chữ đậm (tên sản phẩm) to hơn nữa
+            brand = all(b for t, b, _ in inlines if t.strip())
+            p = self.doc.add_paragraph()
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            p.space_before = Pt(12)
+            make_run(p, text, bold=True, size=22 if brand else 16,
+                     color=BLUE_ACCENT if brand else BLUE_PRIMARY, font=FONT_NAME_HEADING)
+        elif level == 2:
+            add_heading_styled(self.doc, text, level=1)
+        else:
+            add_heading_styled(self.doc, text, level=3)
+
+    def on_para(self, inlines, kind):
+        if "⚠" in plain_text(inlines):
+            add_para(self.doc, inlines, bold=not self.center, size=12 if not self.center else 10,
+                     color=RED_BETA, align=self._align())
+        elif kind == "quote":
+            add_para(self.doc, inlines, italic=True, size=11, color=GRAY_LIGHT, align=self._align())
+        elif self.center:
+            add_para(self.doc, inlines, size=11, align=WD_ALIGN_PARAGRAPH.CENTER)
+        else:
+            add_para(self.doc, inlines)
+
+    def on_bullet(self, level, inlines):
+        add_bullet(self.doc, inlines, level=level)
+
+    def on_numbered(self, level, n, inlines):
+        if level:
+            add_bullet(self.doc, inlines, level=level)
+            return
+        p = self.doc.add_paragraph()
+        make_run(p, f"Bước {n}: ", bold=True, size=12, color=BLUE_ACCENT)
+        add_runs(p, inlines, size=12)
+
+    def on_code(self, lines):
+        p = self.doc.add_paragraph()
+        p.paragraph_format.left_indent = Cm(1)
+        inlines = []
+        for i, line in enumerate(lines):
+            if i:
+                inlines.append(("\n", False, False))
+            inlines.append((line, False, False))
+        add_runs(p, inlines, size=10, font="Consolas")
+
+    def on_table(self, headers, rows):
+        width = len(headers)
+        rows = [(r + [""] * width)[:width] for r in rows]
+        add_table(self.doc, headers, rows, col_widths=_auto_col_widths(headers, rows))
+
+
+def render_markdown(md_path, out_path):
+    """Render một file Markdown ra .docx (ghi file tạm rồi os.replace)."""
     doc = Document()
     setup_page(doc)
-    add_beta_watermark(doc)
+    with open(md_path, encoding="utf-8") as f:
+        DocxRenderer(doc).render(iter_md_events(f))
+    tmp = out_path + ".tmp"
+    doc.save(tmp)
+    os.replace(tmp, out_path)
+    return out_path
 
-    # ── TITLE ──
-    p = doc.add_paragraph()
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p.space_before = Pt(12)
-    make_run(p, "HƯỚNG DẪN SỬ DỤNG NHANH", bold=True, size=18, color=BLUE_PRIMARY, font=FONT_NAME_HEADING)
-
-    p2 = doc.add_paragraph()
-    p2.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    make_run(p2, "VANBANPLUS", bold=True, size=22, color=BLUE_ACCENT, font=FONT_NAME_HEADING)
-
-    p3 = doc.add_paragraph()
-    p3.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p3.space_after = Pt(4)
-    make_run(p3, "Tài liệu dành cho cán bộ, công chức sử dụng lần đầu", italic=True, size=11, color=GRAY_LIGHT)
-
-    p4 = doc.add_paragraph()
-    p4.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p4.space_after = Pt(16)
-    make_run(p4, "Phiên bản Beta — Tháng 02/2026", size=11, color=GRAY_LIGHT)
-
-    # ════════════════════════════════════════════════════════
-    # 1. KHỞI ĐỘNG LẦN ĐẦU
-    # ════════════════════════════════════════════════════════
-    add_heading_styled(doc, "1. Khởi động lần đầu", level=1)
-
-    add_heading_styled(doc, "Bước 1: Mở phần mềm", level=3)
-    add_bullet(doc, "Nhấp đúp biểu tượng VanBanPlus trên màn hình Desktop.")
-    add_bullet(doc, "Lần đầu tiên, phần mềm hiện màn hình Thiết lập cơ quan.")
-
-    add_heading_styled(doc, "Bước 2: Chọn loại cơ quan", level=3)
-    add_bullet(doc, "Chọn đúng loại cơ quan nơi anh/chị công tác (UBND xã, Sở, Trường học, Đoàn thể...).")
-    add_bullet(doc, "Phần mềm tự tạo cấu trúc thư mục phù hợp.")
-    add_bullet(doc, 'Nhấn "Hoàn thành thiết lập".')
-
-    add_heading_styled(doc, "Bước 3: Đăng nhập tài khoản", level=3)
-    add_bullet(doc, "Nhấn vào nút Đăng nhập trên thanh bên trái.")
-    add_bullet(doc, "Nhập email và mật khẩu tài khoản VanBanPlus.")
-    add_bullet(doc, 'Nếu chưa có tài khoản → Nhấn "Đăng ký" → Nhập thông tin → Xác nhận.')
-
-    add_para(doc, "⚠ Lưu ý: Cần đăng nhập để sử dụng các chức năng AI. Các chức năng quản lý văn bản cơ bản không cần đăng nhập.", italic=True, size=11, color=GRAY_LIGHT)
-
-    # ════════════════════════════════════════════════════════
-    # 2. AI SCAN
-    # ════════════════════════════════════════════════════════
-    add_heading_styled(doc, "2. Nhập văn bản mới bằng AI Scan (cách nhanh nhất)", level=1)
-    add_para(doc, "Đây là cách nhanh nhất để đưa văn bản vào hệ thống — đặc biệt phù hợp khi nhận file PDF, ảnh scan qua email hoặc Zalo.")
-
-    steps = [
-        'Tại trang Quản lý tài liệu → Nhấn nút "AI Scan" trên thanh công cụ.',
-        'Nhấn "Chọn file" → Chọn file PDF hoặc ảnh scan cần nhập.',
-        'Nhấn "Phân tích" → Chờ khoảng 10–15 giây.',
-        "AI tự động điền đầy đủ các trường: Số ký hiệu, Ngày ban hành, Loại VB, Cơ quan, Trích yếu, Người ký, Nơi nhận, Căn cứ pháp lý...",
-        "Kiểm tra lại thông tin AI đã điền → Chỉnh sửa nếu cần.",
-        'Nhấn "Lưu".',
-    ]
-    for i, s in enumerate(steps, 1):
-        p = doc.add_paragraph()
-        make_run(p, f"Bước {i}: ", bold=True, size=12, color=BLUE_ACCENT)
-        make_run(p, s, size=12)
-
-    add_heading_styled(doc, "Nhập nhiều file cùng lúc:", level=3)
-    add_bullet(doc, 'Nhấn "AI Scan" → Chọn nhiều file cùng lúc.')
-    add_bullet(doc, "", bold_prefix="Tách riêng: ")
-    # fix: add explanation after
-    p = doc.add_paragraph(style='List Bullet')
-    make_run(p, "Tách riêng: ", bold=True, size=12)
-    make_run(p, "Mỗi file là 1 văn bản riêng biệt (dùng khi có nhiều VB khác nhau).", size=12)
-
-    p = doc.add_paragraph(style='List Bullet')
-    make_run(p, "Ghép trang: ", bold=True, size=12)
-    make_run(p, "Nhiều file/ảnh ghép thành 1 VB (dùng khi 1 VB bị scan thành nhiều trang rời).", size=12)
-
-    add_para(doc, "Định dạng file hỗ trợ: JPG, PNG, BMP, GIF, TIFF, WebP, PDF.", bold=True, size=11, color=GRAY_LIGHT)
-
-    # ════════════════════════════════════════════════════════
-    # 3. NHẬP THỦ CÔNG
-    # ════════════════════════════════════════════════════════
-    add_heading_styled(doc, "3. Nhập văn bản thủ công", level=1)
-    add_para(doc, 'Tại trang Quản lý tài liệu → Nhấn nút "Thêm". Điền các trường thông tin:')
-
-    add_table(doc,
-        headers=["Trường", "Ghi chú"],
-        rows=[
-            ["Hướng văn bản", "Chọn: Đến / Đi / Nội bộ"],
-            ["Số ký hiệu", "Ví dụ: 123/QĐ-UBND"],
-            ["Ngày ban hành", "Chọn ngày trên lịch"],
-            ["Loại văn bản", "Chọn trong danh sách 29 loại"],
-            ["Cơ quan ban hành", "Nhập tên cơ quan"],
-            ["Trích yếu", "Nội dung tóm tắt"],
-            ["Người ký", "Họ tên người ký"],
-            ["Nơi nhận", "Các cơ quan/bộ phận nhận"],
-            ["Mức độ khẩn", "Thường / Khẩn / Thượng khẩn / Hỏa tốc"],
-            ["Căn cứ pháp lý", "Các văn bản được viện dẫn"],
-            ["File đính kèm", "Đính kèm Word, PDF, Excel, ảnh"],
-        ],
-        col_widths=[5, 12]
-    )
-    add_para(doc, '→ Nhấn "Lưu". Phần mềm tự tạo Số đến tăng dần theo năm và Ký hiệu văn bản đúng format.', italic=True, size=11, color=GRAY_LIGHT)
-
-    # ════════════════════════════════════════════════════════
-    # 4. TÌM KIẾM
-    # ════════════════════════════════════════════════════════
-    add_heading_styled(doc, "4. Tìm kiếm văn bản", level=1)
-
-    add_heading_styled(doc, "Tìm nhanh:", level=3)
-    add_bullet(doc, "Gõ từ khóa vào ô tìm kiếm phía trên danh sách (hỗ trợ tìm không dấu tiếng Việt).")
-    add_bullet(doc, 'Ví dụ: Gõ "phong chong thien tai" → Tìm được "phòng chống thiên tai".')
-
-    add_heading_styled(doc, "Lọc nhanh:", level=3)
-    add_bullet(doc, "Nhấn các nút: Hôm nay / Tuần này / Tháng này để lọc theo thời gian.")
-
-    add_heading_styled(doc, "Lọc nâng cao:", level=3)
-    add_bullet(doc, "Lọc theo: Loại văn bản, Hướng (đi/đến), Khoảng ngày, Người ký, Số ký hiệu.")
-
-    # ════════════════════════════════════════════════════════
-    # 5. AI SOẠN THẢO
-    # ════════════════════════════════════════════════════════
-    add_heading_styled(doc, "5. Soạn văn bản bằng AI", level=1)
-
-    steps = [
-        'Nhấn nút "Tạo văn bản AI" (trên Trang chủ hoặc thanh công cụ).',
-        "Chọn mẫu văn bản — có sẵn 41 mẫu: Công văn, Quyết định, Báo cáo, Tờ trình, Kế hoạch, Thông báo...",
-        'Nhập thông tin chính: nội dung yêu cầu, thành phần tham dự, người ký, chức danh.',
-        'Nhấn "Tạo văn bản" → Chờ khoảng 15–20 giây.',
-        "AI soạn bản nháp hoàn chỉnh, đúng thể thức theo NĐ 30/2020.",
-        "Đọc lại, chỉnh sửa nếu cần.",
-        'Nhấn "Lưu" → Nhấn "Xuất Word" để tạo file Word in trình ký.',
-    ]
-    for i, s in enumerate(steps, 1):
-        p = doc.add_paragraph()
-        make_run(p, f"Bước {i}: ", bold=True, size=12, color=BLUE_ACCENT)
-        make_run(p, s, size=12)
-
-    # ════════════════════════════════════════════════════════
-    # 6. AI KIỂM TRA
-    # ════════════════════════════════════════════════════════
-    add_heading_styled(doc, "6. Kiểm tra văn bản bằng AI", level=1)
-    add_bullet(doc, "Mở văn bản cần kiểm tra (từ danh sách văn bản).")
-    add_bullet(doc, 'Nhấn nút "AI Kiểm tra".')
-    add_para(doc, "AI phân tích và hiển thị kết quả theo 3 mức độ:")
-
-    add_table(doc,
-        headers=["Mức độ", "Ý nghĩa", "Ví dụ"],
-        rows=[
-            ["🔴 Lỗi nghiêm trọng", "Phải sửa trước khi trình ký", "Thiếu căn cứ pháp lý, thiếu nơi nhận"],
-            ["🟡 Cảnh báo", "Nên xem xét sửa", "Sai chính tả, câu quá dài, văn phong chưa phù hợp"],
-            ["🟢 Gợi ý", "Có thể cải thiện", "Đề xuất bổ sung nội dung, cách diễn đạt tốt hơn"],
-        ],
-        col_widths=[4, 5, 8]
-    )
-    add_para(doc, "→ Nên kiểm tra AI trước mỗi lần trình ký để giảm tình trạng văn bản bị trả lại.", bold=True, italic=True, size=11, color=BLUE_PRIMARY)
-
-    # ════════════════════════════════════════════════════════
-    # 7. AI THAM MƯU
-    # ════════════════════════════════════════════════════════
-    add_heading_styled(doc, "7. AI Tham mưu xử lý văn bản đến", level=1)
-    add_para(doc, "Khi nhận được văn bản từ cấp trên và cần xác định phương án xử lý:")
-    add_bullet(doc, "Mở văn bản đến cần phân tích.")
-    add_bullet(doc, 'Nhấn nút "AI Tham mưu".')
-    add_para(doc, "AI trả về phân tích gồm: tóm tắt nội dung, thời hạn xử lý, đề xuất người phụ trách, hình thức phúc đáp, căn cứ liên quan, cảnh báo rủi ro nếu chậm hạn, dàn ý dự thảo.")
-
-    # ════════════════════════════════════════════════════════
-    # 8. AI BÁO CÁO ĐỊNH KỲ
-    # ════════════════════════════════════════════════════════
-    add_heading_styled(doc, "8. AI Báo cáo định kỳ", level=1)
-
-    steps = [
-        'Vào mục "AI Báo cáo định kỳ" trên thanh menu bên trái.',
-        "Chọn kỳ báo cáo (Tuần / Tháng / Quý / Năm) và lĩnh vực.",
-        'Nhập số liệu thô (ví dụ: "Thu ngân sách: 2,5 tỷ; Hộ nghèo giảm: 3 hộ; GPMB: đạt 85%").',
-        "(Tùy chọn) Dán báo cáo kỳ trước để AI so sánh tỷ lệ tăng/giảm.",
-        'Nhấn "Tạo báo cáo" → AI viết báo cáo hoàn chỉnh (kết quả, đánh giá, phương hướng).',
-        "Đọc lại, chỉnh sửa → Xuất Word.",
-    ]
-    for i, s in enumerate(steps, 1):
-        p = doc.add_paragraph()
-        make_run(p, f"Bước {i}: ", bold=True, size=12, color=BLUE_ACCENT)
-        make_run(p, s, size=12)
-
-    # ════════════════════════════════════════════════════════
-    # 9. CUỘC HỌP
-    # ════════════════════════════════════════════════════════
-    add_heading_styled(doc, "9. Quản lý cuộc họp", level=1)
-    add_bullet(doc, 'Vào mục Cuộc họp trên thanh menu.')
-    add_bullet(doc, 'Nhấn "Thêm cuộc họp" → Điền: loại cuộc họp, thời gian, địa điểm, người tham dự, nội dung.')
-    add_bullet(doc, 'Sau cuộc họp → Mở lại → Thêm biên bản, nhiệm vụ, tài liệu.')
-    add_bullet(doc, 'Nhấn "Xuất Word" → Chọn: Biên bản / Kết luận / Báo cáo.')
-    add_para(doc, "→ Phần mềm cảnh báo nếu tạo cuộc họp trùng lịch và theo dõi tiến độ nhiệm vụ sau họp.", italic=True, size=11, color=GRAY_LIGHT)
-
-    # ════════════════════════════════════════════════════════
-    # 10. SAO LƯU
-    # ════════════════════════════════════════════════════════
-    add_heading_styled(doc, "10. Sao lưu và Khôi phục", level=1)
-
-    add_heading_styled(doc, "Sao lưu:", level=3)
-    add_bullet(doc, "Phần mềm tự động sao lưu mỗi lần khởi động.")
-    add_bullet(doc, 'Sao lưu thủ công: Vào Sao lưu & Khôi phục → Nhấn "Sao lưu ngay".')
-    add_bullet(doc, "Nên copy file sao lưu ra USB hoặc ổ cứng ngoài để phòng trường hợp máy hỏng.")
-
-    add_heading_styled(doc, "Khôi phục:", level=3)
-    add_bullet(doc, 'Vào Sao lưu & Khôi phục → Nhấn "Khôi phục" → Chọn file sao lưu → Dữ liệu phục hồi hoàn toàn.')
-
-    # ════════════════════════════════════════════════════════
-    # 11. PHÍM TẮT
-    # ════════════════════════════════════════════════════════
-    add_heading_styled(doc, "11. Phím tắt thông dụng", level=1)
-    add_table(doc,
-        headers=["Phím tắt", "Chức năng"],
-        rows=[
-            ["Ctrl + N", "Thêm văn bản mới"],
-            ["Ctrl + F", "Tìm kiếm"],
-            ["Delete", "Xóa văn bản đang chọn"],
-            ["F5", "Làm mới danh sách"],
-            ["F1", "Mở trang Trợ giúp"],
-        ],
-        col_widths=[5, 12]
-    )
 
-    # ════════════════════════════════════════════════════════
-    # 12. HỖ TRỢ
-    # ════════════════════════════════════════════════════════
-    add_heading_styled(doc, "12. Cần hỗ trợ?", level=1)
-    add_bullet(doc, "Nhấn phím F1 trong phần mềm để mở trang Trợ giúp chi tiết.")
-    add_para(doc, "Liên hệ đội ngũ kỹ thuật:")
-    add_bullet(doc, "Công ty TNHH Gia Kiệm Số")
-    add_bullet(doc, "Website công ty: https://giakiemso.com")
-    add_bullet(doc, "Website phần mềm: https://vanbanplus.giakiemso.com")
-
-    add_footer_beta(doc)
-
-    out_path = os.path.join(SCRIPT_DIR, "02_HUONG_DAN_SU_DUNG_NHANH.docx")
-    doc.save(out_path)
-    print(f"✅ Đã tạo: {out_path}")
-    return out_path
+# ============================================================
+# BUILD (chỉ file đã đổi, song song nhiều tiến trình)
+# ============================================================
+def _file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _load_manifest(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def build(sources, output_dir=None, jobs=1, force=False):
+    """Render các file .md đã đổi kể từ lần build trước. Trả về danh sách file .docx đã ghi."""
+    plan = []
+    manifests = {}
+    for src in sources:
+        out_dir = output_dir or os.path.dirname(os.path.abspath(src))
+        out_path = os.path.join(out_dir, os.path.splitext(os.path.basename(src))[0] + ".docx")
+        manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+        manifest = manifests.setdefault(manifest_path, _load_manifest(manifest_path))
+        entry = {"sha256": _file_sha256(src), "renderer": RENDERER_VERSION}
+        key = os.path.relpath(os.path.abspath(src), out_dir).replace(os.sep, "/")
+        if not force and manifest.get(key) == entry and os.path.exists(out_path):
+            continue
+        plan.append((src, out_path, manifest, key, entry))
+
+    print(f"📂 {len(plan)}/{len(sources)} file cần render")
+    written = []
+    if jobs > 1 and len(plan) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {pool.submit(render_markdown, item[0], item[1]): item for item in plan}
+            for fut in as_completed(futures):
+                src, out, manifest, key, entry = futures[fut]
+                try:
+                    fut.result()
+                except Exception as e:
+                    print(f"❌ {src}: {e}")
+                    continue
+                manifest[key] = entry
+                written.append(out)
+                print(f"✅ Đã tạo: {out}")
+    else:
+        for src, out, manifest, key, entry in plan:
+            render_markdown(src, out)
+            manifest[key] = entry
+            written.append(out)
+            print(f"✅ Đã tạo: {out}")
+
+    for manifest_path, manifest in manifests.items():
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+    return written
 
 
 # ============================================================
 # MAIN
 # ============================================================
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert Markdown handouts → Word (.docx)")
+    parser.add_argument("inputs", nargs="*", help="File .md hoặc thư mục (mặc định: docs/demo)")
+    parser.add_argument("-o", "--output-dir", help="Thư mục ghi .docx (mặc định cạnh file .md)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Số tiến trình song song")
+    parser.add_argument("--force", action="store_true", help="Render lại cả file chưa đổi")
+    args = parser.parse_args()
+
+    sources = []
+    for item in args.inputs or [SCRIPT_DIR]:
+        if os.path.isdir(item):
+            sources.extend(os.path.join(item, n) for n in sorted(os.listdir(item)) if n.endswith(".md"))
+        else:
+            sources.append(item)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
     print("=" * 50)
-    print("Đang tạo tài liệu Word cho buổi demo...")
+    print("Đang tạo tài liệu Word từ Markdown...")
     print("=" * 50)
-    create_doc1()
-    create_doc2()
-    print("\n✅ Hoàn thành! 2 file .docx đã sẵn sàng trong thư mục docs/demo/")
+    written = build(sources, args.output_dir, jobs=args.jobs, force=args.force)
+    print(f"\n✅ Hoàn thành! {len(written)} file .docx đã được tạo/cập nhật.")
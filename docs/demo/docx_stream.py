@@ -0,0 +1,327 @@
+"""
+Streaming writer cho .docx: ghi thẳng word/document.xml vào file zip trong lúc
+sinh nội dung, bộ nhớ không tăng theo số hàng/đoạn (sổ đăng ký văn bản đi/đến
+100k+ hàng).
+
+python-docx giữ cả cây Document trong RAM tới doc.save(); ở đây chỉ phần khung
+(styles, numbering, theme, sectPr) được dựng bằng python-docx qua setup_page +
+ensure_table_styles của convert_to_word, nên giao diện (BLUE_PRIMARY,
+TABLE_HEADER_BG, FONT_NAME, style "VBP Table"...) giống hệt bản không streaming.
+
+Run:
+    python docs/demo/docx_stream.py so-di-2026.csv -o so-di-2026.docx \
+        --title "SỔ ĐĂNG KÝ VĂN BẢN ĐI NĂM 2026" --widths 1.5,3,2.5,7,3
+    python docs/demo/docx_stream.py 01_TO_GIOI_THIEU_SAN_PHAM.md -o out.docx   # Markdown → stream
+
+    from docx_stream import StreamingDocx
+    with StreamingDocx("so-den.docx") as w:
+        w.heading("SỔ ĐĂNG KÝ VĂN BẢN ĐẾN", level=1)
+        w.table(["STT", "Số, ký hiệu", "Trích yếu"], rows_generator(), col_widths=[1.5, 4, 11.5])
+"""
+
+import argparse
+import csv
+import io
+import os
+import re
+import sys
+import zipfile
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from docx import Document
+
+from convert_to_word import (
+    BLACK, BLUE_ACCENT, BLUE_PRIMARY, FONT_NAME, FONT_NAME_HEADING, GRAY_LIGHT, RED_BETA,
+    TABLE_STYLE_ID, TABLE_TEXT_STYLE_ID, DocxRenderer, ensure_table_styles, iter_md_events,
+    _auto_col_widths, setup_page,
+)
+
+DOCUMENT_PART = "word/document.xml"
+FLUSH_BYTES = 1 << 18
+_INVALID_XML_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+_ALIGN = {None: "", "left": "", "center": "center", "right": "right", "both": "both"}
+
+
+def _xml_text(text):
+    return escape(_INVALID_XML_RE.sub("", str(text)))
+
+
+@lru_cache(maxsize=256)
+def _rpr(bold, italic, size, color, font):
+    """<w:rPr> cho một tổ hợp định dạng — chỉ ghi thuộc tính khác Normal (như make_run)."""
+    parts = []
+    if font != FONT_NAME:
+        parts.append(f'<w:rFonts w:ascii="{font}" w:hAnsi="{font}" w:eastAsia="{font}"/>')
+    if bold:
+        parts.append("<w:b/>")
+    if italic:
+        parts.append("<w:i/>")
+    if color != str(BLACK):
+        parts.append(f'<w:color w:val="{color}"/>')
+    if size != 12:
+        parts.append(f'<w:sz w:val="{int(size * 2)}"/>')
+    return f"<w:rPr>{''.join(parts)}</w:rPr>" if parts else ""
+
+
+class StreamingDocx:
+    """Ghi .docx tuần tự; API bám theo các helper add_heading_styled/add_para/add_bullet/add_table."""
+
+    def __init__(self, path, setup=setup_page):
+        skeleton = Document()
+        setup(skeleton)
+        ensure_table_styles(skeleton)
+        buf = io.BytesIO()
+        skeleton.save(buf)
+
+        self.path = path
+        self._tmp = path + ".tmp"
+        self._zip = zipfile.ZipFile(self._tmp, "w", zipfile.ZIP_DEFLATED)
+        with zipfile.ZipFile(buf) as src:
+            for info in src.infolist():
+                if info.filename != DOCUMENT_PART:
+                    self._zip.writestr(info, src.read(info))
+            document_xml = src.read(DOCUMENT_PART).decode("utf-8")
+        body = document_xml.index("<w:body>") + len("<w:body>")
+        sect = document_xml.rindex("<w:sectPr")
+        self._tail = document_xml[sect:]
+        self._out = self._zip.open(DOCUMENT_PART, "w", force_zip64=True)
+        self._chunks = []
+        self._pending = 0
+        self._write(document_xml[:body])
+
+    # ── output ──
+    def _write(self, xml):
+        self._chunks.append(xml)
+        self._pending += len(xml)
+        if self._pending >= FLUSH_BYTES:
+            self._flush()
+
+    def _flush(self):
+        if self._chunks:
+            self._out.write("".join(self._chunks).encode("utf-8"))
+            self._chunks = []
+            self._pending = 0
+
+    def close(self):
+        if self._zip is None:
+            return
+        self._write(self._tail)
+        self._flush()
+        self._out.close()
+        self._zip.close()
+        self._zip = None
+        os.replace(self._tmp, self.path)
+
+    def abort(self):
+        if self._zip is not None:
+            self._out.close()
+            self._zip.close()
+            self._zip = None
+            os.remove(self._tmp)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    # ── nội dung ──
+    @staticmethod
+    def _runs(text, bold=False, italic=False, size=12, color=BLACK, font=FONT_NAME):
+        """text là chuỗi hoặc list inline [(text, bold, italic)] như add_runs."""
+        inlines = [(text, False, False)] if isinstance(text, str) else text
+        out = []
+        for t, b, i in inlines:
+            if t == "\n":
+                out.append("<w:r><w:br/></w:r>")
+            elif t:
+                rpr = _rpr(bold or b, italic or i, size, str(color), font)
+                out.append(f'<w:r>{rpr}<w:t xml:space="preserve">{_xml_text(t)}</w:t></w:r>')
+        return "".join(out)
+
+    def _paragraph(self, runs, style=None, align=None, indent_cm=None):
+        ppr = []
+        if style:
+            ppr.append(f'<w:pStyle w:val="{style}"/>')
+        if indent_cm:
+            ppr.append(f'<w:ind w:left="{int(indent_cm / 2.54 * 1440)}"/>')
+        if _ALIGN.get(align):
+            ppr.append(f'<w:jc w:val="{_ALIGN[align]}"/>')
+        ppr_xml = f"<w:pPr>{''.join(ppr)}</w:pPr>" if ppr else ""
+        self._write(f"<w:p>{ppr_xml}{runs}</w:p>")
+
+    def heading(self, text, level=1):
+        if level == 1:
+            self._paragraph(self._runs(text, bold=True, size=16, color=BLUE_PRIMARY, font=FONT_NAME_HEADING))
+            self._paragraph(self._runs("─" * 80, size=6, color=BLUE_ACCENT))
+        elif level == 2:
+            self._paragraph(self._runs(text, bold=True, size=13, color=BLUE_PRIMARY, font=FONT_NAME_HEADING))
+        else:
+            self._paragraph(self._runs(text, bold=True, size=12, color=BLUE_ACCENT, font=FONT_NAME_HEADING))
+
+    def title(self, text, size=16, color=BLUE_PRIMARY):
+        self._paragraph(self._runs(text, bold=True, size=size, color=color, font=FONT_NAME_HEADING),
+                        align="center")
+
+    def para(self, text="", bold=False, italic=False, size=12, color=BLACK, align=None):
+        self._paragraph(self._runs(text, bold=bold, italic=italic, size=size, color=color) if text else "",
+                        align=align)
+
+    def bullet(self, text, bold_prefix="", size=12, level=0):
+        runs = self._runs(bold_prefix, bold=True, size=size) if bold_prefix else ""
+        self._paragraph(runs + self._runs(text, size=size), style="ListBullet" if level == 0 else "ListBullet2")
+
+    def code(self, lines, size=10):
+        inlines = []
+        for i, line in enumerate(lines):
+            if i:
+                inlines.append(("\n", False, False))
+            inlines.append((line, False, False))
+        self._paragraph(self._runs(inlines, size=size, font="Consolas"), indent_cm=1)
+
+    def page_break(self):
+        self._write('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+
+    def table(self, headers, rows, col_widths=None, total_width=17.0):
+        """Ghi bảng; rows có thể là generator — từng hàng được ghi ngay, không giữ lại.
+
+        Hàng thiếu/thừa cột so với headers được bù ô trống/cắt bớt (kèm cảnh báo)
+        để mọi w:tr có đúng số ô của lưới.
+        """
+        width = len(headers)
+        if col_widths and len(col_widths) != width:
+            raise ValueError(f"Có {len(col_widths)} độ rộng cột cho {width} cột tiêu đề")
+        widths = col_widths or [total_width / width] * width
+        twips = [int(round(w / 2.54 * 1440)) for w in widths]
+        opens = [
+            f'<w:tc><w:tcPr><w:tcW w:w="{w}" w:type="dxa"/></w:tcPr>'
+            f'<w:p><w:pPr><w:pStyle w:val="{TABLE_TEXT_STYLE_ID}"/></w:pPr>'
+            '<w:r><w:t xml:space="preserve">'
+            for w in twips
+        ]
+        close = "</w:t></w:r></w:p></w:tc>"
+        grid = "".join(f'<w:gridCol w:w="{w}"/>' for w in twips)
+        self._write(
+            f'<w:tbl><w:tblPr><w:tblStyle w:val="{TABLE_STYLE_ID}"/><w:tblW w:type="auto" w:w="0"/>'
+            '<w:jc w:val="center"/><w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" '
+            'w:lastRow="0" w:noHBand="0" w:noVBand="1" w:val="04A0"/></w:tblPr>'
+            f'<w:tblGrid>{grid}</w:tblGrid>'
+        )
+
+        def row_xml(values, tr_pr=""):
+            cells = "".join(o + ("" if v is None else _xml_text(v)) + close for o, v in zip(opens, values))
+            return f"<w:tr>{tr_pr}{cells}</w:tr>"
+
+        self._write(row_xml(headers, "<w:trPr><w:tblHeader/></w:trPr>"))
+        count = ragged = 0
+        first_ragged = None
+        for values in rows:
+            count += 1
+            if len(values) != width:
+                ragged += 1
+                first_ragged = first_ragged or (count, len(values))
+                values = (list(values) + [""] * width)[:width]
+            self._write(row_xml(values))
+        self._write("</w:tbl><w:p/>")
+        if ragged:
+            row, cols = first_ragged
+            print(f"⚠️ {ragged:,} hàng lệch số cột so với tiêu đề ({width} cột; đầu tiên: hàng {row} "
+                  f"có {cols} cột) — đã bù ô trống/cắt bớt", file=sys.stderr)
+        return count
+
+
+class StreamRenderer(DocxRenderer):
+    """DocxRenderer của convert_to_word nhưng ghi qua StreamingDocx."""
+
+    def __init__(self, writer):
+        super().__init__(None)
+        self.writer = writer
+
+    def _align_name(self):
+        return "center" if self.center else None
+
+    def on_heading(self, level, inlines):
+        text = "".join(t for t, _, _ in inlines)
+        if level == 1:
+            brand = all(b for t, b, _ in inlines if t.strip())
+            self.writer.title(text, size=22 if brand else 16, color=BLUE_ACCENT if brand else BLUE_PRIMARY)
+        else:
+            self.writer.heading(text, level=1 if level == 2 else 3)
+
+    def on_para(self, inlines, kind):
+        w = self.writer
+        if "⚠" in "".join(t for t, _, _ in inlines):
+            w.para(inlines, bold=not self.center, size=10 if self.center else 12, color=RED_BETA,
+                   align=self._align_name())
+        elif kind == "quote":
+            w.para(inlines, italic=True, size=11, color=GRAY_LIGHT, align=self._align_name())
+        elif self.center:
+            w.para(inlines, size=11, align="center")
+        else:
+            w.para(inlines)
+
+    def on_bullet(self, level, inlines):
+        self.writer.bullet(inlines, level=level)
+
+    def on_numbered(self, level, n, inlines):
+        if level:
+            self.writer.bullet(inlines, level=level)
+            return
+        w = self.writer
+        w._paragraph(w._runs(f"Bước {n}: ", bold=True, color=BLUE_ACCENT) + w._runs(inlines))
+
+    def on_code(self, lines):
+        self.writer.code(lines)
+
+    def on_table(self, headers, rows):
+        width = len(headers)
+        rows = [(r + [""] * width)[:width] for r in rows]
+        self.writer.table(headers, rows, col_widths=_auto_col_widths(headers, rows))
+
+
+def write_register(csv_path, out_path, title=None, col_widths=None, delimiter=","):
+    """Sổ đăng ký từ CSV (hàng đầu là tiêu đề cột) — đọc và ghi từng hàng."""
+    with open(csv_path, encoding="utf-8-sig", newline="") as f, StreamingDocx(out_path) as w:
+        reader = csv.reader(f, delimiter=delimiter)
+        headers = next(reader)
+        if title:
+            w.title(title)
+            w.para()
+        return w.table(headers, reader, col_widths=col_widths)
+
+
+def render_markdown_stream(md_path, out_path):
+    with open(md_path, encoding="utf-8") as f, StreamingDocx(out_path) as w:
+        StreamRenderer(w).render(iter_md_events(f))
+    return out_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ghi .docx dạng streaming (CSV sổ đăng ký hoặc Markdown)")
+    parser.add_argument("input", help="File .csv (sổ đăng ký) hoặc .md")
+    parser.add_argument("-o", "--output", help="File .docx (mặc định cạnh file vào)")
+    parser.add_argument("--title", help="Tiêu đề sổ (CSV)")
+    parser.add_argument("--widths", help="Độ rộng cột (cm), vd 1.5,3,2.5,7,3")
+    parser.add_argument("--delimiter", default=",", help="Ký tự phân cách CSV")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.input):
+        print(f"❌ Không tìm thấy file: {args.input}")
+        sys.exit(1)
+    output = args.output or os.path.splitext(args.input)[0] + ".docx"
+    if args.input.lower().endswith(".md"):
+        render_markdown_stream(args.input, output)
+        print(f"✅ Đã tạo: {output}")
+    else:
+        widths = [float(w) for w in args.widths.split(",")] if args.widths else None
+        try:
+            count = write_register(args.input, output, title=args.title, col_widths=widths,
+                                   delimiter=args.delimiter)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"✅ Đã tạo: {output} ({count:,} hàng)")
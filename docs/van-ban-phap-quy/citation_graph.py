@@ -0,0 +1,283 @@
+"""
+Đồ thị trích dẫn giữa các văn bản pháp quy (và template trong template-store.json)
+
+Quét Markdown đã convert, tìm các trích dẫn kiểu "Căn cứ Nghị định số
+138/2020/NĐ-CP...", "theo quy định tại khoản 2 Điều 8", "Điều 8 — ... | NĐ 30/2020"
+rồi lưu thành danh sách kề hai chiều (cites / cited_by) — tra "ai trích dẫn
+Điều 8 của 30/2020" hay "template này phụ thuộc văn bản nào" là một lần tra dict.
+
+Cách dùng:
+    python citation_graph.py build                         # quét thư mục chứa script
+    python citation_graph.py cited-by "Điều 8 Nghị định 30/2020/NĐ-CP"
+    python citation_graph.py cited-by "NĐ 30/2020"
+    python citation_graph.py cites "template:store-cv-dieu-dong"
+    python citation_graph.py cites "30/2020/NĐ-CP#dieu-29"
+
+Khóa node:
+    "30/2020/NĐ-CP"                          văn bản
+    "30/2020/NĐ-CP#dieu-8.khoan-2.diem-a"    Điều/Khoản/Điểm (cùng id với AST của convert_word_to_md)
+    "template:<store_id>"                    template trong template-store.json
+    "file:<đường dẫn>"                       file không xác định được số hiệu (vd _MAPPING.md)
+Trích dẫn tới Khoản/Điểm được cộng dồn lên Điều và văn bản chứa nó; nguồn là
+Điều cũng được cộng dồn lên văn bản nguồn.
+"""
+
+import sys
+import re
+import json
+import argparse
+from pathlib import Path
+
+from search_index import split_articles, iter_corpus_files, DEFAULT_PATTERNS, _DIEU_RE
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_GRAPH_FILE = ".citation-graph.json"
+DEFAULT_TEMPLATE_STORE = SCRIPT_DIR.parent.parent / "template-store.json"
+GRAPH_VERSION = 1
+GRAPH_PATTERNS = DEFAULT_PATTERNS + ("_MAPPING.md",)
+
+# Số hiệu đầy đủ: 30/2020/NĐ-CP, 01/2011/QH13, 351/2017/UBTVQH14
+_DOCNUM_RE = re.compile(r'\b(\d{1,4}/\d{4}/[A-ZĐ][A-ZĐ0-9]*(?:-[A-ZĐ0-9]+)*)')
+# Viết tắt trong bảng mapping: "NĐ 30/2020", "TT 01/2011"
+_SHORT_RE = re.compile(r'\b(NĐ|TT|QĐ|Luật)\s+(?:số\s+)?(\d{1,4})/(\d{4})\b(?!/)')
+_SHORT_KIND = {"NĐ": "NĐ", "TT": "TT", "QĐ": "QĐ", "Luật": "QH"}
+_ARTICLE_RE = re.compile(
+    r'(?:[Đđ]iểm\s+(?P<diem>[a-zđ])\s+)?'
+    r'(?:[Kk]hoản\s+(?P<khoan>\d+)\s+)?'
+    r'Điều\s+(?P<dieu>này|\d+(?:\s*[-–]\s*\d+)?)'
+)
+# Phần sau "Điều N" có thể ghi văn bản chứa nó — chỉ xét tới dấu câu/Điều kế tiếp
+_QUALIFIER_STOP_RE = re.compile(r'[.;\n]|Điều\s')
+# "Điều 103 ... của Bộ luật Hình sự" — văn bản khác nhưng không ghi số hiệu
+_OTHER_DOC_RE = re.compile(r'\b(?:Bộ luật|Luật|Pháp lệnh|Nghị định|Nghị quyết|Thông tư|Quyết định)\b(?!\s+này)')
+_SO_HIEU_RE = re.compile(r'Số hiệu\**\s*[:|]\s*\**\s*([^\n|]+)')
+
+
+def _doc_number_of(folder: Path):
+    """Số hiệu văn bản của thư mục (đọc README.md / noi-dung.md), hoặc None."""
+    for name in ("README.md", "noi-dung.md"):
+        path = folder / name
+        if not path.is_file():
+            continue
+        m = _SO_HIEU_RE.search(path.read_text(encoding="utf-8"))
+        if m:
+            num = _DOCNUM_RE.search(m.group(1))
+            if num:
+                return num.group(1)
+    return None
+
+
+class CitationExtractor:
+    """Tìm trích dẫn trong text, trả về khóa node đích."""
+
+    def __init__(self, known_docs=()):
+        self.known_docs = sorted(set(known_docs))
+
+    def resolve_short(self, kind: str, number: str, year: str):
+        prefix = f"{int(number):02d}/{year}/"
+        want = _SHORT_KIND[kind]
+        for doc in self.known_docs:
+            if doc.startswith(prefix) and doc.split("/", 2)[2].startswith(want):
+                return doc
+        return None
+
+    def _doc_in(self, text: str):
+        """Số hiệu văn bản đầu tiên trong đoạn text (đầy đủ hoặc viết tắt)."""
+        best = None
+        for m in _DOCNUM_RE.finditer(text):
+            best = (m.start(), m.group(1))
+            break
+        for m in _SHORT_RE.finditer(text):
+            doc = self.resolve_short(*m.groups())
+            if doc and (best is None or m.start() < best[0]):
+                best = (m.start(), doc)
+            break
+        return best[1] if best else None
+
+    def extract(self, text: str, current_doc: str = None, current_article: str = ""):
+        """Sinh các khóa đích (văn bản hoặc Điều/Khoản/Điểm) được trích dẫn trong text."""
+        for m in _DOCNUM_RE.finditer(text):
+            yield m.group(1)
+        for m in _SHORT_RE.finditer(text):
+            doc = self.resolve_short(*m.groups())
+            if doc:
+                yield doc
+        for m in _ARTICLE_RE.finditer(text):
+            tail = text[m.end():m.end() + 120]
+            stop = _QUALIFIER_STOP_RE.search(tail)
+            qualifier = tail[:stop.start()] if stop else tail
+            doc = self._doc_in(qualifier)
+            if doc is None:
+                if _OTHER_DOC_RE.search(qualifier):
+                    continue
+                doc = current_doc
+            if doc is None:
+                continue
+            dieu = m.group("dieu")
+            if dieu == "này":
+                if not current_article:
+                    continue
+                articles = [current_article]
+            else:
+                bounds = [int(x) for x in re.split(r'\s*[-–]\s*', dieu)]
+                articles = [str(n) for n in range(bounds[0], bounds[-1] + 1)] if len(bounds) == 2 \
+                    and 0 <= bounds[1] - bounds[0] <= 50 else [str(bounds[0])]
+            for article in articles:
+                node = f"dieu-{article}"
+                if m.group("khoan"):
+                    node += f".khoan-{m.group('khoan')}"
+                    if m.group("diem"):
+                        node += f".diem-{m.group('diem')}"
+                yield f"{doc}#{node}"
+
+
+def _rollup(key: str):
+    """Khóa và các cấp cha: "d#dieu-8.khoan-2" → d#dieu-8.khoan-2, d#dieu-8, d."""
+    yield key
+    if "#" in key:
+        doc, node = key.split("#", 1)
+        parts = node.split(".")
+        for i in range(len(parts) - 1, 0, -1):
+            yield f"{doc}#{'.'.join(parts[:i])}"
+        yield doc
+
+
+class CitationGraph:
+    """Danh sách kề hai chiều: cites[nguồn][đích] = số lần, cited_by[đích][nguồn] = số lần."""
+
+    def __init__(self, data: dict = None):
+        data = data or {}
+        self.cites = data.get("cites", {})
+        self.cited_by = data.get("cited_by", {})
+        self.nodes = data.get("nodes", {})
+        self.extractor = CitationExtractor(data.get("docs", ()))
+
+    def add(self, source: str, target: str):
+        source_doc = source.split("#", 1)[0]
+        for dst in _rollup(target):
+            if dst == source or dst == source_doc:
+                continue  # văn bản tự nhắc số hiệu / Điều tự nhắc chính nó
+            internal = dst.split("#", 1)[0] == source_doc
+            for src in _rollup(source):
+                if internal and src == source_doc:
+                    continue  # tham chiếu nội bộ không cộng lên cấp văn bản
+                bucket = self.cites.setdefault(src, {})
+                bucket[dst] = bucket.get(dst, 0) + 1
+                back = self.cited_by.setdefault(dst, {})
+                back[src] = back.get(src, 0) + 1
+
+    def to_dict(self) -> dict:
+        return {"version": GRAPH_VERSION, "docs": self.extractor.known_docs,
+                "nodes": self.nodes, "cites": self.cites, "cited_by": self.cited_by}
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def resolve(self, query: str) -> str:
+        """Chuỗi người dùng gõ → khóa node ("Điều 8 NĐ 30/2020" → "30/2020/NĐ-CP#dieu-8")."""
+        if query.startswith(("template:", "file:")) or "#" in query:
+            return query
+        keys = list(self.extractor.extract(query))
+        articles = [k for k in keys if "#" in k]
+        return (articles or keys or [query])[0]
+
+    def lookup(self, query: str, direction: str = "cited_by") -> list:
+        """[(khóa, số lần)] sắp theo số lần giảm dần."""
+        table = self.cited_by if direction == "cited_by" else self.cites
+        found = table.get(self.resolve(query), {})
+        return sorted(found.items(), key=lambda kv: (-kv[1], kv[0]))
+
+
+def build_graph(root, template_store=None) -> CitationGraph:
+    """Quét kho Markdown dưới root (và template-store.json nếu có) thành đồ thị."""
+    root = Path(root)
+    files = iter_corpus_files(root, GRAPH_PATTERNS)
+    doc_of_folder = {}
+    for path in files:
+        folder = path.parent.parent if path.parent.name in ("phu-luc", "van-ban-goc") else path.parent
+        if folder not in doc_of_folder:
+            doc_of_folder[folder] = _doc_number_of(folder)
+    graph = CitationGraph({"docs": [d for d in doc_of_folder.values() if d]})
+    extractor = graph.extractor
+
+    for path in files:
+        rel = path.relative_to(root).as_posix()
+        folder = path.parent.parent if path.parent.name in ("phu-luc", "van-ban-goc") else path.parent
+        doc = doc_of_folder.get(folder)
+        for unit in split_articles(path.read_text(encoding="utf-8"), rel):
+            if doc is None:
+                source = f"file:{rel}"
+            elif unit.article:
+                source = f"{doc}#dieu-{unit.article}"
+            else:
+                source = doc
+            graph.nodes.setdefault(source, {"path": rel, "line": unit.line, "title": unit.title})
+            for line in unit.text.split("\n"):
+                if _DIEU_RE.match(line):
+                    continue  # heading của chính Điều, không phải trích dẫn
+                for target in extractor.extract(line, doc, unit.article):
+                    graph.add(source, target)
+
+    store = Path(template_store) if template_store else DEFAULT_TEMPLATE_STORE
+    if store.is_file():
+        with open(store, encoding="utf-8") as f:
+            templates = json.load(f).get("templates", [])
+        for t in templates:
+            source = f"template:{t.get('store_id')}"
+            graph.nodes[source] = {"path": store.name, "title": t.get("name", "")}
+            text = "\n".join(t.get(k) or "" for k in ("template_content", "ai_prompt"))
+            for line in text.split("\n"):
+                for target in extractor.extract(line):
+                    graph.add(source, target)
+    return graph
+
+
+def _print_lookup(graph: CitationGraph, query: str, direction: str):
+    key = graph.resolve(query)
+    rows = graph.lookup(key, direction)
+    arrow = "được trích dẫn bởi" if direction == "cited_by" else "trích dẫn"
+    print(f"🔗 {key} {arrow} {len(rows)} node:")
+    for other, count in rows:
+        node = graph.nodes.get(other, {})
+        where = f"  ({node['path']}:{node['line']})" if node.get("line") else ""
+        title = f" — {node['title']}" if node.get("title") else ""
+        print(f"   {count:>3}× {other}{title}{where}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Đồ thị trích dẫn văn bản pháp quy")
+    sub = parser.add_subparsers(dest="command", required=True)
+    default_graph = str(SCRIPT_DIR / DEFAULT_GRAPH_FILE)
+    p_build = sub.add_parser("build", help="Quét kho và ghi đồ thị")
+    p_build.add_argument("root", nargs="?", default=str(SCRIPT_DIR), help="Thư mục gốc kho văn bản")
+    p_build.add_argument("-o", "--graph", help=f"File đồ thị (mặc định <root>/{DEFAULT_GRAPH_FILE})")
+    p_build.add_argument("--templates", help="template-store.json (mặc định ở gốc repo)")
+    for name, help_text in (("cited-by", "Ai trích dẫn node này"), ("cites", "Node này trích dẫn gì")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("query", help='Khóa node hoặc trích dẫn, vd "Điều 8 NĐ 30/2020"')
+        p.add_argument("-g", "--graph", default=default_graph, help="File đồ thị")
+        p.add_argument("--json", action="store_true", help="In JSON")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        output = args.graph or str(Path(args.root) / DEFAULT_GRAPH_FILE)
+        graph = build_graph(args.root, args.templates)
+        graph.save(output)
+        edges = sum(len(v) for v in graph.cites.values())
+        print(f"✅ Đã ghi {output}: {len(graph.cites)} nguồn, {len(graph.cited_by)} đích, {edges} cạnh")
+    else:
+        if not Path(args.graph).is_file():
+            print(f"❌ Chưa có đồ thị tại {args.graph} — chạy: python citation_graph.py build")
+            sys.exit(1)
+        graph = CitationGraph.load(args.graph)
+        direction = "cited_by" if args.command == "cited-by" else "cites"
+        if args.json:
+            print(json.dumps(dict(graph.lookup(args.query, direction)), ensure_ascii=False, indent=1))
+        else:
+            _print_lookup(graph, args.query, direction)
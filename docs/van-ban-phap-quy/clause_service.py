@@ -0,0 +1,530 @@
+"""
+Dịch vụ tra cứu điều khoản: trích dẫn → nội dung Điều/Khoản/Điểm (HTTP, asyncio)
+
+Desktop app và vanbanplus-api cần "cho tôi Điều 8 của 30/2020/NĐ-CP" để ghép vào
+prompt AI và tính năng Căn cứ — thay vì mỗi bên tự đọc và quét lại noi-dung.md,
+gọi một dịch vụ cục bộ:
+
+- Chỉ mục offset dựng sẵn (build): mỗi Điều/Khoản/Điểm → (file, byte đầu, byte
+  cuối, dòng, tên), khóa giống citation_graph ("30/2020/NĐ-CP#dieu-8.khoan-2").
+  Tra một Điều = một lần seek + read, không parse Markdown khi chạy.
+- Cache LRU giới hạn theo dung lượng (--cache-mb) giữ text các Điều hay dùng.
+- Trích dẫn phân tích bằng CitationExtractor của citation_graph: "khoản 2 Điều 8
+  Nghị định 30/2020/NĐ-CP", "Điều 8-10 NĐ 30/2020", "Điều 5 Luật 01/2011",
+  "Phụ lục I NĐ 30/2020", hoặc khóa node trực tiếp "30/2020/NĐ-CP#dieu-8".
+- Server asyncio một tiến trình, HTTP/1.1 keep-alive: hàng nghìn kết nối đồng
+  thời; endpoint batch tra nhiều trích dẫn trong một request.
+- Chỉ mục cũ hơn file Markdown (size/mtime khác) → tự build lại khi khởi động
+  hoặc khi gọi POST /reload.
+
+Endpoint (JSON UTF-8):
+    GET  /health                                  trạng thái, số node, thống kê cache
+    GET  /resolve?q=<trích dẫn>[&doc=<văn bản>]   {"query", "matches": [{key, doc, title, path, line, text}]}
+         &format=text                             chỉ trả text (text/plain), nối các node bằng dòng trống
+    POST /resolve/batch                           {"queries": ["...", {"q": "...", "doc": "..."}], "doc": "..."}
+                                                  → {"results": [{"query", "matches"} | {"query", "error"}]}
+    POST /reload                                  build lại chỉ mục, xóa cache
+doc: văn bản đang soạn/đang đọc — dùng khi trích dẫn không ghi số hiệu ("Điều 8").
+
+Cách dùng:
+    python clause_service.py build                                  # quét thư mục chứa script
+    python clause_service.py get "khoản 2 Điều 8 Nghị định 30/2020/NĐ-CP"
+    python clause_service.py serve --port 8765 --cache-mb 64
+    curl "http://127.0.0.1:8765/resolve?q=Điều%208%20NĐ%2030/2020&format=text"
+    curl -X POST http://127.0.0.1:8765/resolve/batch -d '{"queries": ["Điều 8 NĐ 30/2020", "Điều 5 Luật 01/2011"]}'
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from collections import OrderedDict
+from urllib.parse import urlsplit, parse_qs
+
+from search_index import iter_corpus_files, fold, DEFAULT_PATTERNS, _DIEU_RE, _MARKER_RE
+from citation_graph import CitationExtractor, _doc_number_of
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_INDEX_FILE = ".clause-index.json"
+INDEX_VERSION = 1
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_MB = 64
+MAX_HEADER_BYTES = 1 << 16
+MAX_BODY_BYTES = 1 << 20
+MAX_BATCH = 1000
+KEEPALIVE_TIMEOUT = 15.0
+
+# Dòng mở cấp cao hơn Điều → đóng Điều đang mở (Chương/Mục/Phần không thuộc Điều trước)
+_STRUCT_RE = re.compile(r'^(?:#{1,6}\s+)?(?:\*\*)?(?:Chương|CHƯƠNG|Mục|MỤC|Phần|PHẦN)\s+[IVXLCDM\d]+\b')
+# Khoản/Điểm như converter ghi ra: "1. ...", "#### 1. ..." (--rules khoan-diem), "- a) ..."
+_KHOAN_LINE_RE = re.compile(r'^(?:#{1,6}\s+|-\s+)?(\d+)[\.\)]\s')
+_DIEM_LINE_RE = re.compile(r'^(?:#{1,6}\s+|-\s+)?([a-zđ])[\.\)]\s')
+_PHU_LUC_RE = re.compile(r'\bPhụ lục\s+([IVXLCDM]+|\d+)\b', re.IGNORECASE)
+_LEVEL = {"dieu": 0, "khoan": 1, "diem": 2}
+
+
+# ============================================================
+# CHỈ MỤC OFFSET
+# ============================================================
+def index_markdown(data: bytes, prefix: str = "") -> list:
+    """Quét Markdown (bytes) → [(id, byte đầu, byte cuối, dòng, tên)] cho mọi Điều/Khoản/Điểm.
+
+    id theo quy ước AST của convert_word_to_md: "dieu-8", "dieu-8.khoan-2.diem-a";
+    byte cuối bỏ dòng trống/"---" ở đuôi. id trùng (văn bản lỗi đánh số): giữ node đầu.
+    """
+    nodes, stack = [], []     # stack: [id, kind, start, end, line, title], cấp tăng dần
+
+    def close(level):
+        while stack and _LEVEL[stack[-1][1]] >= level:
+            node_id, _, start, end, line, title = stack.pop()
+            nodes.append((node_id, start, end, line, title))
+
+    offset = 0
+    for number, raw in enumerate(data.split(b"\n"), 1):
+        start, offset = offset, offset + len(raw) + 1
+        text = raw.decode("utf-8", errors="replace").strip()
+        m = _DIEU_RE.match(text)
+        if m:
+            close(0)
+            title = _MARKER_RE.sub("", m.group(2)).strip()
+            stack.append([f"{prefix}dieu-{m.group(1)}", "dieu", start, start, number, title])
+        elif _STRUCT_RE.match(text):
+            close(0)
+        elif stack:
+            m = _KHOAN_LINE_RE.match(text)
+            if m:
+                close(1)
+                stack.append([f"{stack[0][0]}.khoan-{m.group(1)}", "khoan", start, start, number, ""])
+            else:
+                m = _DIEM_LINE_RE.match(text)
+                if m:
+                    close(2)
+                    stack.append([f"{stack[-1][0]}.diem-{m.group(1)}", "diem", start, start, number, ""])
+        if text and text != "---":
+            end = start + len(raw.rstrip(b"\r"))
+            for node in stack:
+                node[3] = end
+    close(0)
+    return nodes
+
+
+def _doc_folder(path: Path) -> Path:
+    return path.parent.parent if path.parent.name in ("phu-luc", "van-ban-goc") else path.parent
+
+
+def _slug(text: str) -> str:
+    """ "30/2020/NĐ-CP", thư mục "30-2020-ND-CP" → "30-2020-nd-cp"."""
+    return re.sub(r'[^a-z0-9]+', '-', fold(text)).strip('-')
+
+
+def build_clause_index(root, output=None, patterns=DEFAULT_PATTERNS) -> dict:
+    """Quét kho Markdown dưới root → chỉ mục offset (ghi JSON, mặc định root/.clause-index.json)."""
+    root = Path(root).resolve()
+    files, docs, nodes = [], {}, {}
+    for path in iter_corpus_files(root, patterns):
+        folder = _doc_folder(path)
+        rel_folder = folder.relative_to(root).as_posix()
+        doc = next((d for d, info in docs.items() if info["folder"] == rel_folder), None)
+        if doc is None:
+            doc = _doc_number_of(folder) or folder.name
+            docs[doc] = {"folder": rel_folder, "aliases": sorted({_slug(doc), _slug(folder.name)})}
+        data = path.read_bytes()
+        st = path.stat()
+        file_no = len(files)
+        files.append({"path": path.relative_to(root).as_posix(), "size": st.st_size, "mtime_ns": st.st_mtime_ns})
+        prefix = ""
+        if path.name != "noi-dung.md":
+            prefix = f"{path.stem}."
+            first = data.split(b"\n", 1)[0].decode("utf-8", errors="replace")
+            nodes.setdefault(f"{doc}#{path.stem}", [file_no, 0, len(data.rstrip()), 1, first.lstrip("# ").strip()])
+        for node_id, start, end, line, title in index_markdown(data, prefix):
+            nodes.setdefault(f"{doc}#{node_id}", [file_no, start, end, line, title])
+    index = {"version": INDEX_VERSION, "root": str(root), "built": time.strftime("%Y-%m-%dT%H:%M:%S"),
+             "files": files, "docs": docs, "nodes": nodes}
+    output = Path(output) if output else root / DEFAULT_INDEX_FILE
+    tmp = output.with_name(output.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, output)
+    return index
+
+
+def load_clause_index(path) -> dict:
+    with open(path, encoding="utf-8") as f:
+        index = json.load(f)
+    if index.get("version") != INDEX_VERSION:
+        raise ValueError(f"{path}: phiên bản chỉ mục {index.get('version')} ≠ {INDEX_VERSION}")
+    return index
+
+
+def stale_files(index: dict) -> list:
+    """File đã sửa/xóa từ lúc build (so size + mtime) — offset không còn đúng."""
+    root = Path(index["root"])
+    stale = []
+    for entry in index["files"]:
+        try:
+            st = (root / entry["path"]).stat()
+        except OSError:
+            stale.append(entry["path"])
+            continue
+        if st.st_size != entry["size"] or st.st_mtime_ns != entry["mtime_ns"]:
+            stale.append(entry["path"])
+    return stale
+
+
+# ============================================================
+# TRA CỨU + CACHE
+# ============================================================
+class ClauseStore:
+    """Trích dẫn → khóa node → text; text đọc bằng seek/read, giữ trong LRU theo dung lượng."""
+
+    def __init__(self, index: dict, cache_bytes: int = DEFAULT_CACHE_MB << 20):
+        self.index = index
+        self.root = Path(index["root"])
+        self.nodes = index["nodes"]
+        self.aliases = {}
+        for doc, info in index["docs"].items():
+            for alias in info["aliases"]:
+                self.aliases.setdefault(alias, doc)
+        self.extractor = CitationExtractor(index["docs"])
+        self.cache_bytes = cache_bytes
+        self._cache = OrderedDict()     # khóa → text
+        self._cached = 0
+        self._handles = {}
+        self.hits = self.misses = self.evictions = 0
+
+    def close(self):
+        for f in self._handles.values():
+            f.close()
+        self._handles.clear()
+
+    # ── trích dẫn → khóa ──
+    def doc_key(self, text: str):
+        """ "30/2020/NĐ-CP", "NĐ 30/2020", "30-2020-ND-CP", "luat-luu-tru-2011" → số hiệu trong chỉ mục."""
+        if not text:
+            return None
+        if text in self.index["docs"]:
+            return text
+        doc = self.aliases.get(_slug(text))
+        if doc:
+            return doc
+        return next((k for k in self.extractor.extract(text) if "#" not in k and k in self.index["docs"]), None)
+
+    def resolve(self, citation: str, doc: str = None) -> list:
+        """Các khóa node mà trích dẫn trỏ tới (theo thứ tự); không nhận ra → ValueError."""
+        citation = citation.strip()
+        current = self.doc_key(doc) if doc else None
+        if "#" in citation:
+            doc_part, node = citation.split("#", 1)
+            key = self.doc_key(doc_part) or doc_part
+            return [f"{key}#{node}"]
+        keys = list(dict.fromkeys(k for k in self.extractor.extract(citation, current) if "#" in k))
+        if keys:
+            return keys
+        m = _PHU_LUC_RE.search(citation)
+        if m:
+            target = self.doc_key(citation[m.end():]) or current
+            if target:
+                return [f"{target}#phu-luc-{m.group(1).upper()}"]
+        if self.doc_key(citation) or current:
+            raise ValueError(f"Trích dẫn thiếu số Điều/Phụ lục: {citation!r}")
+        raise ValueError(f"Không nhận ra văn bản trong trích dẫn: {citation!r} (thêm số hiệu hoặc doc)")
+
+    # ── khóa → text ──
+    def text(self, key: str) -> str:
+        """Text Markdown của node (KeyError nếu không có trong chỉ mục)."""
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return cached
+        self.misses += 1
+        file_no, start, end, _, _ = self.nodes[key]
+        f = self._handles.get(file_no)
+        if f is None:
+            f = self._handles[file_no] = open(self.root / self.index["files"][file_no]["path"], "rb")
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8", errors="replace")
+        self._remember(key, text)
+        return text
+
+    def _remember(self, key: str, text: str):
+        size = len(text) * 2 + 64     # ước lượng, đủ để giới hạn bộ nhớ
+        if size > self.cache_bytes:
+            return
+        self._cache[key] = text
+        self._cached += size
+        while self._cached > self.cache_bytes:
+            _, old = self._cache.popitem(last=False)
+            self._cached -= len(old) * 2 + 64
+            self.evictions += 1
+
+    def clear_cache(self):
+        self._cache.clear()
+        self._cached = 0
+
+    def match(self, key: str) -> dict:
+        file_no, _, _, line, title = self.nodes[key]
+        return {"key": key, "doc": key.split("#", 1)[0], "title": title,
+                "path": self.index["files"][file_no]["path"], "line": line, "text": self.text(key)}
+
+    def lookup(self, citation: str, doc: str = None) -> dict:
+        """Một trích dẫn → {"query", "matches"} hoặc {"query", "error"}."""
+        try:
+            keys = self.resolve(citation, doc)
+        except ValueError as e:
+            return {"query": citation, "error": str(e)}
+        missing = [k for k in keys if k not in self.nodes]
+        if missing:
+            return {"query": citation, "error": f"Không có trong kho: {', '.join(missing)}"}
+        return {"query": citation, "matches": [self.match(k) for k in keys]}
+
+    def lookup_many(self, queries, doc: str = None) -> list:
+        """Batch: mỗi phần tử là chuỗi hoặc {"q", "doc"}; node chưa có trong cache đọc theo thứ tự file/offset.
+
+        Phần tử sai kiểu (q không phải chuỗi, doc không phải chuỗi) chỉ làm
+        phần tử đó thành {"query", "error"}, không hỏng cả batch.
+        """
+        items = []
+        for q in queries:
+            citation, context = (q.get("q"), q.get("doc") or doc) if isinstance(q, dict) else (q, doc)
+            if not isinstance(citation, str) or not citation.strip():
+                items.append((q, None, "Trích dẫn (q) phải là chuỗi khác rỗng"))
+            elif context is not None and not isinstance(context, str):
+                items.append((citation, None, "doc phải là chuỗi (số hiệu hoặc thư mục văn bản)"))
+            else:
+                items.append((citation, context, None))
+        wanted = set()
+        for citation, context, error in items:
+            if error:
+                continue
+            try:
+                wanted.update(k for k in self.resolve(citation, context) if k in self.nodes)
+            except ValueError:
+                pass
+        for key in sorted((k for k in wanted if k not in self._cache), key=lambda k: self.nodes[k][:2]):
+            self.text(key)
+        return [{"query": citation, "error": error} if error else self.lookup(citation, context)
+                for citation, context, error in items]
+
+    def stats(self) -> dict:
+        return {"nodes": len(self.nodes), "docs": len(self.index["docs"]), "cached": len(self._cache),
+                "cache_bytes": self._cached, "cache_limit": self.cache_bytes,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+def open_store(index_path, root=None, cache_bytes: int = DEFAULT_CACHE_MB << 20, quiet: bool = False):
+    """Đọc chỉ mục (build lại nếu chưa có/cũ hơn Markdown) → ClauseStore."""
+    index_path = Path(index_path)
+    index = None
+    if index_path.is_file():
+        try:
+            index = load_clause_index(index_path)
+        except (OSError, ValueError) as e:
+            if not quiet:
+                print(f"⚠️ {e} — build lại")
+    if index is not None and (stale_files(index) or (root and Path(root).resolve() != Path(index["root"]))):
+        if not quiet:
+            print("🔄 Markdown đã thay đổi từ lúc build chỉ mục — build lại")
+        index = None
+    if index is None:
+        index = build_clause_index(root or SCRIPT_DIR, index_path)
+    return ClauseStore(index, cache_bytes)
+
+
+# ============================================================
+# HTTP (asyncio)
+# ============================================================
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ClauseService:
+    """Server HTTP/1.1 tối giản trên asyncio.start_server — chỉ phục vụ các endpoint ở đầu file."""
+
+    def __init__(self, store: ClauseStore, index_path):
+        self.store = store
+        self.index_path = Path(index_path)
+        self.requests = 0
+        self.started = time.time()
+
+    def _route(self, method: str, target: str, body: bytes):
+        """→ (status, content type, bytes)."""
+        url = urlsplit(target)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if url.path == "/health":
+            payload = {"status": "ok", "uptime_s": round(time.time() - self.started), "requests": self.requests,
+                       **self.store.stats()}
+            return 200, payload
+        if url.path == "/resolve":
+            if method != "GET":
+                raise HttpError(405, "Dùng GET /resolve?q=...")
+            if not params.get("q"):
+                raise HttpError(400, "Thiếu tham số q")
+            result = self.store.lookup(params["q"], params.get("doc"))
+            if "error" in result:
+                return 404, result
+            if params.get("format") == "text":
+                return 200, "\n\n".join(m["text"] for m in result["matches"])
+            return 200, result
+        if url.path == "/resolve/batch":
+            if method != "POST":
+                raise HttpError(405, "Dùng POST /resolve/batch")
+            try:
+                request = json.loads(body or b"{}")
+            except ValueError:
+                raise HttpError(400, "Body không phải JSON")
+            queries = request.get("queries") if isinstance(request, dict) else request
+            if not isinstance(queries, list):
+                raise HttpError(400, 'Cần {"queries": [...]}')
+            if len(queries) > MAX_BATCH:
+                raise HttpError(413, f"Tối đa {MAX_BATCH} trích dẫn mỗi batch")
+            doc = request.get("doc") if isinstance(request, dict) else None
+            return 200, {"results": self.store.lookup_many(queries, doc)}
+        if url.path == "/reload":
+            if method != "POST":
+                raise HttpError(405, "Dùng POST /reload")
+            index = build_clause_index(self.store.index["root"], self.index_path)
+            self.store.close()
+            self.store = ClauseStore(index, self.store.cache_bytes)
+            return 200, {"status": "reloaded", **self.store.stats()}
+        raise HttpError(404, f"Không có endpoint {url.path}")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, 413, {"error": "Header quá lớn"}, False)
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Request line không hợp lệ"}, False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, 400, {"error": "Content-Length không hợp lệ"}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "Body quá lớn"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                self.requests += 1
+                try:
+                    status, payload = self._route(method.upper(), target, body)
+                except HttpError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:      # lỗi một request không làm sập server
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status: int, payload, keep_alive: bool):
+        if isinstance(payload, str):
+            data, content_type = payload.encode("utf-8"), "text/plain; charset=utf-8"
+        else:
+            data = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            content_type = "application/json; charset=utf-8"
+        head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\nContent-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES, backlog=1024)
+        print(f"✅ Đang phục vụ {self.store.stats()['nodes']} node tại http://{host}:{port} (Ctrl+C để dừng)")
+        async with server:
+            await server.serve_forever()
+
+
+# ============================================================
+# MAIN
+# ============================================================
+def _print_lookup(result: dict):
+    if "error" in result:
+        print(f"❌ {result['error']}")
+        return
+    for m in result["matches"]:
+        where = f" — {m['title']}" if m["title"] else ""
+        print(f"📄 {m['key']}{where}  ({m['path']}:{m['line']})")
+        print(m["text"])
+        print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dịch vụ tra cứu điều khoản văn bản pháp quy")
+    sub = parser.add_subparsers(dest="command", required=True)
+    default_index = str(SCRIPT_DIR / DEFAULT_INDEX_FILE)
+    p_build = sub.add_parser("build", help="Dựng chỉ mục offset từ kho Markdown")
+    p_build.add_argument("root", nargs="?", default=str(SCRIPT_DIR), help="Thư mục gốc kho văn bản")
+    p_build.add_argument("-o", "--index", help=f"File chỉ mục (mặc định <root>/{DEFAULT_INDEX_FILE})")
+    p_get = sub.add_parser("get", help="Tra một hoặc nhiều trích dẫn (không cần server)")
+    p_get.add_argument("citations", nargs="+", help='Trích dẫn, vd "khoản 2 Điều 8 NĐ 30/2020"')
+    p_get.add_argument("--doc", help="Văn bản mặc định khi trích dẫn không ghi số hiệu")
+    p_get.add_argument("--json", action="store_true", help="In JSON")
+    p_serve = sub.add_parser("serve", help="Chạy HTTP server")
+    p_serve.add_argument("--host", default=DEFAULT_HOST, help=f"Địa chỉ (mặc định {DEFAULT_HOST})")
+    p_serve.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Cổng (mặc định {DEFAULT_PORT})")
+    p_serve.add_argument("--cache-mb", type=int, default=DEFAULT_CACHE_MB,
+                         help=f"Dung lượng cache LRU (MB, mặc định {DEFAULT_CACHE_MB})")
+    for p in (p_get, p_serve):
+        p.add_argument("-i", "--index", default=default_index, help="File chỉ mục")
+        p.add_argument("--root", help="Thư mục gốc kho (khi cần build lại chỉ mục)")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        output = args.index or str(Path(args.root) / DEFAULT_INDEX_FILE)
+        index = build_clause_index(args.root, output)
+        print(f"✅ Đã ghi {output}: {len(index['docs'])} văn bản, {len(index['files'])} file, "
+              f"{len(index['nodes'])} Điều/Khoản/Điểm")
+    elif args.command == "get":
+        store = open_store(args.index, args.root, quiet=args.json)
+        results = store.lookup_many(args.citations, args.doc)
+        if args.json:
+            print(json.dumps(results, ensure_ascii=False, indent=1))
+        else:
+            for result in results:
+                _print_lookup(result)
+        sys.exit(0 if all("matches" in r for r in results) else 1)
+    else:
+        store = open_store(args.index, args.root, args.cache_mb << 20)
+        try:
+            asyncio.run(ClauseService(store, args.index).serve(args.host, args.port))
+        except KeyboardInterrupt:
+            print("\n👋 Đã dừng")
+        except OSError as e:
+            print(f"❌ Không mở được cổng {args.port}: {e}")
+            sys.exit(1)
@@ -1,125 +1,1313 @@
 """
-Script chuyển đổi file Word (.docx) sang Markdown (.md)
+Script chuyển đổi file Word (.docx, .doc) sang Markdown (.md)
 Dùng để chuyển văn bản pháp quy gốc sang format Copilot đọc được.
 
 Cách dùng:
     python convert_word_to_md.py "file.docx"
     python convert_word_to_md.py "file.docx" -o "output.md"
-    python convert_word_to_md.py "folder/"          # convert tất cả .docx trong folder
+    python convert_word_to_md.py "file.docx" -o -  # ghi ra stdout (stream)
+    python convert_word_to_md.py "folder/"          # convert tất cả .docx (và .doc) trong folder
+    python convert_word_to_md.py "folder/" --jobs 8 # convert song song bằng 8 process
+    python convert_word_to_md.py "folder/" -r --incremental
+                                # quét cả thư mục con, chỉ convert file mới/đã sửa
+                                # (theo manifest), xóa .md mồ côi
+    python convert_word_to_md.py "folder/" --ast json  # ghi thêm file.ast.json (cây Điều/Khoản)
+    python convert_word_to_md.py "folder/" -r --incremental --index ".search-index"
+                                # index lại (search_index.py) chỉ các .md vừa ghi
+    python convert_word_to_md.py "file.docx" --rules phu-luc,khoan-diem
+                                # bật thêm luật heading cho Phụ lục, Khoản/Điểm
+    python convert_word_to_md.py "folder/" --stats stats.json
+                                # báo cáo JSON thời gian từng giai đoạn (load, parse,
+                                # style, classify, table, cleanup...) + số paragraph/
+                                # run/bảng/byte của từng file và bản gộp cả thư mục
+    python convert_word_to_md.py "Phuluc1.docx" --stats phuluc1.json --profile cprofile
+                                # + profile cProfile → convert-profiles/Phuluc1.prof
+    python convert_word_to_md.py "Phuluc1.doc"      # Word 97-2003 (xem doc_reader.py)
+    python convert_word_to_md.py "Phuluc3.docx" --tables csv
+                                # + Phuluc3.tables.csv (mọi bảng, ô gộp đã giải)
+    python convert_word_to_md.py "folder/" --merged repeat
+                                # lặp text ô gộp như python-docx (output cũ)
 
 Yêu cầu:
-    pip install python-docx
+    pip install lxml        (đã có sẵn nếu cài python-docx)
+
+Engine đọc thẳng word/document.xml trong file .docx theo kiểu stream
+(lxml.iterparse): duyệt các phần tử con của w:body đúng thứ tự một lần,
+ghi Markdown ra ngay và giải phóng phần đã xử lý — bảng nằm đúng vị trí
+trong văn bản, bộ nhớ không tăng theo độ dài văn bản.
+
+File .doc (Word 97-2003) được đọc bằng doc_reader.py (Python thuần, không cần
+Office) rồi đi qua cùng bộ phân loại heading và cùng process pool. Trong thư
+mục, file .doc đã có bản .docx cùng tên thì bỏ qua.
 """
 
 import sys
 import os
 import re
+import json
+import hashlib
+import argparse
+import posixpath
+import importlib.util
+import time
+import cProfile
+import zipfile
+import contextlib
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import NamedTuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 try:
-    from docx import Document
-    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from lxml import etree
 except ImportError:
-    print("❌ Cần cài python-docx:")
-    print("   pip install python-docx")
+    print("❌ Cần cài lxml:")
+    print("   pip install lxml")
     sys.exit(1)
 
+from table_grid import GridBuilder, TableGrid, MERGED_ONCE, MERGED_MODES, tables_to_csv
 
-def docx_to_markdown(docx_path: str, output_path: str = None) -> str:
-    """Chuyển file .docx sang Markdown text."""
-    doc = Document(docx_path)
-    lines = []
-    
-    for para in doc.paragraphs:
-        text = para.text.strip()
-        if not text:
-            lines.append("")
+
+# Tăng khi thay đổi logic convert làm đổi output → lần sync sau convert lại toàn bộ
+CONVERTER_VERSION = "4"
+MANIFEST_NAME = ".convert-manifest.json"
+DOCX_SUFFIX, DOC_SUFFIX = ".docx", ".doc"
+
+
+# ============================================================
+# ĐỌC OOXML (WordprocessingML)
+# ============================================================
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+REL_OFFICE_DOCUMENT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+REL_STYLES = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles"
+
+
+def _w(tag: str) -> str:
+    return f"{{{W_NS}}}{tag}"
+
+
+W_BODY, W_P, W_TBL, W_TR, W_TC = _w("body"), _w("p"), _w("tbl"), _w("tr"), _w("tc")
+W_R, W_HYPERLINK, W_T = _w("r"), _w("hyperlink"), _w("t")
+W_TAB, W_PTAB, W_BR, W_CR, W_NO_BREAK_HYPHEN = _w("tab"), _w("ptab"), _w("br"), _w("cr"), _w("noBreakHyphen")
+W_PPR, W_PSTYLE, W_RPR, W_B = _w("pPr"), _w("pStyle"), _w("rPr"), _w("b")
+W_TCPR, W_TRPR, W_GRID_SPAN, W_V_MERGE, W_GRID_BEFORE, W_TBL_GRID = (
+    _w("tcPr"), _w("trPr"), _w("gridSpan"), _w("vMerge"), _w("gridBefore"), _w("tblGrid"))
+W_VAL, W_TYPE = _w("val"), _w("type")
+FALSE_VALUES = ("0", "false", "off")
+
+
+def _part_targets(zf: zipfile.ZipFile, rels_name: str, base_dir: str) -> dict:
+    """Đọc file .rels → {relationship type: đường dẫn part trong zip}."""
+    try:
+        root = etree.fromstring(zf.read(rels_name))
+    except KeyError:
+        return {}
+    targets = {}
+    for rel in root.iter(f"{{{REL_NS}}}Relationship"):
+        target = rel.get("Target", "")
+        path = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join(base_dir, target))
+        targets.setdefault(rel.get("Type"), path)
+    return targets
+
+
+def _document_part(zf: zipfile.ZipFile) -> str:
+    return _part_targets(zf, "_rels/.rels", "").get(REL_OFFICE_DOCUMENT, "word/document.xml")
+
+
+def _load_paragraph_styles(zf: zipfile.ZipFile, document_part: str):
+    """styleId → tên style (chữ thường) của các paragraph style, kèm tên style mặc định.
+
+    Giống python-docx: pStyle không tồn tại (hoặc không phải paragraph style)
+    thì dùng style mặc định.
+    """
+    base_dir, name = posixpath.split(document_part)
+    rels = _part_targets(zf, posixpath.join(base_dir, "_rels", name + ".rels"), base_dir)
+    try:
+        root = etree.fromstring(zf.read(rels.get(REL_STYLES, "word/styles.xml")))
+    except KeyError:
+        return {}, ""
+    names = {}
+    default = ""
+    for style in root.iter(_w("style")):
+        if style.get(W_TYPE) != "paragraph":
             continue
-        
-        style_name = (para.style.name or "").lower()
-        
-        # Detect headings
-        if "heading 1" in style_name or "title" in style_name:
-            lines.append(f"# {text}")
-        elif "heading 2" in style_name:
-            lines.append(f"## {text}")
-        elif "heading 3" in style_name:
-            lines.append(f"### {text}")
-        elif "heading 4" in style_name:
-            lines.append(f"#### {text}")
-        # Detect "Điều X." pattern → heading 3
-        elif re.match(r'^Điều \d+[\.\:]', text):
-            lines.append(f"### {text}")
-        # Detect "Chương X" pattern → heading 2
-        elif re.match(r'^Chương [IVXLCDM]+', text) or re.match(r'^CHƯƠNG [IVXLCDM]+', text):
-            lines.append(f"## {text}")
-        # Detect "Mục X" pattern
-        elif re.match(r'^Mục \d+', text):
-            lines.append(f"#### {text}")
-        # Detect all-caps lines (likely section headers)
-        elif text.isupper() and len(text) < 100:
-            lines.append(f"## {text}")
-        # List items
-        elif text.startswith(("- ", "• ", "– ")):
-            lines.append(f"- {text[2:]}")
-        elif re.match(r'^\d+[\.\)]\s', text):
-            lines.append(text)  # numbered list
-        elif re.match(r'^[a-zđ][\.\)]\s', text):
-            lines.append(f"- {text}")  # lettered list → bullet
-        else:
-            # Check for bold runs
-            has_bold = any(run.bold for run in para.runs if run.text.strip())
-            all_bold = all(run.bold for run in para.runs if run.text.strip()) if para.runs else False
-            
-            if all_bold and len(text) < 80:
-                lines.append(f"**{text}**")
+        name_el = style.find(_w("name"))
+        style_name = (name_el.get(W_VAL) if name_el is not None else None) or ""
+        names[style.get(_w("styleId"))] = style_name.lower()
+        if style.get(_w("default")) in ("1", "true", "on"):
+            default = style_name.lower()
+    return names, default
+
+
+def _run_text(r) -> str:
+    parts = []
+    for child in r:
+        tag = child.tag
+        if tag == W_T:
+            parts.append(child.text or "")
+        elif tag == W_TAB or tag == W_PTAB:
+            parts.append("\t")
+        elif tag == W_BR:
+            if child.get(W_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag == W_CR:
+            parts.append("\n")
+        elif tag == W_NO_BREAK_HYPHEN:
+            parts.append("-")
+    return "".join(parts)
+
+
+def _paragraph_text(p) -> str:
+    """Text của paragraph, gồm cả run nằm trong hyperlink (như python-docx)."""
+    parts = []
+    for child in p:
+        if child.tag == W_R:
+            parts.append(_run_text(child))
+        elif child.tag == W_HYPERLINK:
+            parts.extend(_run_text(r) for r in child.iterchildren(W_R))
+    return "".join(parts)
+
+
+def _run_is_bold(r) -> bool:
+    rpr = r.find(W_RPR)
+    b = rpr.find(W_B) if rpr is not None else None
+    return b is not None and b.get(W_VAL, "true").lower() not in FALSE_VALUES
+
+
+def _paragraph_all_bold(p) -> bool:
+    """Mọi run có chữ (run trực tiếp, không tính hyperlink) đều in đậm.
+
+    Một lượt qua các run, dừng ngay ở run có chữ mà không đậm.
+    """
+    has_run = False
+    for r in p.iterchildren(W_R):
+        has_run = True
+        if not _run_is_bold(r) and _run_text(r).strip():
+            return False
+    return has_run
+
+
+def _paragraph_style(p, styles: dict, default_style: str) -> str:
+    ppr = p.find(W_PPR)
+    pstyle = ppr.find(W_PSTYLE) if ppr is not None else None
+    if pstyle is None:
+        return default_style
+    return styles.get(pstyle.get(W_VAL), default_style)
+
+
+# ============================================================
+# PHÂN LOẠI HEADING — BẢNG LUẬT BIÊN DỊCH SẴN
+# ============================================================
+ALL_CAPS = None  # pattern đặc biệt: dòng viết hoa toàn bộ
+
+
+class HeadingRule(NamedTuple):
+    """Một luật nhận dạng dòng theo nội dung.
+
+    pattern: regex khớp ở đầu dòng (không cần ^), hoặc ALL_CAPS.
+    template: format string; {text} = cả dòng, {rest} = phần sau đoạn khớp.
+    max_len: chỉ áp dụng khi dòng ngắn hơn giá trị này.
+    """
+    name: str
+    pattern: str
+    template: str
+    max_len: int = None
+
+
+# Thứ tự = độ ưu tiên (giống chuỗi if/elif cũ)
+DEFAULT_RULES = [
+    HeadingRule("dieu", r'Điều \d+[\.\:]', "### {text}"),
+    HeadingRule("chuong", r'(?:Chương|CHƯƠNG) [IVXLCDM]+', "## {text}"),
+    HeadingRule("muc", r'Mục \d+', "#### {text}"),
+    HeadingRule("all_caps", ALL_CAPS, "## {text}", max_len=100),
+    HeadingRule("bullet", r'(?:- |• |– )', "- {rest}"),
+    HeadingRule("numbered", r'\d+[\.\)]\s', "{text}"),
+    HeadingRule("lettered", r'[a-zđ][\.\)]\s', "- {text}"),
+]
+
+# Luật mở rộng cho loại văn bản khác, dùng: HeadingClassifier(PHU_LUC_RULES + DEFAULT_RULES)
+PHU_LUC_RULES = [
+    HeadingRule("phu_luc", r'(?:Phụ lục|PHỤ LỤC) [IVXLCDM\d]+', "## {text}"),
+]
+# Khoản/Điểm thành heading con của Điều (mặc định Khoản là danh sách số, Điểm là bullet)
+KHOAN_DIEM_RULES = [
+    HeadingRule("khoan", r'\d+\.\s', "#### {text}"),
+    HeadingRule("diem", r'[a-zđ]\)\s', "##### {text}"),
+]
+
+# Bộ luật mở rộng bật được từ dòng lệnh (--rules phu-luc,khoan-diem)
+EXTRA_RULE_SETS = {
+    "phu-luc": PHU_LUC_RULES,
+    "khoan-diem": KHOAN_DIEM_RULES,
+}
+
+# Style Word → heading (so khớp chuỗi con trên tên style viết thường)
+STYLE_RULES = [
+    (("heading 1", "title"), "# "),
+    (("heading 2",), "## "),
+    (("heading 3",), "### "),
+    (("heading 4",), "#### "),
+]
+
+
+@lru_cache(maxsize=None)
+def _style_prefix(style_name: str):
+    """Tiền tố heading theo tên style (cache: mỗi style chỉ tính một lần)."""
+    for needles, prefix in STYLE_RULES:
+        if any(n in style_name for n in needles):
+            return prefix
+    return None
+
+
+class HeadingClassifier:
+    """Phân loại một dòng theo bảng HeadingRule.
+
+    Các luật regex liền nhau được gộp thành một regex alternation với named
+    group (biên dịch một lần), nên mỗi dòng chỉ chạy vài lệnh match thay vì
+    lần lượt từng pattern. Luật ALL_CAPS chia bảng thành các đoạn để giữ
+    đúng thứ tự ưu tiên.
+    """
+
+    def __init__(self, rules=None):
+        self.rules = list(DEFAULT_RULES if rules is None else rules)
+        self._steps = []  # [(regex gộp | ALL_CAPS, {group name: rule})]
+        group = []
+        for rule in self.rules:
+            if rule.pattern is ALL_CAPS:
+                self._flush(group)
+                group = []
+                self._steps.append((ALL_CAPS, rule))
             else:
-                lines.append(text)
-    
-    # Process tables
-    for table in doc.tables:
-        lines.append("")
-        # Header row
-        header = [cell.text.strip().replace("\n", " ") for cell in table.rows[0].cells]
-        lines.append("| " + " | ".join(header) + " |")
-        lines.append("| " + " | ".join(["---"] * len(header)) + " |")
-        # Data rows
-        for row in table.rows[1:]:
-            cells = [cell.text.strip().replace("\n", " ") for cell in row.cells]
-            lines.append("| " + " | ".join(cells) + " |")
-        lines.append("")
-    
-    markdown = "\n".join(lines)
-    
-    # Clean up multiple blank lines
-    markdown = re.sub(r'\n{3,}', '\n\n', markdown)
+                group.append(rule)
+        self._flush(group)
+
+    def _flush(self, group):
+        if not group:
+            return
+        by_group = {f"r{i}": rule for i, rule in enumerate(group)}
+        alternatives = []
+        for g, rule in by_group.items():
+            # max_len đưa vào lookahead để alternation tự chuyển sang luật sau
+            guard = f"(?=.{{0,{rule.max_len - 1}}}\\Z)" if rule.max_len else ""
+            alternatives.append(f"(?P<{g}>{guard}{rule.pattern})")
+        regex = re.compile("|".join(alternatives), re.S)
+        self._steps.append((regex, by_group))
+
+    def match(self, text: str):
+        """Trả về (tên luật, dòng Markdown) theo luật đầu tiên khớp, hoặc None."""
+        for matcher, rules in self._steps:
+            if matcher is ALL_CAPS:
+                if (rules.max_len is None or len(text) < rules.max_len) and text.isupper():
+                    return rules.name, rules.template.format(text=text, rest=text)
+                continue
+            m = matcher.match(text)
+            if m is None:
+                continue
+            rule = rules[m.lastgroup]
+            return rule.name, rule.template.format(text=text, rest=text[m.end():])
+        return None
+
+    def classify(self, text: str):
+        """Trả về dòng Markdown theo luật đầu tiên khớp, hoặc None."""
+        matched = self.match(text)
+        return matched[1] if matched else None
+
+    def __getstate__(self):
+        return {"rules": self.rules}
+
+    def __setstate__(self, state):
+        self.__init__(state["rules"])
+
+
+DEFAULT_CLASSIFIER = HeadingClassifier()
+
+
+# ============================================================
+# ĐO THỜI GIAN TỪNG GIAI ĐOẠN / PROFILING
+# ============================================================
+# Giai đoạn → việc được tính giờ (phần còn lại của wall time là "other")
+STAGES = {
+    "load": "mở zip, đọc .rels và styles.xml",
+    "parse": "lxml iterparse document.xml + giải phóng phần tử đã xử lý",
+    "text": "ghép text các run của paragraph",
+    "style": "tra paragraph style → heading",
+    "classify": "regex HeadingClassifier",
+    "bold": "kiểm tra paragraph in đậm toàn bộ",
+    "table": "dựng lưới bảng (gridSpan/vMerge) → dòng Markdown",
+    "cleanup": "gộp dòng trống thừa (_BlankLineCollapser)",
+    "ast": "dựng AST (LegalAstBuilder)",
+    "write": "ghi Markdown ra file/stream",
+}
+COUNTERS = ("paragraphs", "empty_paragraphs", "runs", "tables", "table_rows", "table_cells",
+            "docx_bytes", "xml_bytes", "chars_out", "bytes_out")
+PROFILERS = {"cprofile": ".prof", "pyinstrument": ".html"}
+DEFAULT_PROFILE_DIR = "convert-profiles"
+
+
+class ConversionStats:
+    """Thời gian từng giai đoạn (STAGES) và bộ đếm (COUNTERS) của một lần convert.
+
+    Truyền vào iter_blocks/iter_markdown/write_markdown/convert_file qua tham
+    số stats; để None (mặc định) thì engine chạy đường không đo, không tốn gì thêm.
+    """
+
+    def __init__(self, source: str = ""):
+        self.source = source
+        self.times = dict.fromkeys(STAGES, 0.0)
+        self.counts = dict.fromkeys(COUNTERS, 0)
+        self.kinds = {}   # loại block (heading, dieu, text...) → số lượng
+        self.wall = 0.0
+
+    def add_time(self, stage: str, seconds: float):
+        self.times[stage] += seconds
+
+    def count(self, name: str, n: int = 1):
+        self.counts[name] += n
+
+    def to_dict(self) -> dict:
+        staged = sum(self.times.values())
+        return {
+            "source": self.source,
+            "wall_s": round(self.wall, 6),
+            "stages_s": {k: round(v, 6) for k, v in self.times.items()},
+            "other_s": round(max(self.wall - staged, 0.0), 6),
+            "counts": dict(self.counts),
+            "kinds": dict(sorted(self.kinds.items())),
+        }
+
+
+def aggregate_reports(reports: list, elapsed: float = None, slowest: int = 10) -> dict:
+    """Gộp báo cáo của nhiều file: cộng thời gian/bộ đếm, kèm các file chậm nhất.
+
+    elapsed: thời gian thực của cả lượt chạy (khi chạy song song, wall_s là
+    tổng thời gian của các worker nên lớn hơn elapsed).
+    """
+    total = {"files": len(reports), "wall_s": 0.0, "stages_s": dict.fromkeys(STAGES, 0.0),
+             "other_s": 0.0, "counts": dict.fromkeys(COUNTERS, 0), "kinds": {}}
+    for report in reports:
+        total["wall_s"] += report["wall_s"]
+        total["other_s"] += report["other_s"]
+        for key, value in report["stages_s"].items():
+            total["stages_s"][key] = total["stages_s"].get(key, 0.0) + value
+        for key, value in report["counts"].items():
+            total["counts"][key] = total["counts"].get(key, 0) + value
+        for key, value in report["kinds"].items():
+            total["kinds"][key] = total["kinds"].get(key, 0) + value
+    total["wall_s"] = round(total["wall_s"], 6)
+    total["other_s"] = round(total["other_s"], 6)
+    total["stages_s"] = {k: round(v, 6) for k, v in total["stages_s"].items()}
+    total["kinds"] = dict(sorted(total["kinds"].items()))
+    if elapsed is not None:
+        total["elapsed_s"] = round(elapsed, 6)
+    ranked = sorted(reports, key=lambda r: r["wall_s"], reverse=True)[:slowest]
+    total["slowest"] = [{"source": r["source"], "wall_s": r["wall_s"]} for r in ranked]
+    return total
+
+
+def print_stage_summary(report: dict):
+    """In bảng thời gian theo giai đoạn (report của một file hoặc bản gộp)."""
+    wall = report["wall_s"] or 1e-12
+    rows = sorted(report["stages_s"].items(), key=lambda kv: kv[1], reverse=True)
+    rows.append(("other", report["other_s"]))
+    print(f"⏱️ Thời gian theo giai đoạn (tổng {report['wall_s']:.3f}s):")
+    for stage, seconds in rows:
+        print(f"   {stage:<9} {seconds:9.4f}s  {seconds / wall:6.1%}")
+    counts = report["counts"]
+    print(f"   {counts['paragraphs']} paragraph, {counts['runs']} run, {counts['tables']} bảng "
+          f"({counts['table_rows']} dòng, {counts['table_cells']} ô), "
+          f"{counts['docx_bytes'] / 1024:.0f} KB .docx → {counts['bytes_out'] / 1024:.0f} KB .md")
+
+
+@contextmanager
+def profiled(profiler: str, output_path):
+    """Chạy khối lệnh dưới profiler và ghi kết quả ra output_path.
+
+    "cprofile": file .prof (xem bằng python -m pstats / snakeviz);
+    "pyinstrument": trang HTML (cần pip install pyinstrument).
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if profiler == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            raise ImportError("Cần cài pyinstrument để dùng --profile pyinstrument: pip install pyinstrument")
+        prof = Profiler()
+        prof.start()
+        try:
+            yield
+        finally:
+            prof.stop()
+            output_path.write_text(prof.output_html(), encoding='utf-8')
+    else:
+        prof = cProfile.Profile()
+        prof.enable()
+        try:
+            yield
+        finally:
+            prof.disable()
+            prof.dump_stats(str(output_path))
+
+
+# ============================================================
+# CHUYỂN PARAGRAPH / TABLE → MARKDOWN
+# ============================================================
+def _paragraph_to_block(p, styles: dict, default_style: str, classifier: HeadingClassifier):
+    """Một paragraph → (loại, text, dòng Markdown).
+
+    Loại: "empty", "heading" (theo style), tên HeadingRule, "bold" hoặc "text".
+    """
+    text = _paragraph_text(p).strip()
+    if not text:
+        return "empty", text, ""
+    
+    prefix = _style_prefix(_paragraph_style(p, styles, default_style))
+    if prefix:
+        return "heading", text, prefix + text
     
+    matched = classifier.match(text)
+    if matched is not None:
+        return matched[0], text, matched[1]
+    # Bold paragraph ngắn → **...**
+    if len(text) < 80 and _paragraph_all_bold(p):
+        return "bold", text, f"**{text}**"
+    return "text", text, text
+
+
+def _paragraph_to_block_timed(p, styles: dict, default_style: str, classifier: HeadingClassifier,
+                              stats: ConversionStats):
+    """Như _paragraph_to_block nhưng tính giờ từng bước vào stats (giữ cùng thứ tự bước)."""
+    clock = time.perf_counter
+    t0 = clock()
+    text = _paragraph_text(p).strip()
+    t1 = clock()
+    stats.add_time("text", t1 - t0)
+    stats.count("paragraphs")
+    stats.count("runs", sum(1 for _ in p.iter(W_R)))
+    if not text:
+        stats.count("empty_paragraphs")
+        return "empty", text, ""
+
+    prefix = _style_prefix(_paragraph_style(p, styles, default_style))
+    t2 = clock()
+    stats.add_time("style", t2 - t1)
+    if prefix:
+        return "heading", text, prefix + text
+
+    matched = classifier.match(text)
+    t3 = clock()
+    stats.add_time("classify", t3 - t2)
+    if matched is not None:
+        return matched[0], text, matched[1]
+    if len(text) < 80:
+        bold = _paragraph_all_bold(p)
+        stats.add_time("bold", clock() - t3)
+        if bold:
+            return "bold", text, f"**{text}**"
+    return "text", text, text
+
+
+def _cell_text(tc) -> str:
+    return "\n".join(_paragraph_text(p) for p in tc.iterchildren(W_P)).strip().replace("\n", " ")
+
+
+def _tc_props(tc):
+    """(gridSpan, là ô nối dọc tiếp theo?) của một w:tc."""
+    tcpr = tc.find(W_TCPR)
+    if tcpr is None:
+        return 1, False
+    span_el = tcpr.find(W_GRID_SPAN)
+    span = int(span_el.get(W_VAL, "1")) if span_el is not None else 1
+    vmerge = tcpr.find(W_V_MERGE)
+    continues = vmerge is not None and vmerge.get(W_VAL, "continue") == "continue"
+    return max(span, 1), continues
+
+
+def _table_grid(tbl) -> TableGrid:
+    """Giải gridSpan/vMerge của một w:tbl thành TableGrid trong một lượt.
+
+    Số cột lưới lấy từ w:tblGrid (hoặc dòng rộng nhất); ô nối dọc không
+    đọc text, chỉ tăng rowspan của ô gốc phía trên.
+    """
+    tbl_grid = tbl.find(W_TBL_GRID)
+    builder = GridBuilder(len(tbl_grid) if tbl_grid is not None else 0)
+    for tr in tbl.iterchildren(W_TR):
+        trpr = tr.find(W_TRPR)
+        before = trpr.find(W_GRID_BEFORE) if trpr is not None else None
+        builder.start_row(int(before.get(W_VAL, "0")) if before is not None else 0)
+        for tc in tr.iterchildren(W_TC):
+            span, continues = _tc_props(tc)
+            builder.add_cell("" if continues else _cell_text(tc), span, continues)
+    return builder.build()
+
+
+def iter_blocks(docx_path: str, classifier: HeadingClassifier = None, stats: ConversionStats = None,
+                merged: str = MERGED_ONCE, on_table=None):
+    """Duyệt w:body một lần theo đúng thứ tự, sinh (loại, text, dòng Markdown).
+
+    Mỗi phần tử con của body (paragraph/bảng) được xóa khỏi cây ngay sau khi
+    xử lý nên bộ nhớ chỉ giữ phần tử đang đọc. Dòng của bảng có loại "table".
+    stats: ConversionStats — đo thời gian/đếm theo giai đoạn (đường chạy riêng).
+    merged: cách ghi ô gộp trong bảng Markdown ("once"/"repeat", xem table_grid.py).
+    on_table(grid): gọi với TableGrid của từng bảng (xuất CSV/JSON).
+    """
+    classifier = classifier or DEFAULT_CLASSIFIER
+    if Path(docx_path).suffix.lower() == DOC_SUFFIX:
+        yield from _iter_doc_blocks(docx_path, classifier, stats, merged, on_table)
+        return
+    if stats is not None:
+        yield from _iter_blocks_timed(docx_path, classifier, stats, merged, on_table)
+        return
+    with zipfile.ZipFile(docx_path) as zf:
+        document_part = _document_part(zf)
+        styles, default_style = _load_paragraph_styles(zf, document_part)
+        with zf.open(document_part) as f:
+            for _, elem in etree.iterparse(f, events=("end",), tag=(W_P, W_TBL)):
+                body = elem.getparent()
+                if body is None or body.tag != W_BODY:
+                    continue  # paragraph trong bảng — bảng tự xử lý
+                if elem.tag == W_P:
+                    yield _paragraph_to_block(elem, styles, default_style, classifier)
+                else:
+                    grid = _table_grid(elem)
+                    if on_table is not None:
+                        on_table(grid)
+                    for line in grid.markdown_lines(merged):
+                        yield "table", None, line
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del body[0]
+
+
+def _iter_blocks_timed(docx_path: str, classifier: HeadingClassifier, stats: ConversionStats,
+                       merged: str = MERGED_ONCE, on_table=None):
+    """iter_blocks có đo: thời gian chờ iterparse tính vào "parse", mỗi bước xử lý
+    paragraph/bảng tính vào giai đoạn tương ứng. Thời gian của bên tiêu thụ
+    generator không bị tính ở đây."""
+    clock = time.perf_counter
+    t0 = clock()
+    stats.count("docx_bytes", os.path.getsize(docx_path))
+    with zipfile.ZipFile(docx_path) as zf:
+        document_part = _document_part(zf)
+        styles, default_style = _load_paragraph_styles(zf, document_part)
+        stats.count("xml_bytes", zf.getinfo(document_part).file_size)
+        with zf.open(document_part) as f:
+            events = etree.iterparse(f, events=("end",), tag=(W_P, W_TBL))
+            stats.add_time("load", clock() - t0)
+            while True:
+                t0 = clock()
+                event = next(events, None)
+                stats.add_time("parse", clock() - t0)
+                if event is None:
+                    break
+                elem = event[1]
+                body = elem.getparent()
+                if body is None or body.tag != W_BODY:
+                    continue
+                if elem.tag == W_P:
+                    block = _paragraph_to_block_timed(elem, styles, default_style, classifier, stats)
+                    stats.kinds[block[0]] = stats.kinds.get(block[0], 0) + 1
+                    yield block
+                else:
+                    t0 = clock()
+                    grid = _table_grid(elem)
+                    if on_table is not None:
+                        on_table(grid)
+                    lines = list(grid.markdown_lines(merged))
+                    stats.add_time("table", clock() - t0)
+                    _count_table(stats, grid)
+                    for line in lines:
+                        yield "table", None, line
+                t0 = clock()
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del body[0]
+                stats.add_time("parse", clock() - t0)
+
+
+def _text_to_block(text: str, style_name: str, is_bold, classifier: HeadingClassifier):
+    """Như _paragraph_to_block cho nguồn không phải OOXML (file .doc).
+
+    is_bold(): hàm kiểm tra paragraph in đậm toàn bộ, chỉ gọi khi cần.
+    """
+    text = text.strip()
+    if not text:
+        return "empty", text, ""
+    prefix = _style_prefix(style_name)
+    if prefix:
+        return "heading", text, prefix + text
+    matched = classifier.match(text)
+    if matched is not None:
+        return matched[0], text, matched[1]
+    if len(text) < 80 and is_bold():
+        return "bold", text, f"**{text}**"
+    return "text", text, text
+
+
+def _count_table(stats: ConversionStats, grid: TableGrid):
+    stats.count("tables")
+    stats.count("table_rows", grid.n_rows)
+    stats.count("table_cells", len(grid.cells))
+
+
+def _iter_doc_blocks(doc_path: str, classifier: HeadingClassifier, stats: ConversionStats = None,
+                     merged: str = MERGED_ONCE, on_table=None):
+    """Các block của file .doc: doc_reader đọc paragraph/bảng, phân loại như .docx.
+
+    Có stats: đọc file OLE2 + text tính vào "parse", phân loại vào "classify",
+    dựng dòng bảng vào "table" (không tách được load/style/run như OOXML).
+    """
+    from doc_reader import iter_doc_items
+    if stats is None:
+        for item in iter_doc_items(doc_path):
+            if item[0] == "paragraph":
+                yield _text_to_block(item[1], item[2], item[3], classifier)
+            else:
+                if on_table is not None:
+                    on_table(item[1])
+                for line in item[1].markdown_lines(merged):
+                    yield "table", None, line
+        return
+    clock = time.perf_counter
+    stats.count("docx_bytes", os.path.getsize(doc_path))
+    items = iter_doc_items(doc_path)
+    while True:
+        t0 = clock()
+        item = next(items, None)
+        t1 = clock()
+        stats.add_time("parse", t1 - t0)
+        if item is None:
+            break
+        if item[0] == "paragraph":
+            block = _text_to_block(item[1], item[2], item[3], classifier)
+            stats.add_time("classify", clock() - t1)
+            stats.count("paragraphs")
+            if block[0] == "empty":
+                stats.count("empty_paragraphs")
+            stats.kinds[block[0]] = stats.kinds.get(block[0], 0) + 1
+            yield block
+        else:
+            if on_table is not None:
+                on_table(item[1])
+            lines = list(item[1].markdown_lines(merged))
+            stats.add_time("table", clock() - t1)
+            _count_table(stats, item[1])
+            for line in lines:
+                yield "table", None, line
+
+
+def iter_markdown_lines(docx_path: str, classifier: HeadingClassifier = None):
+    """Từng dòng Markdown (chưa gộp dòng trống)."""
+    for _, _, line in iter_blocks(docx_path, classifier):
+        yield line
+
+
+class _BlankLineCollapser:
+    """Gộp >= 3 ký tự xuống dòng liên tiếp thành 2 (bỏ dòng trống thừa).
+
+    Tương đương ``re.sub(r'\\n{3,}', '\\n\\n', text)`` nhưng chạy trên từng
+    chunk nên không cần giữ toàn bộ văn bản.
+    """
+
+    def __init__(self):
+        self.pending = 0
+
+    def feed(self, text: str) -> str:
+        out = []
+        for part in re.split(r'(\n+)', text):
+            if not part:
+                continue
+            if part[0] == "\n":
+                self.pending += len(part)
+            else:
+                out.append("\n" * min(self.pending, 2))
+                out.append(part)
+                self.pending = 0
+        return "".join(out)
+
+    def flush(self) -> str:
+        out = "\n" * min(self.pending, 2)
+        self.pending = 0
+        return out
+
+
+def iter_markdown(docx_path: str, classifier: HeadingClassifier = None, on_block=None,
+                  stats: ConversionStats = None, merged: str = MERGED_ONCE, on_table=None):
+    """Sinh Markdown theo từng chunk (đã gộp dòng trống thừa).
+
+    on_block(loại, text, start, end): gọi cho mỗi dòng có nội dung, với vị trí
+    ký tự [start, end) của dòng trong Markdown đầu ra (dùng để dựng AST).
+    stats: ConversionStats — cộng thêm giai đoạn "cleanup" và "ast".
+    merged, on_table: xem iter_blocks.
+    """
+    clock = time.perf_counter
+    collapser = _BlankLineCollapser()
+    first = True
+    offset = 0
+    for kind, text, line in iter_blocks(docx_path, classifier, stats, merged, on_table):
+        if stats is not None:
+            t0 = clock()
+        chunk = collapser.feed(line if first else "\n" + line)
+        first = False
+        if stats is not None:
+            t1 = clock()
+            stats.add_time("cleanup", t1 - t0)
+        if chunk:
+            if on_block is not None:
+                start = offset + len(chunk) - len(chunk.lstrip("\n"))
+                on_block(kind, text, start, offset + len(chunk))
+                if stats is not None:
+                    stats.add_time("ast", clock() - t1)
+            offset += len(chunk)
+            yield chunk
+    tail = collapser.flush()
+    if stats is not None:
+        stats.count("chars_out", offset + len(tail))
+    if tail:
+        yield tail
+
+
+def write_markdown(docx_path: str, out, classifier: HeadingClassifier = None, on_block=None,
+                   stats: ConversionStats = None, merged: str = MERGED_ONCE, on_table=None):
+    """Ghi Markdown ra stream text (file, sys.stdout...) ngay khi sinh ra.
+
+    Trả về số ký tự đã ghi.
+    """
+    written = 0
+    if stats is None:
+        for chunk in iter_markdown(docx_path, classifier, on_block, None, merged, on_table):
+            out.write(chunk)
+            written += len(chunk)
+        return written
+    clock = time.perf_counter
+    start = clock()
+    for chunk in iter_markdown(docx_path, classifier, on_block, stats, merged, on_table):
+        t0 = clock()
+        out.write(chunk)
+        stats.add_time("write", clock() - t0)
+        written += len(chunk)
+    stats.wall += clock() - start
+    return written
+
+
+def convert_file(docx_path: str, output_path: str, classifier: HeadingClassifier = None,
+                 ast_format: str = None, stats: ConversionStats = None, merged: str = MERGED_ONCE,
+                 tables_format: str = None):
+    """Convert và ghi thẳng ra file (qua file tạm, thay thế nguyên tử).
+
+    ast_format="json"/"msgpack": ghi thêm cây AST (xem LegalAstBuilder) cạnh
+    file .md, dựng trong cùng một lượt đọc.
+    stats: ConversionStats — đo từng giai đoạn; bytes_out là kích thước file .md.
+    merged: cách ghi ô gộp ("once"/"repeat").
+    tables_format="csv"/"json": ghi thêm mọi bảng ra file .tables.csv/.tables.json.
+    """
+    start = time.perf_counter()
+    output = Path(output_path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    builder = LegalAstBuilder(Path(docx_path).name) if ast_format else None
+    tables = [] if tables_format else None
+    tmp = output.with_name(output.name + ".tmp")
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            length = write_markdown(docx_path, f, classifier, builder.add if builder else None, stats,
+                                    merged, tables.append if tables is not None else None)
+        if tables is not None:
+            save_tables(tables, tables_path_for(output, tables_format), tables_format, merged)
+        if builder:
+            t0 = time.perf_counter()
+            save_ast(builder.result(length), ast_path_for(output, ast_format), ast_format)
+            if stats is not None:
+                stats.add_time("ast", time.perf_counter() - t0)
+        os.replace(tmp, output)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    if stats is not None:
+        stats.count("bytes_out", output.stat().st_size)
+        stats.wall = time.perf_counter() - start
+
+
+def docx_to_markdown(docx_path: str, output_path: str = None, quiet: bool = False,
+                     classifier: HeadingClassifier = None, stats: ConversionStats = None,
+                     merged: str = MERGED_ONCE) -> str:
+    """Chuyển file .docx sang Markdown text.
+
+    quiet=True: không in thông báo (dùng khi chạy trong process pool,
+    tiến độ do process chính in ra).
+    classifier: bộ luật heading riêng (mặc định DEFAULT_RULES).
+    stats: ConversionStats — đo từng giai đoạn (xem STAGES).
+    merged: cách ghi ô gộp trong bảng ("once": text một lần ở ô gốc;
+    "repeat": lặp ở mọi ô bị gộp như python-docx).
+    Văn bản rất lớn: dùng convert_file/write_markdown để không giữ cả chuỗi.
+    """
+    start = time.perf_counter()
+    markdown = "".join(iter_markdown(docx_path, classifier, stats=stats, merged=merged))
+    if stats is not None:
+        stats.count("bytes_out", len(markdown.encode('utf-8')))
+        stats.wall = time.perf_counter() - start
+
     # Save if output path provided
     if output_path:
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(markdown)
-        print(f"✅ Đã chuyển: {docx_path} → {output_path}")
+        if not quiet:
+            print(f"✅ Đã chuyển: {docx_path} → {output_path}")
     
     return markdown
 
 
-def process_folder(folder_path: str):
-    """Chuyển tất cả .docx trong folder."""
+# ============================================================
+# AST VĂN BẢN PHÁP QUY (Chương → Mục → Điều → Khoản → Điểm)
+# ============================================================
+AST_VERSION = 1
+AST_SUFFIXES = {"json": ".ast.json", "msgpack": ".ast.msgpack"}
+
+_NUM_RE = re.compile(r'(?:Phụ lục|PHỤ LỤC|Chương|CHƯƠNG|Mục|Điều)\s+([IVXLCDM\d]+)[\.\:]?\s*(.*)', re.S)
+_KHOAN_RE = re.compile(r'(\d+)[\.\)]\s')
+_DIEM_RE = re.compile(r'([a-zđ])[\.\)]\s')
+
+# Cấp của từng loại node (số nhỏ = cấp cao)
+_LEVELS = {"phu_luc": 0, "chuong": 1, "muc": 2, "dieu": 3, "khoan": 4, "diem": 5}
+_ID_PREFIX = {"phu_luc": "phu-luc", "chuong": "chuong", "muc": "muc", "dieu": "dieu",
+              "khoan": "khoan", "diem": "diem"}
+
+
+def ast_path_for(md_path, ast_format: str) -> Path:
+    md_path = Path(md_path)
+    return md_path.with_name(md_path.stem + AST_SUFFIXES[ast_format])
+
+
+class LegalAstBuilder:
+    """Dựng cây cấu trúc văn bản từ luồng (loại, text, start, end) của iter_markdown.
+
+    Mỗi node: {"id", "type", "num", "title", "start", "end", "children"}.
+    start/end là vị trí ký tự (str index) trong file Markdown đầu ra, end gồm
+    cả nội dung thuộc node cho tới node kế tiếp cùng cấp/cao hơn.
+    id ổn định theo số hiệu, không theo thứ tự xuất hiện: "dieu-12",
+    "dieu-12.khoan-2.diem-a", "chuong-I.muc-1" (Điều đánh số liên tục trong
+    văn bản nên không kèm Chương/Mục; nằm trong Phụ lục thì có tiền tố Phụ lục).
+    """
+
+    def __init__(self, source: str):
+        self.root = {"type": "document", "source": source, "children": []}
+        self._stack = []  # các node đang mở, cấp tăng dần
+        self._ids = set()
+        self._end = 0
+        self._await_title = None  # Chương/Mục: tên nằm ở dòng viết hoa kế tiếp
+
+    def add(self, kind: str, text: str, start: int, end: int):
+        node_type, num, title = self._node_for(kind, text)
+        if node_type is None:
+            if self._await_title is not None and kind == "all_caps":
+                self._await_title["title"] = text
+            self._await_title = None
+            self._end = end
+            return
+        self._open(node_type, num, title, start)
+        self._end = end
+        self._await_title = self._stack[-1] if node_type in ("chuong", "muc") and not title else None
+
+    def _node_for(self, kind: str, text: str):
+        if kind in ("phu_luc", "chuong", "muc", "dieu"):
+            m = _NUM_RE.match(text)
+            if m:
+                return kind, m.group(1), m.group(2).strip()
+            return None, None, None
+        inside = {n["type"] for n in self._stack}
+        if kind in ("numbered", "khoan") and "dieu" in inside:
+            m = _KHOAN_RE.match(text)
+            if m:
+                return "khoan", m.group(1), ""
+        if kind in ("lettered", "diem") and "dieu" in inside:
+            m = _DIEM_RE.match(text)
+            if m:
+                return "diem", m.group(1), ""
+        return None, None, None
+
+    def _open(self, node_type: str, num: str, title: str, start: int):
+        level = _LEVELS[node_type]
+        while self._stack and _LEVELS[self._stack[-1]["type"]] >= level:
+            self._stack.pop()["end"] = self._end
+        parent = self._stack[-1] if self._stack else self.root
+        node_id = f"{_ID_PREFIX[node_type]}-{num}"
+        if node_type in ("muc", "khoan", "diem") or (node_type == "dieu" and self._stack
+                                                       and self._stack[0]["type"] == "phu_luc"):
+            scope = next((n for n in reversed(self._stack)
+                          if _LEVELS[n["type"]] < level and (node_type != "dieu" or n["type"] == "phu_luc")), None)
+            if scope is not None:
+                node_id = f"{scope['id']}.{node_id}"
+        base, n = node_id, 2
+        while node_id in self._ids:  # số hiệu trùng (văn bản lỗi đánh số)
+            node_id = f"{base}~{n}"
+            n += 1
+        self._ids.add(node_id)
+        node = {"id": node_id, "type": node_type, "num": num, "title": title,
+                "start": start, "end": start, "children": []}
+        parent["children"].append(node)
+        self._stack.append(node)
+
+    def result(self, length: int = None) -> dict:
+        """Đóng các node còn mở; length = độ dài Markdown (ký tự)."""
+        while self._stack:
+            self._stack.pop()["end"] = self._end
+        self.root["ast_version"] = AST_VERSION
+        self.root["converter_version"] = CONVERTER_VERSION
+        self.root["length"] = self._end if length is None else length
+        return self.root
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError("Cần cài msgpack để dùng định dạng AST msgpack: pip install msgpack")
+    return msgpack
+
+
+def save_ast(ast: dict, path, ast_format: str = None):
+    """Ghi AST dạng JSON gọn hoặc msgpack (cần pip install msgpack)."""
+    path = Path(path)
+    ast_format = ast_format or ("msgpack" if path.suffix == ".msgpack" else "json")
+    if ast_format == "msgpack":
+        path.write_bytes(_msgpack().packb(ast, use_bin_type=True))
+    else:
+        path.write_text(json.dumps(ast, ensure_ascii=False, separators=(",", ":")), encoding='utf-8')
+
+
+def load_ast(path) -> dict:
+    path = Path(path)
+    if path.suffix == ".msgpack":
+        return _msgpack().unpackb(path.read_bytes(), raw=False)
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def iter_ast_nodes(node: dict):
+    """Duyệt mọi node (theo thứ tự văn bản)."""
+    for child in node.get("children", ()):
+        yield child
+        yield from iter_ast_nodes(child)
+
+
+def docx_to_ast(docx_path: str, classifier: HeadingClassifier = None):
+    """Trả về (markdown, ast) từ một lượt đọc."""
+    builder = LegalAstBuilder(Path(docx_path).name)
+    markdown = "".join(iter_markdown(docx_path, classifier, builder.add))
+    return markdown, builder.result(len(markdown))
+
+
+TABLE_SUFFIXES = {"csv": ".tables.csv", "json": ".tables.json"}
+
+
+def tables_path_for(md_path, tables_format: str) -> Path:
+    md_path = Path(md_path)
+    return md_path.with_name(md_path.stem + TABLE_SUFFIXES[tables_format])
+
+
+def save_tables(tables: list, path, tables_format: str, merged: str = MERGED_ONCE):
+    """Ghi mọi bảng của văn bản: CSV (cột đầu = số thứ tự bảng) hoặc JSON (ô gốc + span)."""
+    path = Path(path)
+    if tables_format == "csv":
+        path.write_text(tables_to_csv(tables, merged), encoding='utf-8', newline='')
+    else:
+        data = {"tables": [grid.to_dict() for grid in tables]}
+        path.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding='utf-8')
+
+
+def _convert_job(docx_file: str, output: str, classifier: HeadingClassifier = None,
+                 ast_format: str = None, with_stats: bool = False, profiler: str = None,
+                 profile_path: str = None, merged: str = MERGED_ONCE, tables_format: str = None):
+    """Worker cho process pool: trả về (file, lỗi, báo cáo) thay vì ném exception.
+
+    with_stats: báo cáo là ConversionStats.to_dict() (ngược lại None).
+    profiler + profile_path: chạy convert dưới cProfile/pyinstrument.
+    """
+    stats = ConversionStats(docx_file) if with_stats else None
+    try:
+        if profiler:
+            with profiled(profiler, profile_path):
+                convert_file(docx_file, output, classifier, ast_format, stats, merged, tables_format)
+        else:
+            convert_file(docx_file, output, classifier, ast_format, stats, merged, tables_format)
+    except Exception as e:
+        return docx_file, f"{type(e).__name__}: {e}", None
+    report = stats.to_dict() if stats else None
+    if report is not None and profiler:
+        report["profile"] = str(profile_path)
+    return docx_file, None, report
+
+
+def profile_path_for(profile_dir, docx_file: str, profiler: str, root: Path = None) -> Path:
+    """Đường dẫn file profile của một .docx; đường dẫn tương đối so với root được
+    ghép bằng "__" để các noi-dung.docx ở thư mục khác nhau không ghi đè nhau."""
+    path = Path(docx_file)
+    rel = path.relative_to(root) if root is not None else Path(path.name)
+    name = "__".join(rel.with_suffix("").parts)
+    return Path(profile_dir) / (name + PROFILERS[profiler])
+
+
+def write_stats_report(path, report: dict):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=1), encoding='utf-8')
+
+
+def _collect_docx(folder: Path, recursive: bool) -> list:
+    """Danh sách .docx và .doc (đã sắp xếp), bỏ qua file khóa tạm của Word (~$...).
+
+    File .doc có bản .docx cùng tên cạnh nó thì bỏ (hai file cùng ghi ra một .md,
+    bản .docx là bản mới hơn).
+    """
+    prefix = "**/*" if recursive else "*"
+    docx = {f for f in folder.glob(prefix + DOCX_SUFFIX) if not f.name.startswith("~$")}
+    doc = {f for f in folder.glob(prefix + DOC_SUFFIX)
+           if not f.name.startswith("~$") and f.with_suffix(DOCX_SUFFIX) not in docx}
+    return sorted(docx | doc)
+
+
+def _file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_manifest(folder: Path) -> dict:
+    """Đọc manifest của lần convert trước (rỗng nếu chưa có hoặc hỏng)."""
+    path = folder / MANIFEST_NAME
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if isinstance(manifest.get("files"), dict):
+            return manifest
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {"converter_version": CONVERTER_VERSION, "files": {}}
+
+
+def save_manifest(folder: Path, manifest: dict):
+    """Ghi manifest qua file tạm để không bị hỏng khi dừng giữa chừng."""
+    manifest["converter_version"] = CONVERTER_VERSION
+    path = folder / MANIFEST_NAME
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _plan_incremental(folder: Path, docx_files: list, manifest: dict, ast_format: str = None,
+                      merged: str = MERGED_ONCE, tables_format: str = None):
+    """Chia file thành (cần convert, không đổi) dựa vào manifest.
+
+    So mtime + size trước; chỉ băm SHA-256 khi mtime/size khác (file bị copy
+    lại, touch...). Nhờ vậy sync một corpus không đổi gần như không đọc file.
+    Trả về danh sách (docx, md, rel, entry mới) cần convert và số file bỏ qua.
+    """
+    files = manifest["files"]
+    pending = []
+    skipped = 0
+    for f in docx_files:
+        rel = f.relative_to(folder).as_posix()
+        output = f.with_suffix('.md')
+        ast = ast_path_for(output, ast_format) if ast_format else None
+        tables = tables_path_for(output, tables_format) if tables_format else None
+        st = f.stat()
+        old = files.get(rel)
+        up_to_date = (old is not None
+                      and old.get("converter_version") == CONVERTER_VERSION
+                      and old.get("merged", MERGED_ONCE) == merged
+                      and output.exists()
+                      and (ast is None or ast.exists())
+                      and (tables is None or tables.exists()))
+        if up_to_date and old.get("mtime_ns") == st.st_mtime_ns and old.get("size") == st.st_size:
+            skipped += 1
+            continue
+        entry = {
+            "sha256": _file_sha256(f),
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "converter_version": CONVERTER_VERSION,
+            "output": output.relative_to(folder).as_posix(),
+        }
+        if ast is not None:
+            entry["ast"] = ast.relative_to(folder).as_posix()
+        if tables is not None:
+            entry["tables"] = tables.relative_to(folder).as_posix()
+        if merged != MERGED_ONCE:
+            entry["merged"] = merged
+        if up_to_date and old.get("sha256") == entry["sha256"]:
+            files[rel] = entry  # chỉ đổi mtime, nội dung giữ nguyên
+            skipped += 1
+            continue
+        pending.append((str(f), str(output), rel, entry))
+    return pending, skipped
+
+
+def _prune_orphans(folder: Path, docx_files: list, manifest: dict, recursive: bool = False) -> list:
+    """Xóa .md (và AST) do manifest quản lý mà file .docx nguồn đã bị xóa/đổi tên.
+
+    Chỉ xét trong phạm vi lần quét này: không recursive thì file trong thư mục
+    con (do lần chạy -r trước ghi vào manifest) chỉ bị xóa khi nguồn thật sự
+    không còn trên đĩa. Trả về danh sách file đã xóa.
+    """
+    present = {f.relative_to(folder).as_posix() for f in docx_files}
+    claimed = {f.with_suffix("").relative_to(folder).as_posix() for f in docx_files}
+    files = manifest["files"]
+    pruned = []
+    for rel in sorted(set(files) - present):
+        if not recursive and "/" in rel and (folder / rel).is_file():
+            continue
+        entry = files.pop(rel)
+        for key in ("output", "ast", "tables"):
+            if not entry.get(key):
+                continue
+            output = folder / entry[key]
+            if key == "output" and output.with_suffix("").relative_to(folder).as_posix() in claimed:
+                continue  # .doc được thay bằng .docx cùng tên: .md vẫn còn nguồn
+            if output.is_file():
+                output.unlink()
+                pruned.append(output)
+                print(f"🗑️ Xóa file mồ côi: {output}")
+    return pruned
+
+
+def process_folder(folder_path: str, jobs: int = 1, recursive: bool = False,
+                   incremental: bool = False, classifier: HeadingClassifier = None,
+                   ast_format: str = None, index_dir: str = None, stats_path: str = None,
+                   profiler: str = None, profile_dir: str = None, merged: str = MERGED_ONCE,
+                   tables_format: str = None):
+    """Chuyển tất cả .docx (và .doc chưa có bản .docx) trong folder.
+
+    jobs > 1: chia file cho process pool (mỗi file một task). Danh sách file
+    được sắp xếp trước nên kết quả và báo cáo lỗi luôn theo cùng thứ tự.
+    recursive: quét cả thư mục con (nghi-dinh/*/van-ban-goc/..., thong-tu/*...).
+    incremental: dùng manifest (MANIFEST_NAME ở gốc folder) để chỉ convert file
+    mới/đã sửa và xóa .md mồ côi.
+    ast_format: "json"/"msgpack" — ghi thêm AST cạnh mỗi file .md.
+    index_dir: chỉ mục tìm kiếm (search_index.py) — chỉ các .md vừa ghi/xóa
+    được index lại, không build lại cả kho.
+    stats_path: ghi báo cáo JSON (từng file + bản gộp, xem ConversionStats).
+    profiler: "cprofile"/"pyinstrument" — mỗi file một profile trong profile_dir.
+    merged: cách ghi ô gộp trong bảng ("once"/"repeat").
+    tables_format: "csv"/"json" — ghi thêm bảng ra file cạnh mỗi .md.
+    """
+    started = time.perf_counter()
     folder = Path(folder_path)
-    docx_files = list(folder.glob("*.docx"))
+    docx_files = _collect_docx(folder, recursive)
+    
+    manifest = load_manifest(folder) if incremental else None
+    pruned = _prune_orphans(folder, docx_files, manifest, recursive) if incremental else []
     
     if not docx_files:
-        print(f"⚠️ Không tìm thấy file .docx nào trong {folder_path}")
+        print(f"⚠️ Không tìm thấy file .docx/.doc nào trong {folder_path}")
+        if incremental:
+            save_manifest(folder, manifest)
+        if index_dir and pruned:
+            _update_search_index(index_dir, folder, [], pruned)
         return
     
-    print(f"📂 Tìm thấy {len(docx_files)} file .docx")
+    doc_count = sum(1 for f in docx_files if f.suffix.lower() == DOC_SUFFIX)
+    print(f"📂 Tìm thấy {len(docx_files)} file Word"
+          + (f" ({doc_count} file .doc)" if doc_count else ""))
     
-    for docx_file in docx_files:
-        output = docx_file.with_suffix('.md')
-        docx_to_markdown(str(docx_file), str(output))
+    if incremental:
+        pending, skipped = _plan_incremental(folder, docx_files, manifest, ast_format, merged, tables_format)
+        print(f"⏭️ Bỏ qua {skipped} file không đổi, cần convert {len(pending)} file")
+    else:
+        pending = [(str(f), str(f.with_suffix('.md')), None, None) for f in docx_files]
+    
+    total = len(pending)
+    entries = {docx_file: (output, rel, entry) for docx_file, output, rel, entry in pending}
+    failures = {}
+    written = []
+    reports = []
+    with_stats = bool(stats_path)
+    profile_dir = profile_dir or DEFAULT_PROFILE_DIR
+    
+    def job_args(docx_file, output):
+        profile_path = profile_path_for(profile_dir, docx_file, profiler, folder) if profiler else None
+        return (docx_file, output, classifier, ast_format, with_stats, profiler, profile_path,
+                merged, tables_format)
+    
+    def on_result(index, docx_file, error, report):
+        _report_progress(index, total, docx_file, error, failures)
+        output, rel, entry = entries[docx_file]
+        if not error:
+            written.append(output)
+            if report is not None:
+                report["source"] = Path(docx_file).relative_to(folder).as_posix()
+                reports.append(report)
+            if incremental:
+                manifest["files"][rel] = entry
+    
+    if jobs <= 1 or total <= 1:
+        for i, (docx_file, output, _, _) in enumerate(pending, 1):
+            _, error, report = _convert_job(*job_args(docx_file, output))
+            on_result(i, docx_file, error, report)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_convert_job, *job_args(d, o)) for d, o, _, _ in pending]
+            for i, future in enumerate(as_completed(futures), 1):
+                docx_file, error, report = future.result()
+                on_result(i, docx_file, error, report)
     
-    print(f"\n🎉 Hoàn thành! Đã chuyển {len(docx_files)} file.")
+    if with_stats:
+        reports.sort(key=lambda r: r["source"])
+        total_report = aggregate_reports(reports, time.perf_counter() - started)
+        write_stats_report(stats_path, {"converter_version": CONVERTER_VERSION, "folder": str(folder),
+                                        "jobs": jobs, "files": reports, "total": total_report})
+        print()
+        print_stage_summary(total_report)
+        print(f"📊 Báo cáo: {stats_path}")
+    if profiler and total:
+        print(f"🔬 Profile ({profiler}): {profile_dir}")
+    
+    if incremental:
+        save_manifest(folder, manifest)
+    if index_dir and (written or pruned):
+        _update_search_index(index_dir, folder, sorted(written), pruned)
+    
+    done = total - len(failures)
+    print(f"\n🎉 Hoàn thành! Đã chuyển {done}/{total} file.")
+    if pruned:
+        print(f"🗑️ Đã xóa {len(pruned)} file mồ côi.")
+    if failures:
+        print(f"❌ {len(failures)} file lỗi:")
+        for docx_file in sorted(failures):
+            print(f"   - {docx_file}: {failures[docx_file]}")
+
+
+def _update_search_index(index_dir: str, root, changed: list, removed: list):
+    """Đẩy các .md vừa ghi/xóa vào chỉ mục tìm kiếm (segment mới + merge nền).
+
+    Đường dẫn được resolve tuyệt đối trước: search_index hiểu đường dẫn tương
+    đối là tương đối tới root của chỉ mục, không phải thư mục hiện tại.
+    root: gốc kho khi chỉ mục chưa có (None → thư mục cha của index_dir).
+    """
+    from search_index import update_index
+    changed = [Path(p).resolve() for p in changed]
+    removed_md = [Path(p).resolve() for p in removed if Path(p).suffix == ".md"]
+    root = Path(root).resolve() if root else None
+    try:
+        stats = update_index(index_dir, root=root, changed=changed, removed=removed_md)
+    except ValueError as e:  # .md ghi ra ngoài gốc của chỉ mục có sẵn
+        print(f"⚠️ Không cập nhật chỉ mục: {e}")
+        return
+    print(f"🔎 Cập nhật chỉ mục: {stats['files_indexed']} file, {stats['units']} Điều/đoạn"
+          + (", gộp segment ở nền" if stats["merge_scheduled"] else ""))
+
+
+def _report_progress(index: int, total: int, docx_file: str, error, failures: dict):
+    """In tiến độ một file và ghi nhận lỗi (nếu có)."""
+    name = Path(docx_file).name
+    if error:
+        failures[docx_file] = error
+        print(f"[{index}/{total}] ❌ {name}: {error}")
+    else:
+        print(f"[{index}/{total}] ✅ {name}")
 
 
 if __name__ == "__main__":
@@ -127,13 +1315,83 @@ if __name__ == "__main__":
         print(__doc__)
         sys.exit(1)
     
-    input_path = sys.argv[1]
+    parser = argparse.ArgumentParser(description="Chuyển .docx/.doc sang Markdown")
+    parser.add_argument("input", help="File .docx/.doc hoặc thư mục")
+    parser.add_argument("-o", "--output", help="File .md đầu ra (khi input là file, '-' = stdout)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Số process chạy song song khi convert thư mục (mặc định 1)")
+    parser.add_argument("-r", "--recursive", action="store_true",
+                        help="Quét cả thư mục con")
+    parser.add_argument("--incremental", action="store_true",
+                        help=f"Chỉ convert file mới/đã sửa theo manifest ({MANIFEST_NAME}), xóa .md mồ côi")
+    parser.add_argument("--ast", choices=sorted(AST_SUFFIXES),
+                        help="Ghi thêm cây Chương/Mục/Điều/Khoản/Điểm (.ast.json/.ast.msgpack) cạnh file .md")
+    parser.add_argument("--index", metavar="DIR",
+                        help="Cập nhật chỉ mục tìm kiếm (search_index.py) với các file vừa convert")
+    parser.add_argument("--rules", default="",
+                        help=f"Bật thêm bộ luật heading, phân tách bằng dấu phẩy: {', '.join(EXTRA_RULE_SETS)}")
+    parser.add_argument("--merged", choices=MERGED_MODES, default=MERGED_ONCE,
+                        help="Ô gộp trong bảng: once = text một lần ở ô gốc (mặc định), "
+                             "repeat = lặp ở mọi ô bị gộp như python-docx")
+    parser.add_argument("--tables", choices=sorted(TABLE_SUFFIXES),
+                        help="Ghi thêm mọi bảng ra file .tables.csv/.tables.json cạnh file .md")
+    parser.add_argument("--stats", metavar="FILE",
+                        help="Ghi báo cáo JSON: thời gian từng giai đoạn + bộ đếm của mỗi file (và bản gộp khi convert thư mục)")
+    parser.add_argument("--profile", choices=sorted(PROFILERS),
+                        help="Chạy convert dưới profiler, mỗi file một kết quả (.prof/.html)")
+    parser.add_argument("--profile-dir", default=DEFAULT_PROFILE_DIR,
+                        help=f"Thư mục chứa kết quả profile (mặc định {DEFAULT_PROFILE_DIR})")
+    args = parser.parse_args()
+    
+    input_path = args.input
+    extra = []
+    for name in filter(None, args.rules.split(",")):
+        if name not in EXTRA_RULE_SETS:
+            parser.error(f"bộ luật không hợp lệ: {name}")
+        extra += EXTRA_RULE_SETS[name]
+    classifier = HeadingClassifier(extra + DEFAULT_RULES) if extra else None
+    if args.ast == "msgpack":
+        try:
+            _msgpack()
+        except ImportError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+    if args.profile == "pyinstrument" and importlib.util.find_spec("pyinstrument") is None:
+        print("❌ Cần cài pyinstrument: pip install pyinstrument")
+        sys.exit(1)
     
     if os.path.isdir(input_path):
-        process_folder(input_path)
+        process_folder(input_path, jobs=args.jobs, recursive=args.recursive,
+                       incremental=args.incremental, classifier=classifier, ast_format=args.ast,
+                       index_dir=args.index, stats_path=args.stats, profiler=args.profile,
+                       profile_dir=args.profile_dir, merged=args.merged, tables_format=args.tables)
     elif os.path.isfile(input_path):
-        output = sys.argv[3] if len(sys.argv) > 3 and sys.argv[2] == "-o" else input_path.replace('.docx', '.md')
-        docx_to_markdown(input_path, output)
+        output = args.output or str(Path(input_path).with_suffix('.md'))
+        stats = ConversionStats(input_path) if args.stats else None
+        profile_path = profile_path_for(args.profile_dir, input_path, args.profile) if args.profile else None
+        with profiled(args.profile, profile_path) if args.profile else contextlib.nullcontext():
+            if output == "-":
+                write_markdown(input_path, sys.stdout, classifier, stats=stats, merged=args.merged)
+            else:
+                convert_file(input_path, output, classifier, args.ast, stats, args.merged, args.tables)
+        # stdout dành cho Markdown → thông báo ra stderr
+        log = sys.stderr if output == "-" else sys.stdout
+        if output != "-":
+            print(f"✅ Đã chuyển: {input_path} → {output}")
+            if args.index:
+                # root theo chỉ mục sẵn có, không theo thư mục của file
+                # (để cùng một .md có cùng khóa với lần chạy cả thư mục)
+                _update_search_index(args.index, None, [output], [])
+        if stats is not None:
+            report = stats.to_dict()
+            if profile_path:
+                report["profile"] = str(profile_path)
+            write_stats_report(args.stats, report)
+            with contextlib.redirect_stdout(log):
+                print_stage_summary(report)
+                print(f"📊 Báo cáo: {args.stats}")
+        if profile_path:
+            print(f"🔬 Profile ({args.profile}): {profile_path}", file=log)
     else:
         print(f"❌ Không tìm thấy: {input_path}")
         sys.exit(1)
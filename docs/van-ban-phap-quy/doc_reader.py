@@ -0,0 +1,646 @@
+"""
+Đọc file Word 97-2003 (.doc, định dạng nhị phân OLE2) bằng Python thuần
+
+Không cần LibreOffice/Word hay thư viện ngoài: tự đọc Compound File (OLE2),
+FIB, bảng piece (Clx) để lấy text, PAPX/CHPX để biết paragraph nào thuộc
+bảng, style nào, run nào in đậm, và TAP (sprmTDefTable) để dựng lưới bảng có
+ô gộp. Kết quả là luồng paragraph/bảng để convert_word_to_md.py phân loại
+bằng cùng HeadingClassifier như file .docx.
+
+Hỗ trợ Word 97 trở lên (nFib ≥ 101). File Word 6/95 và file có mật khẩu báo lỗi.
+
+Cách dùng:
+    python doc_reader.py "Phuluc1.doc"             # in text từng paragraph/bảng
+    python convert_word_to_md.py "Phuluc1.doc"     # → Phuluc1.md
+    python convert_word_to_md.py "archive/" -r -j 8
+                                # .doc và .docx cùng một lượt (bỏ .doc đã có bản .docx)
+"""
+
+import re
+import sys
+import struct
+from array import array
+from bisect import bisect_right
+
+from table_grid import GridBuilder, TableGrid
+
+# ============================================================
+# COMPOUND FILE (OLE2 / CFB)
+# ============================================================
+CFB_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+ENDOFCHAIN = 0xFFFFFFFE
+FREESECT = 0xFFFFFFFF
+STREAM_ENTRY = 2
+
+
+class CompoundFile:
+    """Đọc các stream trong một file OLE2 (đọc cả file vào bộ nhớ một lần)."""
+
+    def __init__(self, data: bytes):
+        if data[:8] != CFB_SIGNATURE:
+            raise ValueError("Không phải file OLE2 (Word 97-2003)")
+        self.data = data
+        self.sector_size = 1 << struct.unpack_from("<H", data, 0x1E)[0]
+        self.mini_sector_size = 1 << struct.unpack_from("<H", data, 0x20)[0]
+        (n_fat, first_dir, _, self.mini_cutoff, first_minifat, _, first_difat,
+         n_difat) = struct.unpack_from("<IIIIIIII", data, 0x2C)
+        self.fat = self._load_fat(n_fat, first_difat, n_difat)
+        self.entries = {}
+        dir_data = self._chain_data(first_dir)
+        root = None
+        for pos in range(0, len(dir_data) - 127, 128):
+            name_len, kind = struct.unpack_from("<HB", dir_data, pos + 64)
+            if kind == 0:
+                continue
+            name = dir_data[pos:pos + max(name_len - 2, 0)].decode("utf-16-le", "replace")
+            start, size = struct.unpack_from("<II", dir_data, pos + 116)
+            if kind == 5:
+                root = (start, size)
+            elif kind == STREAM_ENTRY:
+                self.entries.setdefault(name, (start, size))
+        self.minifat = array("I", self._chain_data(first_minifat)) if first_minifat < ENDOFCHAIN else array("I")
+        self._check_order(self.minifat)
+        self.ministream = self._chain_data(root[0])[:root[1]] if root and root[0] < ENDOFCHAIN else b""
+
+    @staticmethod
+    def _check_order(arr):
+        if sys.byteorder != "little":
+            arr.byteswap()
+
+    def _sector(self, index: int) -> bytes:
+        start = (index + 1) * self.sector_size
+        return self.data[start:start + self.sector_size]
+
+    def _load_fat(self, n_fat: int, first_difat: int, n_difat: int) -> array:
+        difat = list(struct.unpack_from("<109I", self.data, 0x4C))
+        sector = first_difat
+        per_sector = self.sector_size // 4 - 1
+        for _ in range(n_difat):
+            if sector >= ENDOFCHAIN:
+                break
+            values = struct.unpack_from(f"<{per_sector + 1}I", self._sector(sector))
+            difat.extend(values[:-1])
+            sector = values[-1]
+        fat = array("I", b"".join(self._sector(s) for s in difat[:n_fat] if s < ENDOFCHAIN))
+        self._check_order(fat)
+        return fat
+
+    def _chain(self, start: int, table: array):
+        """Danh sách sector theo chuỗi FAT; chặn chuỗi vòng (file hỏng)."""
+        chain = []
+        sector = start
+        while sector < ENDOFCHAIN:
+            if sector >= len(table) or len(chain) > len(table):
+                raise ValueError("File OLE2 hỏng: chuỗi sector không hợp lệ")
+            chain.append(sector)
+            sector = table[sector]
+        return chain
+
+    def _chain_data(self, start: int) -> bytes:
+        return b"".join(self._sector(s) for s in self._chain(start, self.fat))
+
+    def has_stream(self, name: str) -> bool:
+        return name in self.entries
+
+    def stream(self, name: str) -> bytes:
+        try:
+            start, size = self.entries[name]
+        except KeyError:
+            raise ValueError(f"Thiếu stream {name!r} trong file OLE2")
+        if size < self.mini_cutoff:
+            step = self.mini_sector_size
+            return b"".join(self.ministream[s * step:(s + 1) * step]
+                            for s in self._chain(start, self.minifat))[:size]
+        return self._chain_data(start)[:size]
+
+
+# ============================================================
+# SPRM (thuộc tính paragraph/ký tự/bảng)
+# ============================================================
+SPRM_P_FINTABLE = 0x2416
+SPRM_P_FTTP = 0x2417
+SPRM_P_FINNER_TABLE_CELL = 0x244B
+SPRM_P_FINNER_TTP = 0x244C
+SPRM_P_ITAP = 0x6649
+SPRM_P_HUGE_PAPX = 0x6646
+SPRM_P_CHG_TABS = 0xC615
+SPRM_C_FBOLD = 0x0835
+SPRM_T_DEF_TABLE = 0xD608
+SPRM_T_MERGE = 0x5624
+SPRM_T_SPLIT = 0x5625
+SPRM_T_VERT_MERGE = 0xD62B
+_FIXED_OPERAND = {0: 1, 1: 1, 2: 2, 3: 4, 4: 2, 5: 2, 7: 3}
+
+
+def iter_sprms(grpprl: bytes, pos: int = 0):
+    """Sinh (sprm, operand) từ một grpprl."""
+    end = len(grpprl)
+    while pos + 2 <= end:
+        sprm = grpprl[pos] | grpprl[pos + 1] << 8
+        pos += 2
+        size = _FIXED_OPERAND.get(sprm >> 13)
+        if size is None:                                   # spra 6: độ dài thay đổi
+            if pos >= end:
+                break
+            if sprm == SPRM_T_DEF_TABLE:
+                size = (grpprl[pos] | grpprl[pos + 1] << 8) + 1
+            elif sprm == SPRM_P_CHG_TABS and grpprl[pos] == 255:
+                n_del = grpprl[pos + 1] if pos + 1 < end else 0
+                n_add = grpprl[pos + 2 + 4 * n_del] if pos + 2 + 4 * n_del < end else 0
+                size = 3 + 4 * n_del + 3 * n_add
+            else:
+                size = grpprl[pos] + 1
+        yield sprm, grpprl[pos:pos + size]
+        pos += size
+
+
+def _int(operand: bytes) -> int:
+    return int.from_bytes(operand, "little")
+
+
+# ============================================================
+# STYLE (STSH)
+# ============================================================
+# sti của style có sẵn → tên tiếng Anh chuẩn (giống tên style trong .docx)
+BUILTIN_STYLE_NAMES = {0: "normal", 62: "title", 74: "subtitle"}
+BUILTIN_STYLE_NAMES.update({i: f"heading {i}" for i in range(1, 10)})
+STYLE_PARAGRAPH = 1
+
+
+def parse_styles(table: bytes, fc: int, lcb: int) -> dict:
+    """istd → tên style paragraph (chữ thường, bỏ bí danh sau dấu phẩy)."""
+    names = {}
+    if lcb < 2:
+        return names
+    data = table[fc:fc + lcb]
+    cb_stshi = struct.unpack_from("<H", data, 0)[0]
+    cstd, cb_base = struct.unpack_from("<HH", data, 2)
+    pos = 2 + cb_stshi
+    for istd in range(cstd):
+        if pos + 2 > len(data):
+            break
+        cb_std = struct.unpack_from("<H", data, pos)[0]
+        std = data[pos + 2:pos + 2 + cb_std]
+        pos += 2 + cb_std
+        if cb_std < 10:
+            continue
+        sti = struct.unpack_from("<H", std, 0)[0] & 0x0FFF
+        stk = struct.unpack_from("<H", std, 2)[0] & 0x000F
+        if stk != STYLE_PARAGRAPH:
+            continue
+        name = ""
+        if cb_base + 2 <= len(std):
+            cch = struct.unpack_from("<H", std, cb_base)[0]
+            raw = std[cb_base + 2:cb_base + 2 + 2 * cch]
+            name = raw.decode("utf-16-le", "replace").split(",")[0]
+        names[istd] = BUILTIN_STYLE_NAMES.get(sti, name.lower())
+    return names
+
+
+# ============================================================
+# FKP (PAPX / CHPX theo vị trí byte trong WordDocument)
+# ============================================================
+class _FcRuns:
+    """Các khoảng [fc, fc_end) → dữ liệu, tra bằng bisect."""
+
+    def __init__(self):
+        self.starts, self.ends, self.values = [], [], []
+
+    def add(self, start, end, value):
+        self.starts.append(start)
+        self.ends.append(end)
+        self.values.append(value)
+
+    def sort(self):
+        order = sorted(range(len(self.starts)), key=self.starts.__getitem__)
+        self.starts = [self.starts[i] for i in order]
+        self.ends = [self.ends[i] for i in order]
+        self.values = [self.values[i] for i in order]
+
+    def find(self, fc):
+        i = bisect_right(self.starts, fc) - 1
+        if i >= 0 and fc < self.ends[i]:
+            return self.values[i]
+        return None
+
+    def overlapping(self, fc_start, fc_end):
+        """Sinh (start, end, value) giao với [fc_start, fc_end)."""
+        i = max(bisect_right(self.starts, fc_start) - 1, 0)
+        while i < len(self.starts) and self.starts[i] < fc_end:
+            if self.ends[i] > fc_start:
+                yield max(self.starts[i], fc_start), min(self.ends[i], fc_end), self.values[i]
+            i += 1
+
+
+def _plc_pages(table: bytes, fc: int, lcb: int):
+    """PlcBte*: các trang FKP (số trang 512 byte trong WordDocument)."""
+    n = (lcb - 4) // 8
+    if n <= 0:
+        return []
+    return [pn & 0x3FFFFF for pn in struct.unpack_from(f"<{n}I", table, fc + 4 * (n + 1))]
+
+
+def parse_papx(word: bytes, table: bytes, fc: int, lcb: int, data_stream: bytes) -> _FcRuns:
+    """PAPX: fc → (istd, grpprl) của paragraph có dấu kết thúc nằm ở fc."""
+    runs = _FcRuns()
+    for pn in _plc_pages(table, fc, lcb):
+        page = word[pn * 512:(pn + 1) * 512]
+        if len(page) < 512:
+            continue
+        crun = page[511]
+        fcs = struct.unpack_from(f"<{crun + 1}I", page, 0)
+        for i in range(crun):
+            offset = page[4 * (crun + 1) + 13 * i] * 2
+            if offset == 0:
+                runs.add(fcs[i], fcs[i + 1], (0, b""))
+                continue
+            cb = page[offset]
+            if cb == 0:
+                size, start = 2 * page[offset + 1], offset + 2
+            else:
+                size, start = 2 * cb - 1, offset + 1
+            chunk = page[start:start + size]
+            istd = struct.unpack_from("<H", chunk, 0)[0] if len(chunk) >= 2 else 0
+            grpprl = chunk[2:]
+            for sprm, operand in iter_sprms(grpprl):
+                if sprm == SPRM_P_HUGE_PAPX and data_stream:
+                    at = _int(operand)
+                    cb_huge = struct.unpack_from("<H", data_stream, at)[0]
+                    grpprl = data_stream[at + 2:at + 2 + cb_huge]
+                    break
+            runs.add(fcs[i], fcs[i + 1], (istd, grpprl))
+    runs.sort()
+    return runs
+
+
+def parse_chpx(word: bytes, table: bytes, fc: int, lcb: int) -> _FcRuns:
+    """CHPX: fc → grpprl thuộc tính ký tự của run."""
+    runs = _FcRuns()
+    for pn in _plc_pages(table, fc, lcb):
+        page = word[pn * 512:(pn + 1) * 512]
+        if len(page) < 512:
+            continue
+        crun = page[511]
+        fcs = struct.unpack_from(f"<{crun + 1}I", page, 0)
+        for i in range(crun):
+            offset = page[4 * (crun + 1) + i] * 2
+            grpprl = page[offset + 1:offset + 1 + page[offset]] if offset else b""
+            runs.add(fcs[i], fcs[i + 1], grpprl)
+    runs.sort()
+    return runs
+
+
+def _grpprl_bold(grpprl: bytes) -> bool:
+    """In đậm trực tiếp (sprmCFBold bật / đảo so với style), như w:b trong .docx."""
+    bold = False
+    for sprm, operand in iter_sprms(grpprl):
+        if sprm == SPRM_C_FBOLD:
+            bold = operand[:1] in (b"\x01", b"\x81")
+    return bold
+
+
+class ParaProps:
+    """Thuộc tính paragraph cần cho convert: style, vị trí trong bảng, TAP của dòng."""
+    __slots__ = ("istd", "in_table", "ttp", "itap", "inner_cell", "inner_ttp", "grpprl")
+
+    def __init__(self, istd: int, grpprl: bytes):
+        self.istd = istd
+        self.grpprl = grpprl
+        self.in_table = self.ttp = self.inner_cell = self.inner_ttp = False
+        self.itap = 0
+        for sprm, operand in iter_sprms(grpprl):
+            if sprm == SPRM_P_FINTABLE:
+                self.in_table = operand[:1] == b"\x01"
+            elif sprm == SPRM_P_FTTP:
+                self.ttp = operand[:1] == b"\x01"
+            elif sprm == SPRM_P_ITAP:
+                self.itap = _int(operand)
+            elif sprm == SPRM_P_FINNER_TABLE_CELL:
+                self.inner_cell = operand[:1] == b"\x01"
+            elif sprm == SPRM_P_FINNER_TTP:
+                self.inner_ttp = operand[:1] == b"\x01"
+        if self.in_table and not self.itap:
+            self.itap = 1
+        if self.itap and not self.in_table:
+            self.in_table = True
+
+
+EMPTY_PROPS = ParaProps(0, b"")
+
+
+def row_layout(grpprl: bytes):
+    """TAP của một dòng bảng → (ranh giới cột [dxa], cờ gộp [(ngang, dọc)]).
+
+    ngang: 0 không gộp, 1 ô đầu nhóm gộp, 2 ô bị gộp vào ô trước.
+    dọc: 0 không gộp, 1 tiếp nối ô phía trên, 3 ô đầu nhóm gộp dọc.
+    """
+    bounds, merges = [], []
+    for sprm, operand in iter_sprms(grpprl):
+        if sprm == SPRM_T_DEF_TABLE and len(operand) >= 3:
+            itc_mac = operand[2]
+            pos = 3
+            n_bounds = min(itc_mac + 1, (len(operand) - pos) // 2)
+            bounds = list(struct.unpack_from(f"<{n_bounds}h", operand, pos))
+            pos += 2 * (itc_mac + 1)
+            merges = []
+            for i in range(itc_mac):
+                flags = struct.unpack_from("<H", operand, pos + 20 * i)[0] if pos + 20 * i + 2 <= len(operand) else 0
+                horz = 1 if flags & 1 else (2 if flags & 2 else 0)
+                merges.append((horz, (flags >> 5) & 3))
+        elif sprm == SPRM_T_MERGE and len(operand) >= 2:
+            first, lim = operand[0], operand[1]
+            for i in range(first, min(lim, len(merges))):
+                merges[i] = (1 if i == first else 2, merges[i][1])
+        elif sprm == SPRM_T_SPLIT and len(operand) >= 2:
+            for i in range(operand[0], min(operand[1], len(merges))):
+                merges[i] = (0, merges[i][1])
+        elif sprm == SPRM_T_VERT_MERGE and len(operand) >= 3:
+            itc = operand[1]
+            if itc < len(merges):
+                merges[itc] = (merges[itc][0], operand[2] & 3)
+    return bounds, merges
+
+
+# ============================================================
+# TEXT (FIB + Clx/piece table)
+# ============================================================
+FIB_IDENT = 0xA5EC
+# Chỉ số cặp (fc, lcb) trong FibRgFcLcb97
+FC_STSHF, FC_PLCF_SED, FC_BTE_CHPX, FC_BTE_PAPX, FC_CLX = 1, 6, 12, 13, 33
+
+_FIELD_CHARS = re.compile("[\x13\x14\x15]")
+# Ký tự đặc biệt → text như python-docx đọc từ .docx; "\x00" = bỏ (giữ nguyên vị trí cp)
+_CHAR_MAP = {c: "\x00" for c in range(0x20) if c not in (0x09, 0x0D, 0x07)}
+_CHAR_MAP.update({0x0B: "\n", 0x1E: "-"})
+_CHAR_MAP[0x0C] = "\x0c"
+_CHAR_MAP[0x1F] = "\x00"             # gạch nối tùy chọn
+_CHAR_MAP[0xAD] = "\x00"
+
+
+def _decode_compressed(raw: bytes) -> str:
+    try:
+        return raw.decode("cp1252")
+    except UnicodeDecodeError:
+        return raw.decode("latin-1")
+
+
+class WordDocument:
+    """Nội dung chính (main document) của một file .doc."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.cfb = CompoundFile(f.read())
+        word = self.cfb.stream("WordDocument")
+        ident, n_fib = struct.unpack_from("<HH", word, 0)
+        if ident != FIB_IDENT:
+            raise ValueError("Stream WordDocument không có FIB hợp lệ")
+        if n_fib < 101:
+            raise ValueError(f"File Word 6/95 (nFib={n_fib}) chưa được hỗ trợ, hãy lưu lại dạng Word 97-2003")
+        flags = struct.unpack_from("<H", word, 0x0A)[0]
+        if flags & 0x0100:
+            raise ValueError("File .doc có mật khẩu (mã hóa), không đọc được")
+        table = self.cfb.stream("1Table" if flags & 0x0200 else "0Table")
+        data_stream = self.cfb.stream("Data") if self.cfb.has_stream("Data") else b""
+
+        csw = struct.unpack_from("<H", word, 32)[0]
+        lw_base = 32 + 2 + 2 * csw + 2
+        cslw = struct.unpack_from("<H", word, lw_base - 2)[0]
+        self.ccp_text = struct.unpack_from("<i", word, lw_base + 12)[0]
+        fc_base = lw_base + 4 * cslw + 2
+        cb_fclcb = struct.unpack_from("<H", word, fc_base - 2)[0]
+
+        def fc_lcb(index):
+            if index >= cb_fclcb:
+                return 0, 0
+            return struct.unpack_from("<II", word, fc_base + 8 * index)
+
+        self.styles = parse_styles(table, *fc_lcb(FC_STSHF))
+        self.papx = parse_papx(word, table, *fc_lcb(FC_BTE_PAPX), data_stream)
+        self.chpx = parse_chpx(word, table, *fc_lcb(FC_BTE_CHPX))
+        self.pieces = self._parse_clx(table, *fc_lcb(FC_CLX))
+        self.text = self._main_text(word)
+        self.section_marks = self._section_marks(table, *fc_lcb(FC_PLCF_SED))
+        self.visible = self._visible_text(self.text)
+        self.word_bytes = len(word)
+
+    @staticmethod
+    def _parse_clx(table: bytes, fc: int, lcb: int):
+        """Bảng piece: [(cp đầu, cp cuối, fc, nén 8-bit?)]."""
+        pos, end = fc, fc + lcb
+        while pos < end and table[pos] == 0x01:            # Prc: bỏ qua
+            pos += 3 + struct.unpack_from("<H", table, pos + 1)[0]
+        if pos >= end or table[pos] != 0x02:
+            raise ValueError("Không tìm thấy bảng piece (Clx) trong file .doc")
+        lcb_plc = struct.unpack_from("<I", table, pos + 1)[0]
+        pos += 5
+        n = (lcb_plc - 4) // 12
+        cps = struct.unpack_from(f"<{n + 1}i", table, pos)
+        pieces = []
+        for i in range(n):
+            fc_raw = struct.unpack_from("<I", table, pos + 4 * (n + 1) + 8 * i + 2)[0]
+            compressed = bool(fc_raw & 0x40000000)
+            fc_piece = fc_raw & 0x3FFFFFFF
+            pieces.append((cps[i], cps[i + 1], fc_piece // 2 if compressed else fc_piece, compressed))
+        return pieces
+
+    def _main_text(self, word: bytes) -> str:
+        parts = []
+        for cp_start, cp_end, fc, compressed in self.pieces:
+            if cp_start >= self.ccp_text:
+                break
+            n = min(cp_end, self.ccp_text) - cp_start
+            if compressed:
+                parts.append(_decode_compressed(word[fc:fc + n]))
+            else:
+                parts.append(word[fc:fc + 2 * n].decode("utf-16-le", "replace"))
+        self._piece_cps = [p[0] for p in self.pieces]
+        return "".join(parts)
+
+    def _section_marks(self, table: bytes, fc: int, lcb: int) -> set:
+        """cp của các ký tự ngắt section (0x0C là dấu kết thúc paragraph)."""
+        n = (lcb - 4) // 16
+        if n <= 0:
+            return set()
+        cps = struct.unpack_from(f"<{n + 1}i", table, fc)
+        return {cp - 1 for cp in cps[1:]}
+
+    @staticmethod
+    def _visible_text(text: str) -> str:
+        """Text cùng độ dài, mã field (0x13..0x14) và ký tự điều khiển thay bằng "\\x00".
+
+        Field lồng nhau: chỉ phần kết quả (0x14..0x15) của mọi cấp được giữ.
+        """
+        hidden = []
+        stack = []                     # [vị trí bắt đầu phần mã | None nếu đang ở phần kết quả]
+        for m in _FIELD_CHARS.finditer(text):
+            ch, pos = m.group(), m.start()
+            if ch == "\x13":
+                stack.append(pos)
+            elif ch == "\x14" and stack and stack[-1] is not None:
+                hidden.append((stack[-1], pos + 1))
+                stack[-1] = None
+            elif ch == "\x15" and stack:
+                start = stack.pop()
+                if start is not None:                      # field không có phần kết quả
+                    hidden.append((start, pos + 1))
+        if not hidden:
+            return text.translate(_CHAR_MAP)
+        hidden.sort()
+        parts = []
+        last = 0
+        for start, end in hidden:
+            if end <= last:
+                continue
+            start = max(start, last)
+            parts.append(text[last:start])
+            parts.append("\x00" * (end - start))
+            last = end
+        parts.append(text[last:])
+        return "".join(parts).translate(_CHAR_MAP)
+
+    def fc_range(self, cp_start: int, cp_end: int):
+        """Sinh (cp đầu, cp cuối, fc đầu, byte/ký tự) theo từng piece."""
+        i = max(bisect_right(self._piece_cps, cp_start) - 1, 0)
+        while i < len(self.pieces) and self.pieces[i][0] < cp_end:
+            p_start, p_end, fc, compressed = self.pieces[i]
+            a, b = max(cp_start, p_start), min(cp_end, p_end)
+            if a < b:
+                step = 1 if compressed else 2
+                yield a, b, fc + (a - p_start) * step, step
+            i += 1
+
+    def para_props(self, cp_mark: int) -> ParaProps:
+        for _, _, fc, _ in self.fc_range(cp_mark, cp_mark + 1):
+            found = self.papx.find(fc)
+            if found is not None:
+                return ParaProps(*found)
+        return EMPTY_PROPS
+
+    def runs(self, cp_start: int, cp_end: int):
+        """Sinh (text hiển thị, in đậm?) của các run trong [cp_start, cp_end)."""
+        for a, b, fc_a, step in self.fc_range(cp_start, cp_end):
+            fc_b = fc_a + (b - a) * step
+            for s, e, grpprl in self.chpx.overlapping(fc_a, fc_b):
+                cs = a + (s - fc_a) // step
+                ce = a + (e - fc_a + step - 1) // step
+                yield self.visible[cs:ce], _grpprl_bold(grpprl)
+
+    def all_bold(self, cp_start: int, cp_end: int) -> bool:
+        """Như _paragraph_all_bold của .docx: mọi run có chữ đều in đậm."""
+        has_run = False
+        for text, bold in self.runs(cp_start, cp_end):
+            has_run = True
+            if not bold and text.replace("\x00", "").strip():
+                return False
+        return has_run
+
+    def paragraphs(self):
+        """Sinh (cp đầu, cp dấu kết thúc, ký tự kết thúc, text hiển thị)."""
+        visible = self.visible
+        start = 0
+        for m in re.finditer("[\r\x07\x0c]", visible):
+            end = m.start()
+            mark = m.group()
+            if mark == "\x0c" and end not in self.section_marks:
+                continue                                   # ngắt trang trong paragraph
+            yield start, end, mark, _clean(visible[start:end])
+            start = end + 1
+        if start < len(visible):
+            tail = _clean(visible[start:])
+            if tail.strip():
+                yield start, len(visible), "\r", tail
+
+
+def _clean(text: str) -> str:
+    return text.replace("\x00", "").replace("\x0c", "")
+
+
+# ============================================================
+# PARAGRAPH / BẢNG
+# ============================================================
+def _cell_text(paragraphs: list) -> str:
+    return "\n".join(paragraphs).strip().replace("\n", " ")
+
+
+def _table_grid(rows: list) -> TableGrid:
+    """Các dòng [(ranh giới, cờ gộp, [text ô])] → TableGrid.
+
+    Lưới cột là hợp mọi ranh giới cột của cả bảng (như tblGrid khi Word lưu
+    sang .docx). Ô gộp ngang (fMerged) nhập vào ô đầu nhóm thành một ô rộng
+    hơn; ô gộp dọc (tiếp nối) nối với ô gốc phía trên cùng cột lưới.
+    """
+    edges = sorted({b for bounds, _, _ in rows for b in bounds})
+    column = {b: i for i, b in enumerate(edges)}
+    builder = GridBuilder(max(len(edges) - 1, 0))
+    for bounds, merges, texts in rows:
+        usable = len(bounds) == len(texts) + 1
+        cells = []                                   # [text, span, nối dọc?]
+        for i, text in enumerate(texts):
+            span = max(column[bounds[i + 1]] - column[bounds[i]], 1) if usable else 1
+            horz, vert = merges[i] if i < len(merges) else (0, 0)
+            if horz == 2 and cells:
+                cells[-1][1] += span
+            else:
+                cells.append([text, span, vert == 1])
+        builder.start_row(column[bounds[0]] if usable else 0)
+        for text, span, continues in cells:
+            builder.add_cell("" if continues else text, span, continues)
+    return builder.build()
+
+
+def iter_doc_items(path):
+    """Sinh nội dung .doc theo thứ tự văn bản.
+
+    ("paragraph", text, tên style, hàm in_đậm()) — hàm tính in đậm khi cần;
+    ("table", TableGrid) — một bảng, ô gộp đã giải như bảng .docx.
+    Bảng lồng nhau được làm phẳng vào ô của bảng ngoài.
+    """
+    doc = WordDocument(path)
+    rows = []            # dòng đã xong của bảng đang mở
+    cells = []           # text các ô của dòng đang đọc
+    cell_paras = []      # các paragraph của ô đang đọc
+
+    def flush_table():
+        table = _table_grid(rows)
+        rows.clear()
+        cells.clear()
+        cell_paras.clear()
+        return table
+
+    for start, end, mark, text in doc.paragraphs():
+        props = doc.para_props(end)
+        if not props.in_table:
+            if rows or cells:
+                yield "table", flush_table()
+            style = doc.styles.get(props.istd, doc.styles.get(0, ""))
+            yield "paragraph", text, style, lambda s=start, e=end: doc.all_bold(s, e)
+            continue
+        if props.itap > 1:                                 # bảng lồng: gom vào ô ngoài
+            if not props.inner_ttp:
+                cell_paras.append(text)
+            continue
+        if props.ttp:                                      # dấu kết thúc dòng
+            bounds, merges = row_layout(props.grpprl)
+            rows.append((bounds, merges, list(cells)))
+            cells.clear()
+            cell_paras.clear()
+        elif mark == "\x07":                               # dấu kết thúc ô
+            cell_paras.append(text)
+            cells.append(_cell_text(cell_paras))
+            cell_paras.clear()
+        else:
+            cell_paras.append(text)
+    if rows or cells:
+        yield "table", flush_table()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    for item in iter_doc_items(sys.argv[1]):
+        if item[0] == "paragraph":
+            print(f"[{item[2]}] {item[1]}")
+        else:
+            for line in item[1].markdown_lines():
+                print(line)
@@ -0,0 +1,501 @@
+"""
+Sinh kho văn bản pháp quy tổng hợp (.docx + .md) để đo tải converter/chỉ mục
+
+Mỗi văn bản có đủ cấu trúc mà convert_word_to_md.py nhận dạng: quốc hiệu, số hiệu,
+căn cứ, Chương (số La Mã) → Mục → Điều → Khoản → Điểm, bảng trong Điều, nơi nhận,
+Phụ lục kèm bảng. Nội dung tiếng Việt ghép từ kho cụm từ hành chính.
+
+- Tái lập được: văn bản thứ i chỉ phụ thuộc (seed, i) → cùng tham số cho cùng
+  byte, bất kể số tiến trình; zip ghi ngày giờ cố định.
+- .md sinh từ cùng mô hình đoạn văn qua đúng HeadingClassifier của converter
+  → trùng khớp docx_to_markdown(.docx), dùng được làm đáp án so sánh.
+- .docx ghi thẳng word/document.xml từ chuỗi; các part khác (styles...) nén
+  sẵn một lần → đủ nhanh cho 10k–1M văn bản, chia thư mục con theo --per-dir.
+
+Cách dùng:
+    python generate_corpus.py -n 1000 -o /tmp/corpus                 # 1000 văn bản, .docx + .md
+    python generate_corpus.py -n 100000 -j 8 --articles 20-120 --seed 7 -o /data/corpus
+    python generate_corpus.py -n 50 --format md --annexes 0-1 -o corpus-md
+    python generate_corpus.py -n 5000 --layout repo -o /tmp/kho   # rồi: search_index.py build /tmp/kho
+
+    from generate_corpus import generate_document, write_docx, to_markdown
+    doc = generate_document(seed=1, index=0)
+"""
+
+import os
+import sys
+import json
+import random
+import zipfile
+import argparse
+from io import BytesIO
+from pathlib import Path
+from datetime import datetime
+from typing import NamedTuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from convert_word_to_md import DEFAULT_CLASSIFIER, _BlankLineCollapser
+
+GENERATOR_VERSION = 1
+CORPUS_MANIFEST = "_corpus.json"
+FIXED_DATE = (2020, 1, 1, 0, 0, 0)        # ngày giờ trong zip → byte tái lập được
+TEXT_WIDTH_TWIPS = 9072                    # 16 cm
+
+# ============================================================
+# KHO CỤM TỪ
+# ============================================================
+DOC_KINDS = [
+    # (tên loại, ký hiệu, cơ quan ban hành, tên cơ quan trong câu, chức danh ký)
+    ("NGHỊ ĐỊNH", "NĐ-CP", "CHÍNH PHỦ", "Chính phủ", "THỦ TƯỚNG"),
+    ("THÔNG TƯ", "TT-BNV", "BỘ NỘI VỤ", "Bộ trưởng Bộ Nội vụ", "BỘ TRƯỞNG"),
+    ("THÔNG TƯ", "TT-BTC", "BỘ TÀI CHÍNH", "Bộ trưởng Bộ Tài chính", "BỘ TRƯỞNG"),
+    ("QUYẾT ĐỊNH", "QĐ-TTg", "THỦ TƯỚNG CHÍNH PHỦ", "Thủ tướng Chính phủ", "THỦ TƯỚNG"),
+    ("QUYẾT ĐỊNH", "QĐ-UBND", "ỦY BAN NHÂN DÂN TỈNH", "Ủy ban nhân dân tỉnh", "CHỦ TỊCH"),
+]
+TOPICS = [
+    "công tác văn thư", "quản lý hồ sơ điện tử", "lưu trữ tài liệu", "chế độ báo cáo thống kê",
+    "cải cách thủ tục hành chính", "quản lý cán bộ, công chức", "ứng dụng công nghệ thông tin",
+    "quản lý tài sản công", "thi đua, khen thưởng", "tiếp công dân", "bảo vệ bí mật nhà nước",
+    "chuyển đổi số", "quản lý ngân sách cấp xã", "phòng, chống thiên tai", "an toàn thông tin mạng",
+]
+PLACES = ["Hà Nội", "Đà Nẵng", "Thành phố Hồ Chí Minh", "Cần Thơ", "Hải Phòng", "Huế", "Nghệ An"]
+LAWS = [
+    "Luật Tổ chức Chính phủ ngày 19 tháng 6 năm 2015",
+    "Luật Ban hành văn bản quy phạm pháp luật ngày 22 tháng 6 năm 2015",
+    "Luật Lưu trữ ngày 21 tháng 6 năm 2024",
+    "Luật Cán bộ, công chức ngày 13 tháng 11 năm 2008",
+    "Luật Giao dịch điện tử ngày 22 tháng 6 năm 2023",
+    "Luật Tổ chức chính quyền địa phương ngày 19 tháng 6 năm 2015",
+    "Luật Ngân sách nhà nước ngày 25 tháng 6 năm 2015",
+]
+CHAPTER_TITLES = [
+    "QUY ĐỊNH CHUNG", "NỘI DUNG QUẢN LÝ", "TRÁCH NHIỆM CỦA CƠ QUAN, TỔ CHỨC", "QUY TRÌNH THỰC HIỆN",
+    "BẢO ĐẢM ĐIỀU KIỆN THỰC HIỆN", "KIỂM TRA, THANH TRA VÀ XỬ LÝ VI PHẠM", "ĐIỀU KHOẢN THI HÀNH",
+    "HỆ THỐNG THÔNG TIN", "CHẾ ĐỘ BÁO CÁO", "TỔ CHỨC THỰC HIỆN",
+]
+SECTION_TITLES = [
+    "QUẢN LÝ VĂN BẢN ĐI", "QUẢN LÝ VĂN BẢN ĐẾN", "LẬP HỒ SƠ", "SỐ HÓA TÀI LIỆU", "KINH PHÍ THỰC HIỆN",
+    "PHÂN CẤP QUẢN LÝ", "KẾT NỐI, CHIA SẺ DỮ LIỆU",
+]
+ARTICLE_TITLES = [
+    "Phạm vi điều chỉnh", "Đối tượng áp dụng", "Giải thích từ ngữ", "Nguyên tắc thực hiện",
+    "Trách nhiệm của người đứng đầu", "Quy trình tiếp nhận", "Thời hạn giải quyết", "Hồ sơ đề nghị",
+    "Điều kiện bảo đảm", "Kinh phí thực hiện", "Chế độ báo cáo", "Kiểm tra, giám sát",
+    "Xử lý vi phạm", "Hiệu lực thi hành", "Trách nhiệm thi hành", "Lưu trữ hồ sơ",
+    "Ứng dụng công nghệ thông tin", "Công khai thông tin", "Phối hợp giữa các cơ quan",
+]
+SUBJECTS = [
+    "Cơ quan, tổ chức", "Văn thư cơ quan", "Người đứng đầu cơ quan, tổ chức", "Ủy ban nhân dân cấp xã",
+    "Bộ Nội vụ", "Cán bộ, công chức, viên chức", "Đơn vị chủ trì soạn thảo", "Lưu trữ cơ quan",
+    "Sở Nội vụ", "Cơ quan quản lý chuyên ngành",
+]
+VERBS = [
+    "có trách nhiệm tổ chức thực hiện", "chịu trách nhiệm kiểm tra", "hướng dẫn, đôn đốc việc thực hiện",
+    "bảo đảm thực hiện đầy đủ", "thống nhất quản lý", "phối hợp triển khai", "định kỳ báo cáo kết quả",
+    "xây dựng và ban hành quy chế về", "bố trí kinh phí cho", "lập danh mục và theo dõi",
+]
+OBJECTS = [
+    "công tác văn thư, lưu trữ", "hồ sơ, tài liệu điện tử", "việc số hóa văn bản", "hệ thống quản lý văn bản",
+    "việc lập hồ sơ công việc", "chế độ báo cáo định kỳ", "việc sử dụng con dấu, thiết bị lưu khóa bí mật",
+    "quy trình giải quyết thủ tục hành chính", "cơ sở dữ liệu chuyên ngành", "việc tiếp nhận văn bản đến",
+]
+QUALIFIERS = [
+    "theo quy định của pháp luật", "trong phạm vi chức năng, nhiệm vụ được giao",
+    "bảo đảm thống nhất, kịp thời, chính xác", "theo hướng dẫn của cơ quan có thẩm quyền",
+    "trước ngày 31 tháng 12 hằng năm", "trên môi trường điện tử", "tại Nghị định này",
+    "phù hợp với điều kiện thực tế của địa phương",
+]
+TABLE_HEADERS = [
+    ["STT", "Tên hồ sơ", "Thời hạn bảo quản", "Ghi chú"],
+    ["STT", "Chỉ tiêu", "Đơn vị tính", "Kỳ báo cáo", "Cơ quan thực hiện"],
+    ["STT", "Loại văn bản", "Chữ viết tắt"],
+    ["STT", "Nội dung công việc", "Thời hạn", "Đơn vị chủ trì", "Đơn vị phối hợp"],
+]
+RETENTION = ["Vĩnh viễn", "70 năm", "50 năm", "20 năm", "10 năm", "5 năm"]
+
+
+def to_roman(n):
+    out = []
+    for value, numeral in ((1000, "M"), (900, "CM"), (500, "D"), (400, "CD"), (100, "C"), (90, "XC"),
+                           (50, "L"), (40, "XL"), (10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I")):
+        while n >= value:
+            out.append(numeral)
+            n -= value
+    return "".join(out)
+
+
+# ============================================================
+# MÔ HÌNH VĂN BẢN
+# ============================================================
+class Para(NamedTuple):
+    text: str
+    bold: bool = False
+    center: bool = False
+
+
+class Table(NamedTuple):
+    rows: list          # hàng đầu là header
+
+
+class CorpusConfig(NamedTuple):
+    articles: tuple = (15, 60)       # số Điều (min, max)
+    khoan: tuple = (1, 5)            # số Khoản mỗi Điều
+    diem: tuple = (0, 4)             # số Điểm trong một Khoản có điểm
+    annexes: tuple = (0, 3)          # số Phụ lục
+    table_rate: float = 0.08         # tỉ lệ Điều có bảng
+    section_rate: float = 0.3        # tỉ lệ Chương chia Mục
+    table_rows: tuple = (3, 25)
+
+
+def _sentence(rng):
+    return f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(QUALIFIERS)}"
+
+
+def _table(rng, cfg):
+    headers = rng.choice(TABLE_HEADERS)
+    rows = [list(headers)]
+    for i in range(1, rng.randint(*cfg.table_rows) + 1):
+        row = [str(i)]
+        for h in headers[1:]:
+            if h == "Thời hạn bảo quản":
+                row.append(rng.choice(RETENTION))
+            elif h in ("Đơn vị tính", "Chữ viết tắt"):
+                row.append(rng.choice(["Văn bản", "Hồ sơ", "Lượt", "NĐ", "QĐ", "TT", "CV"]))
+            elif h in ("Kỳ báo cáo", "Thời hạn"):
+                row.append(rng.choice(["Hằng tháng", "Hằng quý", "6 tháng", "Hằng năm", "Quý IV"]))
+            else:
+                row.append(rng.choice(OBJECTS).capitalize())
+        rows.append(row)
+    return Table(rows)
+
+
+def generate_document(seed=0, index=0, config=CorpusConfig()):
+    """Văn bản thứ index của kho seed → (metadata, [Para | Table])."""
+    rng = random.Random(f"{seed}:{index}")
+    cfg = config
+    kind, suffix, issuer, issuer_name, signer = rng.choice(DOC_KINDS)
+    year = rng.randint(2010, 2025)
+    number = index + 1
+    so_hieu = f"{number}/{year}/{suffix}"
+    topic = rng.choice(TOPICS)
+    day, month = rng.randint(1, 28), rng.randint(1, 12)
+    meta = {"index": index, "so_hieu": so_hieu, "loai": kind.capitalize(), "co_quan": issuer_name,
+            "trich_yeu": f"Quy định về {topic}", "ngay": f"{day:02d}/{month:02d}/{year}"}
+
+    body = [
+        Para(issuer, bold=True, center=True),
+        Para("CỘNG HÒA XÃ HỘI CHỦ NGHĨA VIỆT NAM", bold=True, center=True),
+        Para("Độc lập - Tự do - Hạnh phúc", bold=True, center=True),
+        Para(f"Số: {so_hieu}", center=True),
+        Para(f"{rng.choice(PLACES)}, ngày {day} tháng {month} năm {year}", center=True),
+        Para(""),
+        Para(kind, bold=True, center=True),
+        Para(f"Quy định về {topic}", bold=True, center=True),
+        Para(""),
+    ]
+    for law in rng.sample(LAWS, rng.randint(1, 3)):
+        body.append(Para(f"Căn cứ {law};"))
+    body.append(Para(f"{issuer_name} ban hành {kind.capitalize()} quy định về {topic}."))
+
+    n_articles = rng.randint(*cfg.articles)
+    n_chapters = max(1, min(len(CHAPTER_TITLES), n_articles // rng.randint(5, 12)))
+    per_chapter = [n_articles // n_chapters + (1 if c < n_articles % n_chapters else 0)
+                   for c in range(n_chapters)]
+    article = 0
+    for c, count in enumerate(per_chapter, 1):
+        body.append(Para(f"Chương {to_roman(c)}", bold=True, center=True))
+        body.append(Para(CHAPTER_TITLES[(c - 1) % len(CHAPTER_TITLES)], bold=True, center=True))
+        sections = rng.randint(2, 3) if count >= 4 and rng.random() < cfg.section_rate else 1
+        for s in range(1, sections + 1):
+            if sections > 1:
+                body.append(Para(f"Mục {s}. {rng.choice(SECTION_TITLES)}", bold=True, center=True))
+            for _ in range(count // sections + (1 if s <= count % sections else 0)):
+                article += 1
+                body.extend(_article(rng, cfg, article))
+
+    body.append(Para(""))
+    body.append(Para("Nơi nhận:", bold=True))
+    for recipient in ("- Như Điều 3;", "- Văn phòng Chính phủ;", "- Lưu: VT."):
+        body.append(Para(recipient))
+    body.append(Para(signer, bold=True, center=True))
+
+    for a in range(1, rng.randint(*cfg.annexes) + 1):
+        body.append(Para(""))
+        body.append(Para(f"Phụ lục {to_roman(a)}", bold=True, center=True))
+        body.append(Para(f"DANH MỤC {rng.choice(OBJECTS).upper()}", bold=True, center=True))
+        body.append(Para(f"(Kèm theo {kind.capitalize()} số {so_hieu})", center=True))
+        body.append(_table(rng, cfg))
+    meta["articles"] = article
+    return meta, body
+
+
+def _article(rng, cfg, n):
+    out = [Para(f"Điều {n}. {rng.choice(ARTICLE_TITLES)}", bold=True)]
+    n_khoan = rng.randint(*cfg.khoan)
+    if n_khoan == 1:
+        out.append(Para(_sentence(rng) + "."))
+    else:
+        for k in range(1, n_khoan + 1):
+            n_diem = rng.randint(*cfg.diem) if rng.random() < 0.35 else 0
+            out.append(Para(f"{k}. {_sentence(rng)}" + (":" if n_diem else ".")))
+            for d in range(n_diem):
+                out.append(Para(f"{'abcdđeghiklmn'[d]}) {_sentence(rng)}" + (";" if d < n_diem - 1 else ".")))
+    if rng.random() < cfg.table_rate:
+        out.append(_table(rng, cfg))
+    return out
+
+
+# ============================================================
+# MARKDOWN — cùng luật với convert_word_to_md.iter_markdown
+# ============================================================
+def _markdown_lines(body):
+    classifier = DEFAULT_CLASSIFIER
+    for block in body:
+        if isinstance(block, Table):
+            header, rows = block.rows[0], block.rows[1:]
+            yield ""
+            yield "| " + " | ".join(header) + " |"
+            yield "| " + " | ".join(["---"] * len(header)) + " |"
+            for cells in rows:
+                yield "| " + " | ".join(cells) + " |"
+            yield ""
+            continue
+        text = block.text.strip()
+        if not text:
+            yield ""
+            continue
+        matched = classifier.match(text)
+        if matched is not None:
+            yield matched[1]
+        elif block.bold and len(text) < 80:
+            yield f"**{text}**"
+        else:
+            yield text
+
+
+def to_markdown(body):
+    collapser = _BlankLineCollapser()
+    parts = []
+    for i, line in enumerate(_markdown_lines(body)):
+        parts.append(collapser.feed(line if i == 0 else "\n" + line))
+    parts.append(collapser.flush())
+    return "".join(parts)
+
+
+# ============================================================
+# DOCX — document.xml ghép chuỗi, part khác nén sẵn
+# ============================================================
+def _xml_text(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _para_xml(p):
+    ppr = '<w:pPr><w:jc w:val="center"/></w:pPr>' if p.center else ""
+    if not p.text:
+        return f"<w:p>{ppr}</w:p>"
+    rpr = "<w:rPr><w:b/></w:rPr>" if p.bold else ""
+    return f'<w:p>{ppr}<w:r>{rpr}<w:t xml:space="preserve">{_xml_text(p.text)}</w:t></w:r></w:p>'
+
+
+def _table_xml(t):
+    cols = len(t.rows[0])
+    width = TEXT_WIDTH_TWIPS // cols
+    out = ['<w:tbl><w:tblPr><w:tblStyle w:val="TableGrid"/><w:tblW w:w="0" w:type="auto"/></w:tblPr><w:tblGrid>',
+           f'<w:gridCol w:w="{width}"/>' * cols, "</w:tblGrid>"]
+    for r, row in enumerate(t.rows):
+        rpr = "<w:rPr><w:b/></w:rPr>" if r == 0 else ""
+        out.append("<w:tr>")
+        for cell in row:
+            out.append(f'<w:tc><w:tcPr><w:tcW w:w="{width}" w:type="dxa"/></w:tcPr>'
+                       f'<w:p><w:r>{rpr}<w:t xml:space="preserve">{_xml_text(cell)}</w:t></w:r></w:p></w:tc>')
+        out.append("</w:tr>")
+    out.append("</w:tbl>")
+    return "".join(out)
+
+
+class DocxSkeleton(NamedTuple):
+    base: bytes         # zip các part cố định, đã nén
+    head: str           # document.xml tới hết <w:body>
+    tail: str           # sectPr + đóng body/document
+
+
+_skeleton = None
+
+
+def docx_skeleton():
+    """Bộ khung từ template mặc định của python-docx (dựng một lần mỗi tiến trình)."""
+    global _skeleton
+    if _skeleton is None:
+        from docx import Document
+        doc = Document()
+        fixed = datetime(*FIXED_DATE)
+        doc.core_properties.created = fixed
+        doc.core_properties.modified = fixed
+        doc.core_properties.author = "generate_corpus"
+        doc.core_properties.last_modified_by = "generate_corpus"
+        buf = BytesIO()
+        doc.save(buf)
+        base = BytesIO()
+        with zipfile.ZipFile(buf) as src, zipfile.ZipFile(base, "w", zipfile.ZIP_DEFLATED) as dst:
+            names = sorted((n for n in src.namelist() if n != "word/document.xml"),
+                           key=lambda n: n != "[Content_Types].xml")
+            for name in names:
+                dst.writestr(zipfile.ZipInfo(name, FIXED_DATE), src.read(name), zipfile.ZIP_DEFLATED)
+            xml = src.read("word/document.xml").decode("utf-8")
+        body_open = xml.index(">", xml.index("<w:body")) + 1
+        sect = xml.index("<w:sectPr", body_open)
+        _skeleton = DocxSkeleton(base.getvalue(), xml[:body_open], xml[sect:])
+    return _skeleton
+
+
+def docx_bytes(body):
+    skeleton = docx_skeleton()
+    xml = skeleton.head + "".join(
+        _table_xml(b) if isinstance(b, Table) else _para_xml(b) for b in body) + skeleton.tail
+    buf = BytesIO(skeleton.base)
+    with zipfile.ZipFile(buf, "a", zipfile.ZIP_DEFLATED) as z:
+        z.writestr(zipfile.ZipInfo("word/document.xml", FIXED_DATE), xml, zipfile.ZIP_DEFLATED)
+    return buf.getvalue()
+
+
+def write_docx(body, path):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(docx_bytes(body))
+    os.replace(tmp, path)
+
+
+# ============================================================
+# KHO
+# ============================================================
+def output_stem(output_dir, index, count, per_dir):
+    name = f"vb-{index + 1:07d}"
+    if count <= per_dir:
+        return Path(output_dir) / name
+    return Path(output_dir) / f"{index // per_dir:04d}" / name
+
+
+def _readme(meta):
+    """README.md cùng khuôn với kho thật (citation_graph.py đọc Số hiệu từ đây)."""
+    return (f"# {meta['loai']} {meta['so_hieu']} — {meta['trich_yeu']}\n\n"
+            f"> **Số hiệu**: {meta['so_hieu']}  \n"
+            f"> **Ngày ban hành**: {meta['ngay']}  \n"
+            f"> **Cơ quan ban hành**: {meta['co_quan']}  \n"
+            f"> **Nguồn**: generate_corpus.py (tổng hợp, seed={meta['seed']})\n")
+
+
+def _write_text(path, text):
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(text)
+    return len(text.encode("utf-8"))
+
+
+def _generate_range(start, stop, seed, count, output_dir, formats, per_dir, config, layout):
+    """
+    Một job: sinh văn bản [start, stop) → (số văn bản, tổng byte, số Điều).
+
+    layout "flat": vb-NNNNNNN.docx + vb-NNNNNNN.md cạnh nhau.
+    layout "repo": vb-NNNNNNN/README.md, noi-dung.md, van-ban-goc/vb-NNNNNNN.docx — như
+    docs/van-ban-phap-quy, để search_index.py / citation_graph.py quét thẳng.
+    """
+    written = size = articles = 0
+    config = CorpusConfig(*config)
+    for index in range(start, stop):
+        meta, body = generate_document(seed, index, config)
+        meta["seed"] = seed
+        stem = output_stem(output_dir, index, count, per_dir)
+        if layout == "repo":
+            docx_path = stem / "van-ban-goc" / f"{stem.name}.docx"
+            md_path = stem / "noi-dung.md"
+            docx_path.parent.mkdir(parents=True, exist_ok=True)
+            size += _write_text(stem / "README.md", _readme(meta))
+        else:
+            docx_path, md_path = stem.with_suffix(".docx"), stem.with_suffix(".md")
+            stem.parent.mkdir(parents=True, exist_ok=True)
+        if "docx" in formats:
+            write_docx(body, docx_path)
+            size += docx_path.stat().st_size
+        if "md" in formats:
+            size += _write_text(md_path, to_markdown(body))
+        written += 1
+        articles += meta["articles"]
+    return written, size, articles
+
+
+def generate_corpus(output_dir, count, seed=0, formats=("docx", "md"), jobs=1,
+                    config=CorpusConfig(), per_dir=1000, layout="flat", chunk=200, progress=None):
+    """Sinh count văn bản vào output_dir; trả về thống kê (dict), ghi kèm _corpus.json."""
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    ranges = [(s, min(s + chunk, count)) for s in range(0, count, chunk)]
+    stats = {"documents": 0, "bytes": 0, "articles": 0}
+    args = (seed, count, str(output_dir), tuple(formats), per_dir, tuple(config), layout)
+
+    def add(result):
+        for key, value in zip(("documents", "bytes", "articles"), result):
+            stats[key] += value
+        if progress:
+            progress(stats["documents"], count)
+
+    if jobs <= 1 or len(ranges) == 1:
+        for start, stop in ranges:
+            add(_generate_range(start, stop, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for fut in as_completed([pool.submit(_generate_range, s, e, *args) for s, e in ranges]):
+                add(fut.result())
+
+    manifest = {"generator_version": GENERATOR_VERSION, "seed": seed, "count": count,
+                "formats": list(formats), "per_dir": per_dir, "layout": layout,
+                "config": config._asdict(), **stats}
+    with open(Path(output_dir) / CORPUS_MANIFEST, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def _parse_range(text):
+    lo, _, hi = text.partition("-")
+    return int(lo), int(hi or lo)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sinh kho văn bản pháp quy tổng hợp (.docx/.md)")
+    parser.add_argument("-o", "--output-dir", required=True, help="Thư mục ghi kho")
+    parser.add_argument("-n", "--count", type=int, default=100, help="Số văn bản")
+    parser.add_argument("--seed", type=int, default=0, help="Seed (cùng seed → cùng kho)")
+    parser.add_argument("--format", default="docx,md", help="docx, md hoặc docx,md")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Số tiến trình")
+    parser.add_argument("--articles", default="15-60", help="Số Điều mỗi văn bản, vd 20-120")
+    parser.add_argument("--khoan", default="1-5", help="Số Khoản mỗi Điều")
+    parser.add_argument("--annexes", default="0-3", help="Số Phụ lục mỗi văn bản")
+    parser.add_argument("--table-rate", type=float, default=0.08, help="Tỉ lệ Điều có bảng")
+    parser.add_argument("--table-rows", default="3-25", help="Số hàng mỗi bảng")
+    parser.add_argument("--per-dir", type=int, default=1000, help="Số văn bản mỗi thư mục con")
+    parser.add_argument("--layout", choices=("flat", "repo"), default="flat",
+                        help="flat: .docx/.md cạnh nhau; repo: thư mục mỗi văn bản như docs/van-ban-phap-quy")
+    args = parser.parse_args()
+
+    formats = tuple(f.strip() for f in args.format.split(",") if f.strip())
+    if not formats or set(formats) - {"docx", "md"}:
+        print(f"❌ --format chỉ nhận docx, md: {args.format}")
+        sys.exit(1)
+    try:
+        config = CorpusConfig(articles=_parse_range(args.articles), khoan=_parse_range(args.khoan),
+                              annexes=_parse_range(args.annexes), table_rate=args.table_rate,
+                              table_rows=_parse_range(args.table_rows))
+    except ValueError as e:
+        print(f"❌ Khoảng không hợp lệ: {e}")
+        sys.exit(1)
+
+    step = max(1, args.count // 20)
+
+    def progress(done, total):
+        if done == total or done % step < 200:
+            print(f"   [{done}/{total}]", flush=True)
+
+    print(f"📂 Sinh {args.count} văn bản (seed={args.seed}, {', '.join(formats)}) → {args.output_dir}")
+    started = datetime.now()
+    stats = generate_corpus(args.output_dir, args.count, args.seed, formats, args.jobs, config,
+                            args.per_dir, args.layout, progress=progress)
+    elapsed = (datetime.now() - started).total_seconds()
+    print(f"🎉 {stats['documents']} văn bản, {stats['articles']:,} Điều, "
+          f"{stats['bytes'] / 2**20:.1f} MB trong {elapsed:.1f}s")
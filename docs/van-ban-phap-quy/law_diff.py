@@ -0,0 +1,497 @@
+"""
+So sánh hai phiên bản của một văn bản (vd luat-luu-tru-2011 ↔ luat-luu-tru-2024) ở cấp Điều
+
+Biết ngay Điều nào giữ nguyên, đánh số lại, sửa đổi, bổ sung mới hay bãi bỏ —
+không phải diff cả văn bản dài hàng nghìn dòng.
+
+Ghép Điều cũ ↔ mới theo thứ tự, chỉ so từng từ ở các cặp thật sự khác nhau:
+    1. cùng số Điều, cùng hash nội dung          → không đổi
+    2. cùng hash nội dung, khác số Điều           → đánh số lại
+    3. cùng số Điều, nội dung giống ≥ --min-similarity/2  → sửa đổi
+    4. khác số Điều, nội dung giống ≥ --min-similarity   → sửa đổi (kèm đổi số)
+    5. còn lại: bên cũ → bãi bỏ, bên mới → bổ sung mới
+Hash tính trên tên + nội dung Điều (bỏ "Điều N.", định dạng Markdown, khoảng
+trắng thừa) nên bước 1–2 là tra dict; độ giống (Jaccard trên từ đã bỏ dấu)
+chỉ tính cho số ít Điều còn lại; diff từng từ (difflib) chỉ chạy trên các cặp
+sửa đổi. Hai luật 300 Điều so trong chưa tới một giây.
+
+Đầu ra:
+    Markdown   bảng tổng hợp + chi tiết từng Điều thay đổi, <del>xóa</del> <ins>thêm</ins>
+    DOCX       toàn văn bản mới kèm track changes (w:ins/w:del) — mở bằng Word,
+               "Accept All" ra bản mới; Điều bãi bỏ nằm ở vị trí cũ dưới dạng xóa
+
+Cách dùng:
+    python law_diff.py luat/luat-luu-tru-2011 luat/luat-luu-tru-2024          # thư mục → noi-dung.md
+    python law_diff.py luat/luat-luu-tru-2011 luat/luat-luu-tru-2024 -o so-sanh.md --docx so-sanh.docx
+    python law_diff.py cu.docx moi.docx --docx so-sanh.docx --author "Phòng Pháp chế"
+    python law_diff.py cu.md moi.md --min-similarity 0.4
+
+    from law_diff import diff_laws, render_markdown, write_tracked_docx
+    diff = diff_laws("luat/luat-luu-tru-2011", "luat/luat-luu-tru-2024")
+    for change in diff.changes:
+        print(change.status, change.label)
+"""
+
+import io
+import os
+import re
+import sys
+import time
+import zipfile
+import difflib
+import hashlib
+import argparse
+from pathlib import Path
+from typing import NamedTuple
+from datetime import datetime, timezone
+from collections import defaultdict, deque
+
+from search_index import split_articles, tokenize, _MARKER_RE
+
+DEFAULT_MIN_SIMILARITY = 0.5
+DEFAULT_AUTHOR = "law_diff"
+
+UNCHANGED = "unchanged"
+RENUMBERED = "renumbered"
+MODIFIED = "modified"
+ADDED = "added"
+REMOVED = "removed"
+STATUS_LABELS = {
+    UNCHANGED: "Không đổi",
+    RENUMBERED: "Đánh số lại",
+    MODIFIED: "Sửa đổi",
+    ADDED: "Bổ sung mới",
+    REMOVED: "Bãi bỏ",
+}
+STATUS_ICONS = {UNCHANGED: "⚪", RENUMBERED: "🔄", MODIFIED: "✏️", ADDED: "🟢", REMOVED: "🔴"}
+
+
+# ============================================================
+# TÁCH ĐIỀU
+# ============================================================
+_HEADING_MARK_RE = re.compile(r'^#{1,6}\s+')
+_SPACE_RE = re.compile(r'\s+')
+# Từ/dấu câu kèm khoảng trắng theo sau (trừ xuống dòng): token " " quá phổ biến làm
+# SequenceMatcher chậm bậc hai, và tách "quy định" → "hướng dẫn" thành hai chỗ sửa vụn
+_WORD_RE = re.compile(r'\w+[^\S\n]*|[^\w\s][^\S\n]*|\s+')
+
+
+class Article(NamedTuple):
+    number: str     # số Điều ("" = phần đầu văn bản, trước Điều 1)
+    title: str
+    line: int       # dòng bắt đầu trong file Markdown (1-based)
+    lines: tuple    # các dòng nội dung đã làm sạch, dòng đầu là "Điều N. Tên"
+    digest: str     # hash tên + nội dung (không gồm số Điều)
+
+    @property
+    def label(self) -> str:
+        return f"Điều {self.number}" if self.number else "Phần đầu"
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+
+def _clean_line(line: str) -> str:
+    """Bỏ định dạng Markdown của converter (#, **, `[TODO]`) và khoảng trắng thừa."""
+    line = _HEADING_MARK_RE.sub("", line.strip()).replace("**", "")
+    return _SPACE_RE.sub(" ", _MARKER_RE.sub("", line)).strip()
+
+
+def articles_from_markdown(text: str, rel_path: str = "noi-dung.md") -> list:
+    """Chia Markdown thành danh sách Article (dùng đúng cách tách Điều của search_index)."""
+    articles = []
+    for unit in split_articles(text, rel_path):
+        lines = tuple(s for s in map(_clean_line, unit.text.split("\n")) if s)
+        if not lines:
+            continue
+        title = _clean_line(unit.title)
+        body = lines[1:] if unit.article else lines
+        key = "\n".join((title if unit.article else "",) + body)
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        articles.append(Article(unit.article, title, unit.line, lines, digest))
+    return articles
+
+
+def load_articles(path) -> list:
+    """Đọc văn bản: thư mục (→ noi-dung.md), file .md, hoặc .docx/.doc (convert trong bộ nhớ)."""
+    path = Path(path)
+    if path.is_dir():
+        path = path / "noi-dung.md"
+    if not path.is_file():
+        raise FileNotFoundError(f"Không tìm thấy: {path}")
+    if path.suffix.lower() in (".docx", ".doc"):
+        from convert_word_to_md import docx_to_markdown
+        text = docx_to_markdown(str(path), quiet=True)
+    else:
+        text = path.read_text(encoding="utf-8")
+    return articles_from_markdown(text, path.name)
+
+
+def _label_of(path) -> str:
+    path = Path(path)
+    return path.name if path.is_dir() or path.name != "noi-dung.md" else path.parent.name
+
+
+# ============================================================
+# GHÉP ĐIỀU CŨ ↔ MỚI
+# ============================================================
+class Change(NamedTuple):
+    status: str
+    old: Article            # None nếu bổ sung mới
+    new: Article            # None nếu bãi bỏ
+    similarity: float       # 1.0 nếu cùng hash, 0.0 nếu không ghép được
+    segments: list          # [(tag, text)] tag ∈ equal/delete/insert — chỉ có ở MODIFIED
+
+    @property
+    def label(self) -> str:
+        if self.old and self.new and self.old.number != self.new.number:
+            return f"{self.old.label} → {self.new.label}"
+        return (self.new or self.old).label
+
+    @property
+    def title(self) -> str:
+        return (self.new or self.old).title
+
+
+class LawDiff(NamedTuple):
+    old_label: str
+    new_label: str
+    old_count: int
+    new_count: int
+    changes: list           # theo thứ tự văn bản mới, Điều bãi bỏ chèn vào vị trí cũ
+    elapsed: float
+
+    def counts(self) -> dict:
+        counts = dict.fromkeys(STATUS_LABELS, 0)
+        for change in self.changes:
+            counts[change.status] += 1
+        return counts
+
+
+def similarity(a: set, b: set) -> float:
+    """Jaccard trên tập từ/bigram đã bỏ dấu."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def align_articles(old: list, new: list, min_similarity: float = DEFAULT_MIN_SIMILARITY) -> dict:
+    """Ghép Điều: trả về {chỉ số Điều mới: (chỉ số Điều cũ, độ giống)}."""
+    pairs = {}
+    free_old = set(range(len(old)))
+
+    def take(groups, key_of):
+        for j, article in enumerate(new):
+            if j in pairs:
+                continue
+            queue = groups.get(key_of(article))
+            while queue and queue[0] not in free_old:
+                queue.popleft()
+            if queue:
+                i = queue.popleft()
+                free_old.discard(i)
+                pairs[j] = (i, 1.0)
+
+    def group(key_of):
+        groups = defaultdict(deque)
+        for i in sorted(free_old):
+            groups[key_of(old[i])].append(i)
+        return groups
+
+    # 1–2: tra hash — phần lớn Điều dừng ở đây
+    take(group(lambda a: (a.number, a.digest)), lambda a: (a.number, a.digest))
+    take(group(lambda a: a.digest), lambda a: a.digest)
+
+    # 3–4: độ giống, chỉ cho các Điều chưa ghép được
+    words = {}
+
+    def words_of(side, k, article):
+        key = (side, k)
+        if key not in words:
+            words[key] = set(tokenize(article.text))
+        return words[key]
+
+    by_number = group(lambda a: a.number)
+    for j, article in enumerate(new):
+        if j in pairs:
+            continue
+        for i in by_number.get(article.number, ()):
+            if i in free_old:
+                score = similarity(words_of(0, i, old[i]), words_of(1, j, article))
+                if score >= min_similarity / 2:
+                    free_old.discard(i)
+                    pairs[j] = (i, score)
+                break
+
+    candidates = []
+    rest_new = [j for j in range(len(new)) if j not in pairs]
+    for i in sorted(free_old):
+        for j in rest_new:
+            score = similarity(words_of(0, i, old[i]), words_of(1, j, new[j]))
+            if score >= min_similarity:
+                candidates.append((-score, i, j))
+    for score, i, j in sorted(candidates):
+        if i in free_old and j not in pairs:
+            free_old.discard(i)
+            pairs[j] = (i, -score)
+    return pairs
+
+
+def word_diff(old_text: str, new_text: str) -> list:
+    """Diff từng từ: [(tag, text)] với tag equal/delete/insert, các đoạn cùng tag đã gộp."""
+    a, b = _WORD_RE.findall(old_text), _WORD_RE.findall(new_text)
+    segments = []
+
+    def emit(tag, tokens):
+        text = "".join(tokens)
+        if not text:
+            return
+        if segments and segments[-1][0] == tag:
+            segments[-1] = (tag, segments[-1][1] + text)
+        else:
+            segments.append((tag, text))
+
+    for op, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if op == "equal":
+            emit("equal", a[i1:i2])
+        else:
+            emit("delete", a[i1:i2])
+            emit("insert", b[j1:j2])
+    return segments
+
+
+def diff_articles(old: list, new: list, min_similarity: float = DEFAULT_MIN_SIMILARITY) -> list:
+    """Danh sách Change theo thứ tự văn bản mới; Điều bãi bỏ đứng sau Điều cũ liền trước nó."""
+    pairs = align_articles(old, new, min_similarity)
+    placed = {i: j for j, (i, _) in pairs.items()}
+    keyed = []
+    for j, article in enumerate(new):
+        if j not in pairs:
+            keyed.append(((j, 0, 0), Change(ADDED, None, article, 0.0, None)))
+            continue
+        i, score = pairs[j]
+        before = old[i]
+        if before.digest == article.digest:
+            status = UNCHANGED if before.number == article.number else RENUMBERED
+            keyed.append(((j, 0, 0), Change(status, before, article, 1.0, None)))
+        else:
+            segments = word_diff(before.text, article.text)
+            keyed.append(((j, 0, 0), Change(MODIFIED, before, article, score, segments)))
+    anchor = -1
+    for i, article in enumerate(old):
+        if i in placed:
+            anchor = placed[i]
+        else:
+            keyed.append(((anchor, 1, i), Change(REMOVED, article, None, 0.0, None)))
+    keyed.sort(key=lambda kv: kv[0])
+    return [change for _, change in keyed]
+
+
+def diff_laws(old_path, new_path, min_similarity: float = DEFAULT_MIN_SIMILARITY) -> LawDiff:
+    """So sánh hai văn bản (thư mục/.md/.docx/.doc) ở cấp Điều."""
+    start = time.perf_counter()
+    old, new = load_articles(old_path), load_articles(new_path)
+    changes = diff_articles(old, new, min_similarity)
+    return LawDiff(_label_of(old_path), _label_of(new_path), sum(1 for a in old if a.number),
+                   sum(1 for a in new if a.number), changes, time.perf_counter() - start)
+
+
+# ============================================================
+# MARKDOWN
+# ============================================================
+def _inline(tag: str, text: str) -> str:
+    """Bọc đoạn xóa/thêm theo từng dòng (thẻ HTML không được vắt qua dòng Markdown)."""
+    if tag == "equal":
+        return text
+    html = "del" if tag == "delete" else "ins"
+    return "\n".join(f"<{html}>{part}</{html}>" if part.strip() else part for part in text.split("\n"))
+
+
+def render_markdown(diff: LawDiff) -> str:
+    counts = diff.counts()
+    out = [
+        f"# So sánh {diff.old_label} → {diff.new_label}",
+        "",
+        f"> {diff.old_count} Điều → {diff.new_count} Điều. "
+        f"Chữ <del>gạch ngang</del> là phần bị xóa, <ins>gạch dưới</ins> là phần thêm mới.",
+        "",
+        "| Trạng thái | Số Điều |",
+        "|------------|---------|",
+    ]
+    out += [f"| {STATUS_ICONS[s]} {STATUS_LABELS[s]} | {counts[s]} |" for s in STATUS_LABELS]
+
+    renumbered = [c for c in diff.changes if c.status == RENUMBERED]
+    if renumbered:
+        out += ["", "## 🔄 Đánh số lại (nội dung giữ nguyên)", "",
+                "| Cũ | Mới | Tên Điều |", "|----|-----|----------|"]
+        out += [f"| {c.old.label} | {c.new.label} | {c.title} |" for c in renumbered]
+
+    detailed = [c for c in diff.changes if c.status in (MODIFIED, ADDED, REMOVED)]
+    if detailed:
+        out += ["", "## Chi tiết thay đổi"]
+    for change in detailed:
+        note = STATUS_LABELS[change.status]
+        if change.status == MODIFIED:
+            note += f", giống {int(change.similarity * 100)}%"
+        out += ["", f"### {STATUS_ICONS[change.status]} {change.label}. {change.title} — {note}", ""]
+        if change.status == MODIFIED:
+            text = "".join(_inline(tag, t) for tag, t in change.segments)
+        elif change.status == ADDED:
+            text = _inline("insert", change.new.text)
+        else:
+            text = _inline("delete", change.old.text)
+        out += text.split("\n")
+    return "\n".join(out) + "\n"
+
+
+# ============================================================
+# DOCX — TRACK CHANGES
+# ============================================================
+_INVALID_XML_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+
+def _xml_text(text: str) -> str:
+    text = _INVALID_XML_RE.sub("", text)
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+
+
+def _paragraphs(segments, last_mark="equal"):
+    """Tách [(tag, text)] thành đoạn văn: [(runs, mark)] — mark là tag của dấu xuống dòng."""
+    paragraphs, runs = [], []
+    for tag, text in segments:
+        parts = text.split("\n")
+        for k, part in enumerate(parts):
+            if k:
+                paragraphs.append((runs, tag))
+                runs = []
+            if part:
+                runs.append((tag, part))
+    paragraphs.append((runs, last_mark))
+    return paragraphs
+
+
+class _TrackedWriter:
+    """Sinh XML w:p có w:ins/w:del (id tăng dần, cùng tác giả/thời điểm)."""
+
+    def __init__(self, author: str, date: str):
+        self.attrs = f'w:author="{_xml_text(author)}" w:date="{date}"'
+        self.next_id = 1
+        self.parts = []
+
+    def _mark(self, tag):
+        self.next_id += 1
+        return f'<w:{"ins" if tag == "insert" else "del"} w:id="{self.next_id - 1}" {self.attrs}/>'
+
+    def paragraph(self, runs, mark="equal", style=None, bold=False):
+        ppr = f'<w:pStyle w:val="{style}"/>' if style else ""
+        if mark != "equal":
+            ppr += f"<w:rPr>{self._mark(mark)}</w:rPr>"
+        out = [f"<w:p><w:pPr>{ppr}</w:pPr>" if ppr else "<w:p>"]
+        rpr = "<w:rPr><w:b/></w:rPr>" if bold else ""
+        for tag, text in runs:
+            if tag == "delete":
+                out.append(f'<w:del w:id="{self.next_id}" {self.attrs}><w:r>{rpr}'
+                           f'<w:delText xml:space="preserve">{_xml_text(text)}</w:delText></w:r></w:del>')
+                self.next_id += 1
+                continue
+            run = f'<w:r>{rpr}<w:t xml:space="preserve">{_xml_text(text)}</w:t></w:r>'
+            if tag == "insert":
+                run = f'<w:ins w:id="{self.next_id}" {self.attrs}>{run}</w:ins>'
+                self.next_id += 1
+            out.append(run)
+        out.append("</w:p>")
+        self.parts.append("".join(out))
+
+    def text(self, text, style=None, bold=False):
+        self.paragraph([("equal", text)] if text else [], style=style, bold=bold)
+
+    def article(self, segments, last_mark, heading):
+        for k, (runs, mark) in enumerate(_paragraphs(segments, last_mark)):
+            self.paragraph(runs, mark, style="Heading3" if heading and k == 0 else None)
+
+
+def tracked_document_xml(diff: LawDiff, author: str = DEFAULT_AUTHOR, date: str = None) -> list:
+    """Các đoạn w:p của báo cáo: tổng hợp + toàn văn bản mới có track changes."""
+    date = date or datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    w = _TrackedWriter(author, date)
+    counts = diff.counts()
+    w.text(f"So sánh {diff.old_label} → {diff.new_label}", style="Title")
+    w.text(f"{diff.old_count} Điều → {diff.new_count} Điều: " + ", ".join(
+        f"{STATUS_LABELS[s].lower()} {counts[s]}" for s in STATUS_LABELS))
+    renumbered = [c.label for c in diff.changes if c.status == RENUMBERED]
+    if renumbered:
+        w.text("Đánh số lại: " + "; ".join(renumbered) + ".")
+    for change in diff.changes:
+        if change.status == MODIFIED:
+            segments, last = change.segments, "equal"
+        elif change.status == ADDED:
+            segments, last = [("insert", change.new.text)], "insert"
+        elif change.status == REMOVED:
+            segments, last = [("delete", change.old.text)], "delete"
+        else:
+            segments, last = [("equal", change.new.text)], "equal"
+        w.article(segments, last, heading=bool((change.new or change.old).number))
+    return w.parts
+
+
+def write_tracked_docx(diff: LawDiff, path, author: str = DEFAULT_AUTHOR):
+    """Ghi DOCX track changes: khung từ template python-docx, document.xml ghép chuỗi."""
+    from docx import Document
+    doc = Document()
+    doc.core_properties.author = author
+    doc.core_properties.title = f"So sánh {diff.old_label} → {diff.new_label}"
+    buf = io.BytesIO()
+    doc.save(buf)
+    tmp = f"{path}.tmp"
+    with zipfile.ZipFile(buf) as src, zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            if info.filename != "word/document.xml":
+                dst.writestr(info, src.read(info))
+        xml = src.read("word/document.xml").decode("utf-8")
+        body_open = xml.index(">", xml.index("<w:body")) + 1
+        sect = xml.index("<w:sectPr", body_open)
+        body = "".join(tracked_document_xml(diff, author))
+        dst.writestr("word/document.xml", xml[:body_open] + body + xml[sect:])
+    os.replace(tmp, path)
+
+
+# ============================================================
+# MAIN
+# ============================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="So sánh hai phiên bản văn bản pháp quy ở cấp Điều")
+    parser.add_argument("old", help="Bản cũ: thư mục văn bản (noi-dung.md), .md, .docx hoặc .doc")
+    parser.add_argument("new", help="Bản mới: thư mục văn bản (noi-dung.md), .md, .docx hoặc .doc")
+    parser.add_argument("-o", "--output", help="Ghi báo cáo Markdown (mặc định in ra stdout)")
+    parser.add_argument("--docx", help="Ghi thêm DOCX có track changes")
+    parser.add_argument("--author", default=DEFAULT_AUTHOR, help="Tác giả của các thay đổi trong DOCX")
+    parser.add_argument("--min-similarity", type=float, default=DEFAULT_MIN_SIMILARITY,
+                        help="Độ giống tối thiểu (0–1) để ghép hai Điều khác số là một Điều sửa đổi "
+                             f"(mặc định {DEFAULT_MIN_SIMILARITY}; cùng số Điều: một nửa ngưỡng này)")
+    args = parser.parse_args()
+
+    log = sys.stdout if args.output else sys.stderr
+    try:
+        diff = diff_laws(args.old, args.new, args.min_similarity)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    if not diff.old_count or not diff.new_count:
+        print("⚠️  Một trong hai văn bản không có Điều nào (noi-dung.md còn [TODO]?) — chỉ so phần đầu",
+              file=log)
+
+    report = render_markdown(diff)
+    if args.output:
+        Path(args.output).write_text(report, encoding="utf-8")
+        print(f"✅ {args.output}", file=log)
+    else:
+        sys.stdout.write(report)
+    if args.docx:
+        write_tracked_docx(diff, args.docx, args.author)
+        print(f"✅ {args.docx}", file=log)
+
+    counts = diff.counts()
+    print(f"📊 {diff.old_label} ({diff.old_count} Điều) → {diff.new_label} ({diff.new_count} Điều): " +
+          ", ".join(f"{STATUS_LABELS[s].lower()} {counts[s]}" for s in STATUS_LABELS), file=log)
+    print(f"⏱️  {diff.elapsed * 1000:.0f} ms", file=log)
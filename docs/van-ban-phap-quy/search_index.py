@@ -0,0 +1,735 @@
+"""
+Chỉ mục tìm kiếm toàn văn cho kho văn bản pháp quy (docs/van-ban-phap-quy)
+
+Tìm "Điều nào nói về lập hồ sơ" mà không phải grep từng file: gõ không dấu
+vẫn khớp có dấu ("van ban" ↔ "văn bản"), xếp hạng BM25, kết quả ở cấp Điều.
+
+Cách dùng:
+    python search_index.py build                      # quét thư mục chứa script
+    python search_index.py build "docs/van-ban-phap-quy" -o ".search-index"
+    python search_index.py query "lập hồ sơ"
+    python search_index.py query "van ban den" -k 5
+    python search_index.py update                     # chỉ index lại file mới/đã sửa
+    python search_index.py merge                      # gộp segment nhỏ
+
+Chỉ mục gồm nhiều segment. Thêm/sửa một văn bản chỉ ghi một segment nhỏ
+chứa văn bản đó và đánh dấu xóa (tombstone) các Điều cũ — chi phí tỉ lệ với
+văn bản thay đổi, không tỉ lệ với cả kho. Các segment nhỏ được gộp dần
+(merge) ở process nền. convert_word_to_md.py --index gọi update sau khi convert.
+    segments.json   danh sách segment đang dùng, Điều đã xóa, file → segment
+
+Mỗi segment (seg-NNNNNN/) lưu dạng nhị phân, đọc bằng mmap — mở chỉ mục không
+phải parse lại Markdown, mỗi truy vấn chỉ chạm vào danh sách posting cần tìm:
+    meta.json       thống kê của segment (số Điều, tổng độ dài...)
+    lexicon.bin     các term (UTF-8) nối liền, đã sắp xếp
+    lexicon.idx     mỗi term: (offset term, độ dài, offset posting, số posting) — uint32
+    postings.bin    (unit id, tf) — uint32
+    doclens.bin     độ dài (số token) từng Điều — uint32
+    units.jsonl     metadata từng Điều (file, số Điều, tiêu đề, dòng)
+    units.idx       offset từng dòng của units.jsonl — uint64
+"""
+
+import sys
+import os
+import re
+import json
+import math
+import mmap
+import time
+import heapq
+import shutil
+import hashlib
+import argparse
+import subprocess
+from array import array
+from pathlib import Path
+from typing import NamedTuple
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_INDEX_DIR = ".search-index"
+INDEX_VERSION = 2
+DEFAULT_PATTERNS = ("noi-dung.md", "phu-luc*.md")
+MANIFEST_NAME = "segments.json"
+LOCK_NAME = ".lock"
+
+# Chính sách merge: quá MAX_SEGMENTS segment → gộp các segment nhỏ nhất;
+# segment có tỉ lệ Điều đã xóa vượt MAX_DELETED_RATIO cũng được gộp lại.
+MAX_SEGMENTS = 8
+MERGE_FACTOR = 4
+MAX_DELETED_RATIO = 0.3
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+# ============================================================
+# TÁCH TỪ TIẾNG VIỆT (BỎ DẤU)
+# ============================================================
+def _build_fold_table() -> dict:
+    """Bảng str.translate: chữ có dấu → chữ không dấu, xóa dấu tổ hợp rời."""
+    import unicodedata
+    table = {0x0111: "d", 0x0110: "d"}  # đ, Đ không tách được bằng NFD
+    for cp in list(range(0x00C0, 0x0250)) + list(range(0x1E00, 0x1F00)):
+        ch = chr(cp)
+        base = "".join(c for c in unicodedata.normalize("NFD", ch) if not unicodedata.combining(c))
+        if base != ch and base.isascii():
+            table[cp] = base.lower()
+    for cp in range(0x0300, 0x0370):
+        table[cp] = None
+    return table
+
+
+_FOLD_TABLE = _build_fold_table()
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def fold(text: str) -> str:
+    """Chữ thường, bỏ dấu: "Văn bản ĐẾN" → "van ban den"."""
+    return text.lower().translate(_FOLD_TABLE)
+
+
+def tokenize(text: str) -> list:
+    """Tách âm tiết đã bỏ dấu, thêm bigram ("lap_ho", "ho_so") để ưu tiên cụm từ liền nhau."""
+    words = _TOKEN_RE.findall(fold(text))
+    return words + [f"{a}_{b}" for a, b in zip(words, words[1:])]
+
+
+# ============================================================
+# TÁCH VĂN BẢN THÀNH ĐIỀU
+# ============================================================
+_DIEU_RE = re.compile(r'^(?:#{1,6}\s+)?(?:\*\*)?Điều\s+(\d+[a-z]?)[\.\:]?\s*(.*?)(?:\*\*)?\s*$')
+_TITLE_RE = re.compile(r'^#\s+(.*)$')
+_MARKER_RE = re.compile(r'\s*`?\[[A-Z]+\]`?')  # `[RELEVANT]`, [TODO]
+
+
+class Unit(NamedTuple):
+    """Một đơn vị tìm kiếm: một Điều, hoặc phần đầu / cả file nếu không có Điều."""
+    path: str       # đường dẫn tương đối tới gốc kho
+    doc: str        # tên thư mục văn bản, vd "30-2020-ND-CP"
+    article: str    # số Điều ("" nếu không phải Điều)
+    title: str
+    line: int       # dòng bắt đầu (1-based)
+    text: str
+
+
+def _doc_label(rel_path: Path) -> str:
+    parent = rel_path.parent
+    if parent.name == "phu-luc":
+        parent = parent.parent
+    return parent.name or rel_path.stem
+
+
+def split_articles(text: str, rel_path: str):
+    """Chia nội dung Markdown thành các Unit theo heading "Điều N."."""
+    rel = Path(rel_path)
+    doc = _doc_label(rel)
+    lines = text.split("\n")
+    file_title = next((m.group(1).strip() for m in map(_TITLE_RE.match, lines) if m), rel.stem)
+    article, title, start, buf = "", file_title, 1, []
+    for i, line in enumerate(lines, 1):
+        m = _DIEU_RE.match(line)
+        if m:
+            if any(s.strip() for s in buf):
+                yield Unit(rel.as_posix(), doc, article, title, start, "\n".join(buf))
+            article, title, start, buf = m.group(1), _MARKER_RE.sub("", m.group(2)).strip(), i, []
+        buf.append(line)
+    if any(s.strip() for s in buf):
+        yield Unit(rel.as_posix(), doc, article, title, start, "\n".join(buf))
+
+
+def iter_corpus_files(root: Path, patterns=DEFAULT_PATTERNS):
+    seen = set()
+    for pattern in patterns:
+        seen.update(p for p in root.rglob(pattern) if p.is_file())
+    return sorted(seen)
+
+
+# ============================================================
+# GHI SEGMENT
+# ============================================================
+def _write_array(path: Path, typecode: str, values):
+    arr = array(typecode, values)
+    if sys.byteorder != "little":
+        arr.byteswap()
+    with open(path, "wb") as f:
+        arr.tofile(f)
+
+
+def _write_segment(seg_dir: Path, unit_lines, doclens, postings: dict) -> dict:
+    """Ghi một segment từ metadata (dòng JSON bytes), độ dài và {term: [(uid, tf)]}."""
+    seg_dir.mkdir(parents=True, exist_ok=True)
+    offsets = []
+    with open(seg_dir / "units.jsonl", "wb") as f:
+        for line in unit_lines:
+            offsets.append(f.tell())
+            f.write(line)
+
+    lexicon = bytearray()
+    lex_idx = array("I")
+    post = array("I")
+    for term in sorted(postings):
+        encoded = term.encode("utf-8")
+        lex_idx.extend((len(lexicon), len(encoded), len(post) // 2, len(postings[term])))
+        lexicon += encoded
+        for uid, n in postings[term]:
+            post.extend((uid, n))
+    (seg_dir / "lexicon.bin").write_bytes(bytes(lexicon))
+    _write_array(seg_dir / "lexicon.idx", "I", lex_idx)
+    _write_array(seg_dir / "postings.bin", "I", post)
+    _write_array(seg_dir / "doclens.bin", "I", doclens)
+    _write_array(seg_dir / "units.idx", "Q", offsets)
+
+    meta = {
+        "index_version": INDEX_VERSION,
+        "units": len(doclens),
+        "terms": len(postings),
+        "total_len": sum(doclens),
+    }
+    with open(seg_dir / "meta.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=1)
+    return meta
+
+
+def write_segment(units, seg_dir) -> dict:
+    """Tokenize danh sách Unit và ghi thành một segment."""
+    postings = {}   # term → [(unit id, tf)]
+    doclens = []
+    lines = []
+    for uid, unit in enumerate(units):
+        tokens = tokenize(unit.text)
+        doclens.append(len(tokens))
+        tf = {}
+        for t in tokens:
+            tf[t] = tf.get(t, 0) + 1
+        for t, n in tf.items():
+            postings.setdefault(t, []).append((uid, n))
+        meta = unit._asdict()
+        del meta["text"]
+        lines.append(json.dumps(meta, ensure_ascii=False).encode("utf-8") + b"\n")
+    return _write_segment(Path(seg_dir), lines, doclens, postings)
+
+
+# ============================================================
+# MANIFEST SEGMENT + KHÓA GHI
+# ============================================================
+class _IndexLock:
+    """Khóa file đơn giản: mỗi lúc chỉ một tiến trình sửa chỉ mục (update/merge)."""
+
+    def __init__(self, index_dir: Path, timeout: float = 600, stale: float = 1800):
+        self.path = index_dir / LOCK_NAME
+        self.timeout = timeout
+        self.stale = stale
+
+    def __enter__(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, str(os.getpid()).encode())
+                os.close(fd)
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - self.path.stat().st_mtime > self.stale:
+                        self.path.unlink()  # khóa của tiến trình đã chết
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Chỉ mục đang bị khóa: {self.path}")
+                time.sleep(0.05)
+
+    def __exit__(self, *exc):
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _new_manifest(root) -> dict:
+    return {"index_version": INDEX_VERSION, "root": str(Path(root).resolve()),
+            "next_segment": 1, "segments": [], "files": {}, "garbage": []}
+
+
+def load_index_manifest(index_dir) -> dict:
+    with open(Path(index_dir) / MANIFEST_NAME, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_index_manifest(index_dir: Path, manifest: dict):
+    tmp = index_dir / (MANIFEST_NAME + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp, index_dir / MANIFEST_NAME)
+
+
+def _allocate_segment(manifest: dict) -> str:
+    name = f"seg-{manifest['next_segment']:06d}"
+    manifest["next_segment"] += 1
+    return name
+
+
+def _collect_garbage(index_dir: Path, manifest: dict):
+    """Xóa thư mục segment không còn dùng (trên Windows có thể còn bị mmap — để lần sau)."""
+    remaining = []
+    for name in manifest.get("garbage", []):
+        try:
+            shutil.rmtree(index_dir / name)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            remaining.append(name)
+    manifest["garbage"] = remaining
+
+
+def _file_stat_entry(path: Path) -> dict:
+    st = path.stat()
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": h.hexdigest()}
+
+
+def _rel_key(path, root: Path) -> str:
+    """Khóa của file trong manifest: đường dẫn tương đối tới root (nếu nằm trong root)."""
+    path = Path(path)
+    path = (path if path.is_absolute() else root / path).resolve()
+    try:
+        return path.relative_to(root).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def _within_root(paths, root: Path):
+    """Đường dẫn do người gọi truyền vào → tuyệt đối (theo thư mục hiện tại), kiểm tra nằm trong root."""
+    if paths is None:
+        return None
+    resolved = [Path(p).resolve() for p in paths]
+    outside = [str(p) for p in resolved if not p.is_relative_to(root)]
+    if outside:
+        raise ValueError(f"File nằm ngoài gốc chỉ mục {root}: {', '.join(outside)}")
+    return resolved
+
+
+# ============================================================
+# BUILD / UPDATE / MERGE
+# ============================================================
+def build_index(root, index_dir=None, patterns=DEFAULT_PATTERNS) -> dict:
+    """Build lại toàn bộ: quét kho Markdown dưới root, ghi chỉ mục một segment
+    (mặc định root/.search-index)."""
+    root = Path(root).resolve()
+    index_dir = Path(index_dir) if index_dir else root / DEFAULT_INDEX_DIR
+    index_dir.mkdir(parents=True, exist_ok=True)
+    with _IndexLock(index_dir):
+        try:
+            old = load_index_manifest(index_dir)
+        except (OSError, ValueError):
+            old = None
+        manifest = _new_manifest(root)
+        if old:
+            manifest["next_segment"] = old.get("next_segment", 1)
+            manifest["garbage"] = old.get("garbage", []) + [s["name"] for s in old.get("segments", [])]
+        stats = _add_files(index_dir, manifest, root, iter_corpus_files(root, patterns))
+        _collect_garbage(index_dir, manifest)
+        _save_index_manifest(index_dir, manifest)
+    stats["files"] = len(manifest["files"])
+    return stats
+
+
+def _add_files(index_dir: Path, manifest: dict, root: Path, paths) -> dict:
+    """Ghi một segment mới cho các file (đã tồn tại) và cập nhật manifest."""
+    units = []
+    entries = {}
+    for path in paths:
+        key = _rel_key(path, root)
+        entry = _file_stat_entry(path)
+        text = path.read_text(encoding="utf-8")
+        file_units = list(split_articles(text, key))
+        entry["first"], entry["count"] = len(units), len(file_units)
+        units.extend(file_units)
+        entries[key] = entry
+    for key in entries:
+        _delete_file(manifest, key)
+    if units:
+        name = _allocate_segment(manifest)
+        meta = write_segment(units, index_dir / name)
+        manifest["segments"].append({"name": name, "units": meta["units"], "deleted": []})
+        for key, entry in entries.items():
+            entry["segment"] = name
+            manifest["files"][key] = entry
+    else:
+        meta = {"units": 0, "terms": 0}
+    return {"files_indexed": len(entries), "units": meta["units"], "terms": meta["terms"]}
+
+
+def _delete_file(manifest: dict, key: str) -> bool:
+    """Đánh dấu xóa (tombstone) các Điều của file trong segment đang chứa nó."""
+    entry = manifest["files"].pop(key, None)
+    if entry is None:
+        return False
+    for seg in manifest["segments"]:
+        if seg["name"] == entry.get("segment"):
+            deleted = set(seg["deleted"])
+            deleted.update(range(entry["first"], entry["first"] + entry["count"]))
+            seg["deleted"] = sorted(deleted)
+            if len(deleted) >= seg["units"]:  # segment không còn Điều nào → bỏ luôn
+                manifest["segments"].remove(seg)
+                manifest.setdefault("garbage", []).append(seg["name"])
+            break
+    return True
+
+
+def update_index(index_dir, root=None, changed=None, removed=None,
+                 patterns=DEFAULT_PATTERNS, background_merge: bool = True) -> dict:
+    """Cập nhật tăng dần.
+
+    changed/removed: danh sách file Markdown đã ghi/xóa (vd từ convert_word_to_md);
+    đường dẫn tương đối tính từ thư mục hiện tại, phải nằm trong root của chỉ mục
+    (ngoài root → ValueError).
+    Không truyền changed → tự quét root theo patterns (cộng các file đã có trong
+    manifest), so mtime/size rồi SHA-256 để tìm file mới/đã sửa/đã xóa.
+    Chỉ file thay đổi được tokenize, ghi vào một segment mới; sau đó (nếu cần)
+    gộp segment ở process nền.
+    """
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+    with _IndexLock(index_dir):
+        try:
+            manifest = load_index_manifest(index_dir)
+        except (OSError, ValueError):
+            manifest = _new_manifest(root or index_dir.parent)
+        root = Path(manifest["root"])
+        files = manifest["files"]
+        changed = _within_root(changed, root)
+        removed = _within_root(removed, root)
+
+        if changed is None:
+            present = {_rel_key(p, root): p for p in iter_corpus_files(root, patterns)}
+            for key in files:  # file được thêm tường minh (vd .md do converter ghi)
+                path = Path(key) if Path(key).is_absolute() else root / key
+                if key not in present and path.is_file():
+                    present[key] = path
+            changed = []
+            for key, path in present.items():
+                old = files.get(key)
+                if old is not None:
+                    st = path.stat()
+                    if old["mtime_ns"] == st.st_mtime_ns and old["size"] == st.st_size:
+                        continue
+                    if _file_stat_entry(path)["sha256"] == old["sha256"]:
+                        old["mtime_ns"], old["size"] = st.st_mtime_ns, st.st_size
+                        continue
+                changed.append(path)
+            removed = [k for k in files if k not in present] if removed is None else removed
+
+        removed_count = sum(_delete_file(manifest, _rel_key(p, root)) for p in (removed or ()))
+        changed = [Path(p) for p in changed if Path(p).is_file()]
+        stats = _add_files(index_dir, manifest, root, changed)
+        stats["files_removed"] = removed_count
+        _collect_garbage(index_dir, manifest)
+        _save_index_manifest(index_dir, manifest)
+        needs_merge = _merge_candidates(manifest) is not None
+
+    if needs_merge and background_merge:
+        merge_in_background(index_dir)
+    stats["merge_scheduled"] = needs_merge and background_merge
+    return stats
+
+
+def _merge_candidates(manifest: dict):
+    """Tên các segment nên gộp, hoặc None."""
+    segs = manifest["segments"]
+    dirty = [s for s in segs if s["units"] and len(s["deleted"]) / s["units"] > MAX_DELETED_RATIO]
+    chosen = {s["name"] for s in dirty}
+    if len(segs) > MAX_SEGMENTS:
+        by_size = sorted(segs, key=lambda s: s["units"] - len(s["deleted"]))
+        chosen.update(s["name"] for s in by_size[:max(MERGE_FACTOR, len(segs) - MAX_SEGMENTS + 1)])
+    if len(chosen) < 2 and not dirty:
+        return None
+    return [s["name"] for s in segs if s["name"] in chosen]  # giữ thứ tự cũ
+
+
+def merge_segments(index_dir, force: bool = False) -> dict:
+    """Gộp segment theo chính sách ở trên (force=True: gộp tất cả thành một).
+
+    Gộp từ chính posting đã lưu (không đọc lại Markdown): bỏ Điều đã xóa,
+    đánh lại unit id, ghép danh sách posting theo term.
+    """
+    index_dir = Path(index_dir)
+    with _IndexLock(index_dir):
+        manifest = load_index_manifest(index_dir)
+        names = [s["name"] for s in manifest["segments"]] if force else _merge_candidates(manifest)
+        if not names:
+            return {"merged": 0}
+        by_name = {s["name"]: s for s in manifest["segments"]}
+        postings, doclens, lines = {}, [], []
+        remap = {}  # (segment, uid cũ) → uid mới
+        for name in names:
+            deleted = set(by_name[name]["deleted"])
+            seg = IndexSegment(index_dir / name)
+            try:
+                local = {}
+                for uid in range(seg.meta["units"]):
+                    if uid in deleted:
+                        continue
+                    local[uid] = len(doclens)
+                    doclens.append(seg.doclens[uid])
+                    lines.append(seg.unit_line(uid))
+                for i in range(seg.term_count):
+                    plist = seg.postings_at(i)
+                    kept = [(local[plist[j]], plist[j + 1]) for j in range(0, len(plist), 2)
+                            if plist[j] in local]
+                    plist.release()
+                    if kept:
+                        postings.setdefault(seg.term_at(i), []).extend(kept)
+                remap[name] = local
+            finally:
+                seg.close()
+
+        new_name = _allocate_segment(manifest)
+        meta = _write_segment(index_dir / new_name, lines, doclens, postings)
+        merged = {"name": new_name, "units": meta["units"], "deleted": []}
+        first = manifest["segments"].index(by_name[names[0]])
+        manifest["segments"] = [s for s in manifest["segments"] if s["name"] not in remap]
+        manifest["segments"].insert(first, merged)
+        for entry in manifest["files"].values():
+            local = remap.get(entry["segment"])
+            if local is not None:
+                entry["segment"] = new_name
+                entry["first"] = local[entry["first"]] if entry["count"] else 0
+        manifest["garbage"] = manifest.get("garbage", []) + names
+        _collect_garbage(index_dir, manifest)
+        _save_index_manifest(index_dir, manifest)
+    return {"merged": len(names), "segment": new_name, "units": meta["units"]}
+
+
+def merge_in_background(index_dir):
+    """Chạy merge ở process riêng, không chờ (CLI convert/update trả về ngay)."""
+    kwargs = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+    if os.name == "nt":
+        kwargs["creationflags"] = getattr(subprocess, "DETACHED_PROCESS", 0)
+    else:
+        kwargs["start_new_session"] = True
+    subprocess.Popen([sys.executable, str(Path(__file__).resolve()), "merge", "-i", str(index_dir)], **kwargs)
+
+
+# ============================================================
+# ĐỌC CHỈ MỤC (MMAP) VÀ TRUY VẤN
+# ============================================================
+class Hit(NamedTuple):
+    score: float
+    path: str
+    doc: str
+    article: str
+    title: str
+    line: int
+
+
+def _mmap_array(path: Path, typecode: str):
+    """Mở file mảng số nguyên qua mmap (không copy). File rỗng → mảng rỗng."""
+    if path.stat().st_size == 0:
+        return array(typecode), None
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mm).cast(typecode)
+    if sys.byteorder != "little":
+        view = array(typecode, view)
+        view.byteswap()
+    return view, mm
+
+
+class IndexSegment:
+    """Một segment đã ghi bởi write_segment, đọc qua mmap."""
+
+    def __init__(self, seg_dir):
+        self.dir = Path(seg_dir)
+        with open(self.dir / "meta.json", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self._maps = []
+        self.lexicon = self._open_bytes("lexicon.bin")
+        self.lex_idx = self._open("lexicon.idx", "I")
+        self.postings = self._open("postings.bin", "I")
+        self.doclens = self._open("doclens.bin", "I")
+        self.unit_offsets = self._open("units.idx", "Q")
+        self._units_file = open(self.dir / "units.jsonl", "rb")
+        self.term_count = len(self.lex_idx) // 4
+
+    def _open(self, name, typecode):
+        view, mm = _mmap_array(self.dir / name, typecode)
+        if mm is not None:
+            self._maps.append(mm)
+        return view
+
+    def _open_bytes(self, name):
+        path = self.dir / name
+        if path.stat().st_size == 0:
+            return b""
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mm)
+        return mm
+
+    def term_at(self, i: int) -> str:
+        off, length = self.lex_idx[4 * i], self.lex_idx[4 * i + 1]
+        return self.lexicon[off:off + length].decode("utf-8")
+
+    def postings_at(self, i: int):
+        start, count = self.lex_idx[4 * i + 2], self.lex_idx[4 * i + 3]
+        return self.postings[2 * start:2 * (start + count)]
+
+    def lookup(self, term: str):
+        """Danh sách posting (memoryview uint32: uid, tf, uid, tf...) của term, hoặc None."""
+        lo, hi = 0, self.term_count
+        while lo < hi:  # tìm nhị phân trên lexicon đã sắp xếp
+            mid = (lo + hi) // 2
+            if self.term_at(mid) < term:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == self.term_count or self.term_at(lo) != term:
+            return None
+        return self.postings_at(lo)
+
+    def unit_line(self, uid: int) -> bytes:
+        self._units_file.seek(self.unit_offsets[uid])
+        return self._units_file.readline()
+
+    def unit(self, uid: int) -> dict:
+        return json.loads(self.unit_line(uid))
+
+    def close(self):
+        self._units_file.close()
+        for view in (self.lex_idx, self.postings, self.doclens, self.unit_offsets):
+            if isinstance(view, memoryview):
+                view.release()
+        for mm in self._maps:
+            try:
+                mm.close()
+            except BufferError:
+                pass  # còn view posting đang dùng — mmap tự đóng khi view được thu hồi
+        self._maps = []
+
+
+class SearchIndex:
+    """Truy vấn BM25 trên chỉ mục đã build (mọi segment đang dùng).
+
+    Thống kê BM25 (số Điều, độ dài trung bình, df) tính trên các Điều còn
+    hiệu lực của tất cả segment, nên kết quả giống như build lại từ đầu.
+    """
+
+    def __init__(self, index_dir=None):
+        self.dir = Path(index_dir or SCRIPT_DIR / DEFAULT_INDEX_DIR)
+        self.manifest = load_index_manifest(self.dir)
+        self.segments = []
+        self.deleted = []
+        total_len = 0
+        self.n_units = 0
+        for seg_info in self.manifest["segments"]:
+            seg = IndexSegment(self.dir / seg_info["name"])
+            deleted = frozenset(seg_info["deleted"])
+            self.segments.append(seg)
+            self.deleted.append(deleted)
+            self.n_units += seg.meta["units"] - len(deleted)
+            total_len += seg.meta["total_len"] - sum(seg.doclens[u] for u in deleted)
+        self.avgdl = (total_len / self.n_units) if self.n_units else 0.0
+
+    def search(self, query: str, k: int = 10) -> list:
+        """Top-k Điều theo điểm BM25."""
+        scores = {}
+        for term in set(tokenize(query)):
+            found = []
+            df = 0
+            for s, seg in enumerate(self.segments):
+                plist = seg.lookup(term)
+                if plist is None:
+                    continue
+                deleted = self.deleted[s]
+                live = [(plist[j], plist[j + 1]) for j in range(0, len(plist), 2)
+                        if plist[j] not in deleted]
+                df += len(live)
+                found.append((s, live))
+            if not df:
+                continue
+            idf = math.log(1 + (self.n_units - df + 0.5) / (df + 0.5))
+            for s, live in found:
+                doclens = self.segments[s].doclens
+                for uid, tf in live:
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * doclens[uid] / self.avgdl)
+                    key = (s, uid)
+                    scores[key] = scores.get(key, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+        top = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0][0], -item[0][1]))
+        hits = []
+        for (s, uid), score in top:
+            u = self.segments[s].unit(uid)
+            hits.append(Hit(round(score, 4), u["path"], u["doc"], u["article"], u["title"], u["line"]))
+        return hits
+
+    def close(self):
+        for seg in self.segments:
+            seg.close()
+        self.segments = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _print_hits(hits, root: Path):
+    if not hits:
+        print("⚠️ Không tìm thấy kết quả")
+        return
+    for rank, h in enumerate(hits, 1):
+        where = f"Điều {h.article}. {h.title}" if h.article else h.title
+        print(f"{rank:>2}. [{h.score:.2f}] {h.doc} — {where}")
+        print(f"     {root / h.path}:{h.line}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chỉ mục tìm kiếm văn bản pháp quy")
+    sub = parser.add_subparsers(dest="command", required=True)
+    default_index = str(SCRIPT_DIR / DEFAULT_INDEX_DIR)
+    p_build = sub.add_parser("build", help="Build lại toàn bộ chỉ mục từ kho Markdown")
+    p_build.add_argument("root", nargs="?", default=str(SCRIPT_DIR), help="Thư mục gốc kho văn bản")
+    p_build.add_argument("-o", "--index", help=f"Thư mục chỉ mục (mặc định <root>/{DEFAULT_INDEX_DIR})")
+    p_update = sub.add_parser("update", help="Chỉ index lại file mới/đã sửa, bỏ file đã xóa")
+    p_update.add_argument("-i", "--index", default=default_index, help="Thư mục chỉ mục")
+    p_update.add_argument("files", nargs="*", help="File .md đã thay đổi (bỏ trống = tự quét kho)")
+    p_merge = sub.add_parser("merge", help="Gộp segment")
+    p_merge.add_argument("-i", "--index", default=default_index, help="Thư mục chỉ mục")
+    p_merge.add_argument("--all", action="store_true", help="Gộp tất cả thành một segment")
+    p_query = sub.add_parser("query", help="Tìm kiếm")
+    p_query.add_argument("text", help="Nội dung cần tìm (có dấu hoặc không dấu)")
+    p_query.add_argument("-k", type=int, default=10, help="Số kết quả (mặc định 10)")
+    p_query.add_argument("-i", "--index", default=default_index, help="Thư mục chỉ mục")
+    args = parser.parse_args()
+
+    if args.command != "build" and not os.path.isfile(os.path.join(args.index, MANIFEST_NAME)):
+        print(f"❌ Chưa có chỉ mục tại {args.index} — chạy: python search_index.py build")
+        sys.exit(1)
+    if args.command == "build":
+        stats = build_index(args.root, args.index)
+        print(f"✅ Đã index {stats['files']} file, {stats['units']} Điều/đoạn, {stats['terms']} term")
+    elif args.command == "update":
+        try:
+            stats = update_index(args.index, changed=args.files or None,
+                                 removed=[] if args.files else None)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"✅ Index lại {stats['files_indexed']} file ({stats['units']} Điều/đoạn), "
+              f"bỏ {stats['files_removed']} file")
+        if stats["merge_scheduled"]:
+            print("🔄 Đang gộp segment ở nền")
+    elif args.command == "merge":
+        stats = merge_segments(args.index, force=args.all)
+        if stats["merged"]:
+            print(f"✅ Đã gộp {stats['merged']} segment → {stats['segment']} ({stats['units']} Điều/đoạn)")
+        else:
+            print("✅ Không cần gộp")
+    else:
+        with SearchIndex(args.index) as index:
+            root = Path(index.manifest.get("root", "."))
+            _print_hits(index.search(args.text, args.k), root)
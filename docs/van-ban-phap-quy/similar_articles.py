@@ -0,0 +1,558 @@
+"""
+Gợi ý "Điều liên quan" cho kho văn bản pháp quy — chạy offline, không gọi Gemini API
+
+Khi soạn thảo, xem ngay các quy định gần nghĩa ở NĐ 30/2020, TT 01/2011,
+TT 01/2019, Luật Lưu trữ 2011/2024...: mỗi Điều (như search_index.split_articles)
+thành một vector TF-IDF thưa (tf log, idf làm trơn, chuẩn hóa L2) trên âm tiết
+đã bỏ dấu + bigram (search_index.tokenize), rồi nén bằng LSA (SVD ngẫu nhiên
+trên ma trận thưa) thành vector dày --dims chiều.
+
+Tra top-k là nhân ma trận theo lô: (m truy vấn × dims) @ (dims × số Điều),
+chia khối để bộ nhớ giới hạn, chọn top-k bằng argpartition — hàng nghìn
+truy vấn (vd gợi ý cho mọi Điều trong kho) chạy trong một lần gọi.
+--dims 0: bỏ LSA, tính cosine trực tiếp trên TF-IDF thưa (khớp từ chính xác hơn,
+không bắt được từ đồng nghĩa).
+
+Toàn bộ lưu trong một file .npz (không pickle):
+    meta            JSON: phiên bản, thư mục gốc, tham số, thống kê, số hiệu từng văn bản
+    units           JSON lines: path, doc, article, title, line của từng Điều
+    terms           các term nối bằng "\\n" (UTF-8)
+    idf             float32[số term]
+    indptr/indices/data   ma trận TF-IDF dạng CSR (số Điều × số term)
+    components      float32[dims × số term] — chiếu truy vấn mới vào không gian LSA
+    embeddings      float32[số Điều × dims] — vector LSA đã chuẩn hóa
+
+Cách dùng:
+    python similar_articles.py build                                  # quét thư mục chứa script
+    python similar_articles.py build "docs/van-ban-phap-quy" -o vectors.npz --dims 200
+    python similar_articles.py similar "30-2020-ND-CP:8" -k 5
+    python similar_articles.py similar "30/2020/NĐ-CP#dieu-8" "01/2011/QH13#dieu-5.khoan-1"   # khóa node như citation_graph
+    python similar_articles.py similar "30/2020/NĐ-CP Điều 8" "luat-luu-tru-2024:12" --other-docs
+    python similar_articles.py text "lập hồ sơ điện tử" -k 10
+    python similar_articles.py all -o goi-y.jsonl -k 10 --other-docs   # mọi Điều, một lần nhân ma trận
+
+    from similar_articles import SimilarArticles
+    index = SimilarArticles.load()
+    ids, scores = index.similar(range(index.n_units), k=5)
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:
+    print("❌ Cần cài numpy:")
+    print("   pip install numpy")
+    sys.exit(1)
+
+from search_index import split_articles, iter_corpus_files, tokenize, fold, DEFAULT_PATTERNS
+from citation_graph import _doc_number_of
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_INDEX_FILE = ".similar-articles.npz"
+INDEX_VERSION = 1
+DEFAULT_DIMS = 128
+DEFAULT_MIN_DF = 2          # term chỉ có ở một Điều không góp vào độ giống giữa hai Điều
+SVD_OVERSAMPLE = 10
+SVD_POWER_ITER = 2
+BATCH_CELLS = 1 << 23       # số ô điểm (truy vấn × Điều) mỗi khối nhân ma trận
+DENSE_BLOCK_CELLS = 1 << 22 # số ô khi dựng một khối hàng CSR thành ma trận dày
+DENSE_MIN_FILL = 0.004      # tỉ lệ phần tử khác 0 tối thiểu để nhân qua khối dày (BLAS)
+POSTING_CELLS = 1 << 21     # số phần tử posting mở rộng tối đa mỗi khối (--dims 0, cộng dồn posting)
+POSTING_COST = 32           # một phần tử posting mở rộng ≈ bấy nhiêu phép nhân-cộng BLAS
+
+
+# ============================================================
+# MA TRẬN THƯA (CSR) BẰNG NUMPY
+# ============================================================
+def _row_ids(indptr):
+    return np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+
+
+def _scatter_product(src, dst, data, dense, n_out):
+    """out[dst] += data * dense[src] theo từng cột (bincount) — cho ma trận rất thưa."""
+    columns = np.ascontiguousarray(dense.T)
+    out = np.empty((columns.shape[0], n_out), dtype=np.float32)
+    for c, column in enumerate(columns):
+        out[c] = np.bincount(dst, weights=data * column[src], minlength=n_out)
+    return out.T
+
+
+def _dense_blocks(indptr, indices, data, n_cols):
+    """Lần lượt dựng từng khối hàng CSR thành ma trận dày: (hàng đầu, hàng cuối, khối)."""
+    n_rows = len(indptr) - 1
+    step = max(1, DENSE_BLOCK_CELLS // max(n_cols, 1))
+    for lo in range(0, n_rows, step):
+        hi = min(n_rows, lo + step)
+        a, b = indptr[lo], indptr[hi]
+        block = np.zeros((hi - lo, n_cols), dtype=np.float32)
+        block[_row_ids(indptr[lo:hi + 1]), indices[a:b]] = data[a:b]
+        yield lo, hi, block
+
+
+def _csr_dot(csr, dense, n_cols, transpose=False):
+    """CSR (n_rows × n_cols) @ dense, hoặc CSR.T @ dense — nhân ma trận thưa × dày, không cần scipy.
+
+    Ma trận đủ dày (≥ DENSE_MIN_FILL): nhân từng khối hàng đã dựng dày bằng
+    BLAS — nhanh hơn nhiều lần so với gom phần tử; rất thưa: bincount từng cột.
+    """
+    indptr, indices, data = csr
+    n_rows = len(indptr) - 1
+    dense = np.asarray(dense, dtype=np.float32)
+    if len(data) < DENSE_MIN_FILL * n_rows * n_cols:
+        rows = _row_ids(indptr)
+        if transpose:
+            return _scatter_product(rows, indices, data, dense, n_cols)
+        return _scatter_product(indices, rows, data, dense, n_rows)
+    if transpose:
+        out = np.zeros((n_cols, dense.shape[1]), dtype=np.float32)
+        for lo, hi, block in _dense_blocks(indptr, indices, data, n_cols):
+            out += block.T @ dense[lo:hi]
+    else:
+        out = np.empty((n_rows, dense.shape[1]), dtype=np.float32)
+        for lo, hi, block in _dense_blocks(indptr, indices, data, n_cols):
+            out[lo:hi] = block @ dense
+    return out
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _randomized_svd(csr, n_terms, dims, seed=0):
+    """Các thành phần chính (dims × n_terms) của ma trận CSR — SVD ngẫu nhiên (Halko và cs.)."""
+    n_rows = len(csr[0]) - 1
+    width = min(dims + SVD_OVERSAMPLE, n_rows, n_terms)
+    rng = np.random.default_rng(seed)
+    q, _ = np.linalg.qr(_csr_dot(csr, rng.standard_normal((n_terms, width)), n_terms))
+    for _ in range(SVD_POWER_ITER):
+        z, _ = np.linalg.qr(_csr_dot(csr, q, n_terms, transpose=True))
+        q, _ = np.linalg.qr(_csr_dot(csr, z, n_terms))
+    b = _csr_dot(csr, q, n_terms, transpose=True).T          # width × n_terms
+    _, sigma, vt = np.linalg.svd(b, full_matrices=False)
+    k = min(dims, width)
+    return vt[:k], sigma[:k]
+
+
+def _top_k(scores, k):
+    """Top-k mỗi hàng: (chỉ số, điểm), điểm giảm dần."""
+    k = min(k, scores.shape[1])
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
+
+
+def _pack_lines(lines) -> np.ndarray:
+    return np.frombuffer("\n".join(lines).encode("utf-8"), dtype=np.uint8)
+
+
+def _unpack_lines(array) -> list:
+    text = array.tobytes().decode("utf-8")
+    return text.split("\n") if text else []
+
+
+# ============================================================
+# CHỈ MỤC
+# ============================================================
+class SimilarArticles:
+    """Vector TF-IDF/LSA của mọi Điều trong kho, tra top-k theo lô."""
+
+    def __init__(self, units, terms, idf, indptr, indices, data, components=None, embeddings=None, meta=None):
+        self.units = units                  # [dict path/doc/article/title/line]
+        self.terms = terms
+        self.vocab = {t: i for i, t in enumerate(terms)}
+        self.idf = idf
+        self.indptr, self.indices, self.data = indptr, indices, data
+        self.components = components
+        self.embeddings = embeddings
+        self.meta = meta or {}
+        docs = {}
+        self.doc_ids = np.array([docs.setdefault(u["doc"], len(docs)) for u in units], dtype=np.int32)
+        self._postings = None
+
+    @property
+    def n_units(self) -> int:
+        return len(self.units)
+
+    @property
+    def dims(self) -> int:
+        return 0 if self.components is None else self.components.shape[0]
+
+    # ── build ──
+    @classmethod
+    def build(cls, units, dims: int = DEFAULT_DIMS, min_df: int = DEFAULT_MIN_DF, seed: int = 0):
+        """Vector hóa danh sách search_index.Unit."""
+        vocab = {}
+        indptr, indices, counts = [0], [], []
+        for unit in units:
+            tf = Counter(tokenize(unit.text))
+            indices.extend(vocab.setdefault(term, len(vocab)) for term in tf)
+            counts.extend(tf.values())
+            indptr.append(len(indices))
+        indptr = np.array(indptr, dtype=np.int64)
+        indices = np.array(indices, dtype=np.int64)
+        counts = np.array(counts, dtype=np.float64)
+
+        # bỏ term hiếm, đánh số lại term còn giữ
+        df = np.bincount(indices, minlength=len(vocab))
+        keep = df >= min_df
+        remap = np.cumsum(keep) - 1
+        kept = keep[indices]
+        rows = _row_ids(indptr)[kept]
+        indices, counts = remap[indices[kept]].astype(np.int32), counts[kept]
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=len(units))))).astype(np.int64)
+        terms = [t for t, i in sorted(vocab.items(), key=lambda kv: kv[1]) if keep[i]]
+
+        n = len(units)
+        idf = (np.log((1 + n) / (1 + df[keep])) + 1).astype(np.float32)
+        data = cls._weigh(indptr, indices, counts, idf)
+
+        components = embeddings = None
+        if dims > 0 and len(terms) and n:
+            csr = (indptr, indices, data)
+            components, _ = _randomized_svd(csr, len(terms), dims, seed)
+            components = components.astype(np.float32)
+            embeddings = _normalize_rows(_csr_dot(csr, components.T, len(terms)))
+        meta = {"index_version": INDEX_VERSION, "units": n, "terms": len(terms), "nnz": int(len(data)),
+                "dims": 0 if components is None else int(components.shape[0]), "min_df": min_df, "seed": seed}
+        unit_dicts = [{"path": u.path, "doc": u.doc, "article": u.article, "title": u.title, "line": u.line}
+                      for u in units]
+        return cls(unit_dicts, terms, idf, indptr, indices, data.astype(np.float32), components, embeddings, meta)
+
+    @staticmethod
+    def _weigh(indptr, indices, counts, idf):
+        """tf → (1 + log tf) · idf, chuẩn hóa L2 từng hàng."""
+        data = (1 + np.log(counts)) * idf[indices]
+        rows = _row_ids(indptr)
+        norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=len(indptr) - 1))
+        norms[norms == 0] = 1.0
+        return data / norms[rows]
+
+    # ── lưu / đọc ──
+    def save(self, path):
+        path = Path(path)
+        arrays = {
+            "meta": _pack_lines([json.dumps(self.meta, ensure_ascii=False)]),
+            "units": _pack_lines(json.dumps(u, ensure_ascii=False) for u in self.units),
+            "terms": _pack_lines(self.terms),
+            "idf": self.idf, "indptr": self.indptr, "indices": self.indices, "data": self.data,
+        }
+        if self.components is not None:
+            arrays["components"] = self.components
+            arrays["embeddings"] = self.embeddings
+        tmp = path.with_name(path.name + ".tmp.npz")
+        np.savez_compressed(tmp, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=None):
+        path = Path(path or SCRIPT_DIR / DEFAULT_INDEX_FILE)
+        with np.load(path, allow_pickle=False) as z:
+            meta = json.loads(_unpack_lines(z["meta"])[0])
+            if meta.get("index_version") != INDEX_VERSION:
+                raise ValueError(f"{path}: phiên bản chỉ mục {meta.get('index_version')} ≠ {INDEX_VERSION} "
+                                 f"— chạy lại: python similar_articles.py build")
+            units = [json.loads(line) for line in _unpack_lines(z["units"])]
+            components = z["components"] if "components" in z.files else None
+            embeddings = z["embeddings"] if "embeddings" in z.files else None
+            return cls(units, _unpack_lines(z["terms"]), z["idf"], z["indptr"], z["indices"], z["data"],
+                       components, embeddings, meta)
+
+    # ── vector truy vấn ──
+    def vectorize(self, texts):
+        """Văn bản tự do → CSR (indptr, indices, data) theo từ điển và idf của chỉ mục."""
+        indptr, indices, counts = [0], [], []
+        for text in texts:
+            tf = {}
+            for term in tokenize(text):
+                i = self.vocab.get(term)
+                if i is not None:
+                    tf[i] = tf.get(i, 0) + 1
+            indices.extend(tf)
+            counts.extend(tf.values())
+            indptr.append(len(indices))
+        indptr = np.array(indptr, dtype=np.int64)
+        indices = np.array(indices, dtype=np.int32)
+        return indptr, indices, self._weigh(indptr, indices, np.array(counts, dtype=np.float64), self.idf)
+
+    def _unit_rows(self, uids):
+        """Các hàng của ma trận TF-IDF → CSR con."""
+        starts, ends = self.indptr[uids], self.indptr[np.asarray(uids) + 1]
+        lengths = ends - starts
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        take = np.repeat(starts - indptr[:-1], lengths) + np.arange(indptr[-1])
+        return indptr, self.indices[take], self.data[take]
+
+    # ── top-k ──
+    def _scores_lsa(self, queries):
+        return queries @ self.embeddings.T
+
+    def _posting_lists(self):
+        """(ptr, Điều, trọng số) theo term — ma trận TF-IDF chuyển vị, dựng lần đầu cần."""
+        if self._postings is None:
+            order = np.argsort(self.indices, kind="stable")
+            ptr = np.concatenate(([0], np.cumsum(np.bincount(self.indices, minlength=len(self.terms)))))
+            self._postings = (ptr, _row_ids(self.indptr)[order], self.data[order])
+        return self._postings
+
+    def _sparse_plan(self, csr):
+        """Cách tính điểm cho truy vấn CSR và các khối (lo, hi) truy vấn.
+
+        Cộng dồn posting tốn bộ nhớ/thời gian theo tổng độ dài posting của các
+        term truy vấn (term phổ biến xuất hiện ở gần hết các Điều); nhân dày qua
+        BLAS tốn m × số Điều × số term. Chọn cách rẻ hơn; khối posting giới hạn
+        ở POSTING_CELLS phần tử mở rộng, khối dày ở BATCH_CELLS ô.
+        """
+        indptr, indices, _ = csr
+        m = len(indptr) - 1
+        ptr = self._posting_lists()[0]
+        work = np.bincount(_row_ids(indptr), weights=ptr[indices + 1] - ptr[indices], minlength=m)
+        n_terms = len(self.terms)
+        dense_cost = m * (self.n_units * n_terms if len(self.data) >= DENSE_MIN_FILL * self.n_units * n_terms
+                          else len(self.data))
+        dense = dense_cost <= POSTING_COST * work.sum()
+        step = max(1, BATCH_CELLS // max(self.n_units, n_terms if dense else 1))
+        chunks, lo = [], 0
+        cum = np.concatenate(([0], np.cumsum(work)))
+        while lo < m:
+            hi = min(m, lo + step)
+            if not dense:
+                hi = max(lo + 1, min(hi, int(np.searchsorted(cum, cum[lo] + POSTING_CELLS, "right")) - 1))
+            chunks.append((lo, hi))
+            lo = hi
+        return dense, chunks
+
+    def _scores_dense(self, csr):
+        """CSR truy vấn (m hàng) @ TF-IDF.T qua khối dày (BLAS) — xem _csr_dot."""
+        indptr, indices, data = csr
+        queries = np.zeros((len(indptr) - 1, len(self.terms)), dtype=np.float32)
+        queries[_row_ids(indptr), indices] = data
+        return _csr_dot((self.indptr, self.indices, self.data), queries.T, len(self.terms)).T
+
+    def _scores_sparse(self, csr):
+        """CSR truy vấn (m hàng) @ TF-IDF.T: mỗi term truy vấn cộng dồn vào các Điều chứa nó."""
+        ptr, post_rows, post_data = self._posting_lists()
+        indptr, indices, data = csr
+        m = len(indptr) - 1
+        lengths = ptr[indices + 1] - ptr[indices]
+        total = int(lengths.sum())
+        offsets = np.concatenate(([0], np.cumsum(lengths)))[:-1]
+        take = np.repeat(ptr[indices] - offsets, lengths) + np.arange(total)
+        qrows = np.repeat(_row_ids(indptr), lengths)
+        weights = np.repeat(data, lengths) * post_data[take]
+        flat = np.bincount(qrows * self.n_units + post_rows[take], weights=weights, minlength=m * self.n_units)
+        return flat.reshape(m, self.n_units)
+
+    def top_k(self, queries, k: int = 10, exclude=None, exclude_docs=None):
+        """Top-k Điều cho m truy vấn, nhân theo khối (xem _sparse_plan khi không có LSA).
+
+        queries: vector LSA (m × dims) nếu chỉ mục có LSA, ngược lại CSR
+        (indptr, indices, data) — xem vectorize/project. exclude[i]: Điều không
+        lấy cho truy vấn i (chính nó); exclude_docs[i]: bỏ mọi Điều cùng văn bản.
+        Trả về (ids m×k, scores m×k); hết kết quả (hoặc điểm ≤ 0 — không chung
+        term nào) → id -1.
+        """
+        m = len(queries) if self.dims else len(queries[0]) - 1
+        k = max(1, min(k, self.n_units))
+        ids = np.full((m, k), -1, dtype=np.int64)
+        scores = np.zeros((m, k), dtype=np.float32)
+        if not m or not self.n_units:
+            return ids, scores
+        if self.dims:
+            step = max(1, BATCH_CELLS // self.n_units)
+            chunks = [(lo, min(m, lo + step)) for lo in range(0, m, step)]
+        else:
+            dense, chunks = self._sparse_plan(queries)
+        for lo, hi in chunks:
+            if self.dims:
+                block = self._scores_lsa(queries[lo:hi])
+            else:
+                indptr, indices, data = queries
+                sub_ptr = indptr[lo:hi + 1]
+                a, b = sub_ptr[0], sub_ptr[-1]
+                sub = (sub_ptr - a, indices[a:b], data[a:b])
+                block = (self._scores_dense(sub) if dense else self._scores_sparse(sub)).astype(np.float32)
+            if exclude_docs is not None:
+                block[self.doc_ids[None, :] == np.asarray(exclude_docs[lo:hi])[:, None]] = -np.inf
+            if exclude is not None:
+                own = np.asarray(exclude[lo:hi])
+                valid = own >= 0
+                block[np.nonzero(valid)[0], own[valid]] = -np.inf
+            top, top_scores = _top_k(block, k)
+            found = np.isfinite(top_scores) & (top_scores > 0)
+            top[~found] = -1
+            ids[lo:hi], scores[lo:hi] = top, np.where(found, top_scores, 0)
+        return ids, scores
+
+    def project(self, csr):
+        """CSR TF-IDF → dạng truy vấn của top_k (vector LSA đã chuẩn hóa, hoặc giữ nguyên CSR)."""
+        if not self.dims:
+            return csr
+        return _normalize_rows(_csr_dot(csr, self.components.T, len(self.terms)))
+
+    def similar(self, uids, k: int = 10, other_docs: bool = False):
+        """Điều gần nhất với từng Điều trong uids (không tính chính nó) — một lần gọi cho cả lô."""
+        uids = np.asarray(list(uids), dtype=np.int64)
+        queries = self.embeddings[uids] if self.dims else self._unit_rows(uids)
+        return self.top_k(queries, k, exclude=uids, exclude_docs=self.doc_ids[uids] if other_docs else None)
+
+    def search(self, texts, k: int = 10):
+        """Điều gần nhất với từng đoạn văn bản tự do (đoạn rỗng → ValueError)."""
+        texts = list(texts)
+        if any(not text.strip() for text in texts):
+            raise ValueError("Văn bản truy vấn rỗng")
+        return self.top_k(self.project(self.vectorize(texts)), k)
+
+    # ── tra Điều ──
+    def find(self, reference: str) -> int:
+        """ "30-2020-ND-CP:8", "30/2020/NĐ-CP Điều 8", "luat-luu-tru-2024#12" → chỉ số Điều.
+
+        Nhận cả khóa node của citation_graph/clause_service ("30/2020/NĐ-CP#dieu-8",
+        "...#dieu-8.khoan-2.diem-a" → Điều 8); văn bản ghi bằng thư mục hoặc số hiệu.
+        """
+        m = _REF_RE.match(reference.strip())
+        if not m:
+            raise ValueError(f"Không hiểu tham chiếu: {reference!r} "
+                             "(dạng <văn bản>#dieu-<N>, <văn bản>:<N> hoặc <văn bản> Điều <N>)")
+        doc, article = _doc_key(m.group(1)), m.group(2).lower()
+        numbers = self.meta.get("doc_numbers", {})
+        matches = [i for i, u in enumerate(self.units)
+                   if u["article"].lower() == article
+                   and doc in (_doc_key(u["doc"]), _doc_key(numbers.get(u["doc"], "")))]
+        if not matches:
+            raise ValueError(f"Không tìm thấy Điều {article} của {m.group(1)}")
+        return matches[0]
+
+
+_REF_RE = re.compile(r'^(.+?)(?:\s*[:#]\s*(?:dieu-)?|\s+Điều\s+)(\d+[a-z]?)(?:\.(?:khoan|diem)-[\w.-]+)?$',
+                     re.IGNORECASE)
+
+
+def _doc_key(text: str) -> str:
+    """"30/2020/NĐ-CP" và thư mục "30-2020-ND-CP" cùng khóa "30-2020-nd-cp"."""
+    return re.sub(r'[^a-z0-9]+', '-', fold(text)).strip('-')
+
+
+def build_similar_index(root, output=None, dims: int = DEFAULT_DIMS, min_df: int = DEFAULT_MIN_DF,
+                        patterns=DEFAULT_PATTERNS) -> SimilarArticles:
+    """Quét kho Markdown dưới root, vector hóa mọi Điều, ghi .npz (mặc định root/.similar-articles.npz)."""
+    root = Path(root).resolve()
+    units, numbers = [], {}
+    for path in iter_corpus_files(root, patterns):
+        units.extend(split_articles(path.read_text(encoding="utf-8"), path.relative_to(root).as_posix()))
+        folder = path.parent.parent if path.parent.name == "phu-luc" else path.parent
+        if folder != root and folder.name not in numbers:
+            numbers[folder.name] = _doc_number_of(folder)
+    index = SimilarArticles.build(units, dims, min_df)
+    index.meta["root"] = str(root)
+    # số hiệu ("30/2020/NĐ-CP") của từng thư mục văn bản — để find() nhận khóa node
+    index.meta["doc_numbers"] = {label: number for label, number in numbers.items() if number}
+    index.save(output or root / DEFAULT_INDEX_FILE)
+    return index
+
+
+# ============================================================
+# MAIN
+# ============================================================
+def _describe(unit) -> str:
+    where = f"Điều {unit['article']}. {unit['title']}" if unit["article"] else unit["title"]
+    return f"{unit['doc']} — {where}"
+
+
+def _print_neighbors(index, ids, scores, root):
+    if not (ids >= 0).any():
+        print("⚠️ Không tìm thấy kết quả")
+        return
+    for rank, (uid, score) in enumerate(zip(ids, scores), 1):
+        if uid < 0:
+            break
+        unit = index.units[uid]
+        print(f"{rank:>2}. [{score:.2f}] {_describe(unit)}")
+        print(f"     {root / unit['path']}:{unit['line']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gợi ý Điều liên quan (TF-IDF/LSA, chạy offline)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    default_index = str(SCRIPT_DIR / DEFAULT_INDEX_FILE)
+    p_build = sub.add_parser("build", help="Vector hóa mọi Điều trong kho Markdown")
+    p_build.add_argument("root", nargs="?", default=str(SCRIPT_DIR), help="Thư mục gốc kho văn bản")
+    p_build.add_argument("-o", "--index", help=f"File .npz (mặc định <root>/{DEFAULT_INDEX_FILE})")
+    p_build.add_argument("--dims", type=int, default=DEFAULT_DIMS,
+                         help=f"Số chiều LSA (mặc định {DEFAULT_DIMS}; 0 = chỉ TF-IDF thưa)")
+    p_build.add_argument("--min-df", type=int, default=DEFAULT_MIN_DF,
+                         help=f"Bỏ term xuất hiện ở ít hơn N Điều (mặc định {DEFAULT_MIN_DF})")
+    p_similar = sub.add_parser("similar", help="Điều liên quan tới một hoặc nhiều Điều")
+    p_similar.add_argument("refs", nargs="+", help='Điều cần tra, vd "30-2020-ND-CP:8", "30/2020/NĐ-CP Điều 8"')
+    p_text = sub.add_parser("text", help="Điều gần nghĩa với một đoạn văn bản")
+    p_text.add_argument("text", help="Nội dung (có dấu hoặc không dấu)")
+    p_all = sub.add_parser("all", help="Gợi ý cho mọi Điều trong kho (JSON lines)")
+    p_all.add_argument("-o", "--output", help="File .jsonl (mặc định in ra stdout)")
+    for p in (p_similar, p_text, p_all):
+        p.add_argument("-k", type=int, default=10, help="Số kết quả mỗi Điều (mặc định 10)")
+        p.add_argument("-i", "--index", default=default_index, help="File .npz")
+    for p in (p_similar, p_all):
+        p.add_argument("--other-docs", action="store_true", help="Chỉ gợi ý Điều thuộc văn bản khác")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        index = build_similar_index(args.root, args.index, args.dims, args.min_df)
+        meta = index.meta
+        print(f"✅ {meta['units']} Điều/đoạn, {meta['terms']} term, {meta['nnz']} phần tử khác 0, "
+              f"LSA {meta['dims']} chiều ({time.perf_counter() - start:.1f}s)")
+        sys.exit(0)
+
+    if not os.path.isfile(args.index):
+        print(f"❌ Chưa có chỉ mục tại {args.index} — chạy: python similar_articles.py build")
+        sys.exit(1)
+    try:
+        index = SimilarArticles.load(args.index)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    root = Path(index.meta.get("root", "."))
+
+    if args.command == "similar":
+        try:
+            uids = [index.find(ref) for ref in args.refs]
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        ids, scores = index.similar(uids, args.k, args.other_docs)
+        for uid, row_ids, row_scores in zip(uids, ids, scores):
+            print(f"🔎 {_describe(index.units[uid])}")
+            _print_neighbors(index, row_ids, row_scores, root)
+    elif args.command == "text":
+        try:
+            ids, scores = index.search([args.text], args.k)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        _print_neighbors(index, ids[0], scores[0], root)
+    else:
+        start = time.perf_counter()
+        ids, scores = index.similar(range(index.n_units), args.k, args.other_docs)
+        elapsed = time.perf_counter() - start
+        out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+        try:
+            for uid, unit in enumerate(index.units):
+                similar = [{"doc": index.units[j]["doc"], "article": index.units[j]["article"],
+                            "score": round(float(s), 4)} for j, s in zip(ids[uid], scores[uid]) if j >= 0]
+                out.write(json.dumps({"doc": unit["doc"], "article": unit["article"], "similar": similar},
+                                     ensure_ascii=False) + "\n")
+        finally:
+            if args.output:
+                out.close()
+        log = sys.stdout if args.output else sys.stderr
+        print(f"✅ {index.n_units} Điều × top-{args.k} trong {elapsed * 1000:.0f} ms", file=log)
@@ -0,0 +1,156 @@
+"""
+Lưới bảng đã giải ô gộp (gridSpan/vMerge) — dùng chung cho .docx và .doc
+
+Bảng được dựng một lượt: mỗi ô gốc lưu một lần (text, rowspan, colspan), lưới
+chỉ giữ chỉ số ô gốc cho từng vị trí (dòng × cột lưới). Từ lưới này xuất ra:
+
+- Markdown, theo một trong hai cách hiển thị ô gộp:
+    once    text chỉ nằm ở ô gốc, các vị trí bị gộp để trống (mặc định);
+            mọi dòng đủ số cột lưới
+    repeat  lặp text ô gốc ở mọi vị trí bị gộp, bỏ cột gridBefore/gridAfter
+            (giống python-docx ``row.cells``, output của converter cũ)
+- CSV (mỗi dòng lưới một dòng CSV) và JSON (danh sách ô gốc kèm span).
+
+Cách dùng (trong code):
+    builder = GridBuilder(n_cols)
+    builder.start_row(grid_before)
+    builder.add_cell("text", span=2)          # gộp ngang 2 cột
+    builder.add_cell("", continues=True)      # vMerge: nối với ô phía trên
+    grid = builder.build()
+    lines = grid.markdown_lines("once")
+"""
+
+import csv
+import io
+from array import array
+
+MERGED_ONCE = "once"
+MERGED_REPEAT = "repeat"
+MERGED_MODES = (MERGED_ONCE, MERGED_REPEAT)
+EMPTY = -1
+
+
+class GridCell:
+    __slots__ = ("row", "col", "rowspan", "colspan", "text", "shown")
+
+    def __init__(self, row: int, col: int, colspan: int, text: str, shown: bool = True):
+        self.row = row
+        self.col = col
+        self.rowspan = 1
+        self.colspan = colspan
+        self.text = text
+        self.shown = shown   # False: ô nối dọc không khớp ô gốc — chỉ lặp text khi "repeat"
+
+
+class TableGrid:
+    """Bảng dạng lưới: cells = các ô gốc, slots[dòng][cột] = chỉ số ô gốc hoặc EMPTY."""
+
+    def __init__(self, n_cols: int, cells: list, slots: list):
+        self.n_cols = n_cols
+        self.cells = cells
+        self.slots = slots
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.slots)
+
+    def rows(self, merged: str = MERGED_ONCE):
+        """Sinh danh sách text ô của từng dòng theo cách hiển thị ô gộp."""
+        cells = self.cells
+        if merged == MERGED_REPEAT:
+            for slots in self.slots:
+                yield [cells[i].text for i in slots if i != EMPTY]
+            return
+        for r, slots in enumerate(self.slots):
+            out = [""] * self.n_cols
+            for c, i in enumerate(slots):
+                if i != EMPTY:
+                    cell = cells[i]
+                    if cell.row == r and cell.col == c and cell.shown:
+                        out[c] = cell.text
+            yield out
+
+    def markdown_lines(self, merged: str = MERGED_ONCE):
+        """Các dòng Markdown của bảng (dòng đầu là header), bao bởi dòng trống."""
+        rows = self.rows(merged)
+        header = next(rows, None)
+        if header is None:
+            return
+        yield ""
+        yield "| " + " | ".join(header) + " |"
+        yield "| " + " | ".join(["---"] * len(header)) + " |"
+        for cells in rows:
+            yield "| " + " | ".join(cells) + " |"
+        yield ""
+
+    def to_dict(self) -> dict:
+        """Dạng JSON gọn: kích thước lưới + các ô gốc (không lặp text ô gộp)."""
+        return {
+            "rows": self.n_rows,
+            "cols": self.n_cols,
+            "cells": [
+                {"row": c.row, "col": c.col, "rowspan": c.rowspan, "colspan": c.colspan, "text": c.text}
+                for c in self.cells if c.shown
+            ],
+        }
+
+
+class GridBuilder:
+    """Dựng TableGrid trong một lượt qua các dòng/ô, O(số vị trí lưới)."""
+
+    def __init__(self, n_cols: int = 0):
+        self.n_cols = n_cols
+        self.cells = []
+        self.slots = []
+        self._row = None
+        self._col = 0
+        self._above = {}     # cột lưới → ô gốc gần nhất phủ cột đó
+
+    def start_row(self, grid_before: int = 0):
+        self._row = array("i", [EMPTY] * grid_before)
+        self.slots.append(self._row)
+        self._col = grid_before
+
+    def add_cell(self, text: str, span: int = 1, continues: bool = False):
+        """Thêm một ô (span cột lưới); continues=True: ô nối dọc với ô phía trên."""
+        r, col = len(self.slots) - 1, self._col
+        span = max(span, 1)
+        index = None
+        shown = True
+        if continues:
+            text = ""
+            above = self._above.get(col)
+            if above is not None:
+                cell = self.cells[above]
+                if cell.col == col and cell.colspan == span and cell.row + cell.rowspan == r:
+                    cell.rowspan += 1
+                    index = above
+                else:   # lệch khung ô gốc: giữ text (cho "repeat") nhưng không hiện ở "once"
+                    text, shown = cell.text, False
+        if index is None:
+            index = len(self.cells)
+            self.cells.append(GridCell(r, col, span, text, shown))
+        self._place(index, span)
+
+    def _place(self, index: int, span: int):
+        self._row.extend([index] * span)
+        for c in range(self._col, self._col + span):
+            self._above[c] = index
+        self._col += span
+
+    def build(self) -> TableGrid:
+        n_cols = max([self.n_cols] + [len(row) for row in self.slots])
+        for row in self.slots:
+            if len(row) < n_cols:
+                row.extend([EMPTY] * (n_cols - len(row)))
+        return TableGrid(n_cols, self.cells, self.slots)
+
+
+def tables_to_csv(tables: list, merged: str = MERGED_ONCE) -> str:
+    """Nhiều bảng → một CSV: cột đầu là số thứ tự bảng (từ 1), sau đó các ô."""
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    for number, grid in enumerate(tables, 1):
+        for row in grid.rows(merged):
+            writer.writerow([number] + row)
+    return out.getvalue()
@@ -0,0 +1,240 @@
+"""
+Dựng toàn bộ icon/logo (web, Desktop, MSIX) từ manifest icon-assets.json
+
+- Mỗi master (logo "V" vẽ bằng create-favicon.py, hoặc ảnh nguồn PNG) được dựng
+  một lần rồi cache ra .icon-cache/master-<key>.png; key gồm tham số master và
+  nội dung create-favicon.py / ảnh nguồn → đổi code vẽ hoặc ảnh là tự dựng lại.
+- Mỗi kích thước cần dùng chỉ thu nhỏ một lần cho mọi target cùng master.
+- Target không đổi (cùng master key + tham số, file đầu ra còn nguyên size/mtime)
+  được bỏ qua — build release không vẽ lại.
+
+Kiểu target:
+    ico  path, sizes [16, 32, ...]                → .ico nhiều kích thước
+    png  path, size N                             → PNG vuông N×N
+    png  path, width W, height H [, scale s]      → logo cạnh min(W, H)×s đặt giữa
+                                                    nền trong suốt (Wide310x150, SplashScreen)
+
+Cách dùng:
+    python icon_assets.py                          # dựng các target đã đổi
+    python icon_assets.py --list                   # xem target nào sẽ dựng lại
+    python icon_assets.py --force --only web       # dựng lại mọi target của master "web"
+"""
+import os
+import sys
+import json
+import hashlib
+import argparse
+import importlib.util
+from pathlib import Path
+
+from PIL import Image
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_MANIFEST = SCRIPT_DIR / "icon-assets.json"
+FAVICON_SCRIPT = SCRIPT_DIR / "create-favicon.py"
+STATE_NAME = "state.json"
+PIPELINE_VERSION = 1
+
+
+def _load_favicon_module():
+    """create-favicon.py có dấu '-' trong tên nên nạp theo đường dẫn."""
+    spec = importlib.util.spec_from_file_location("create_favicon", FAVICON_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _key(*parts) -> str:
+    return _sha256(json.dumps(parts, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+
+
+class IconPipeline:
+    """Manifest → master (cache) → các kích thước → file đầu ra, bỏ qua target không đổi."""
+
+    def __init__(self, manifest_path=DEFAULT_MANIFEST):
+        self.manifest_path = Path(manifest_path)
+        self.root = self.manifest_path.parent
+        with open(self.manifest_path, encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.cache_dir = self.root / self.manifest.get("cache_dir", ".icon-cache")
+        self.masters = self.manifest.get("masters", {})
+        self.targets = self.manifest.get("targets", [])
+        self._favicon = None
+        self._master_keys = {}
+        self._master_images = {}
+        self._sized = {}            # (master, size) → Image
+        self.state = self._load_state()
+
+    # ── trạng thái ──
+    def _load_state(self):
+        try:
+            with open(self.cache_dir / STATE_NAME, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state.get("outputs", {}) if state.get("version") == PIPELINE_VERSION else {}
+
+    def _save_state(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_dir / (STATE_NAME + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": PIPELINE_VERSION, "outputs": self.state}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.cache_dir / STATE_NAME)
+
+    @property
+    def favicon(self):
+        if self._favicon is None:
+            self._favicon = _load_favicon_module()
+        return self._favicon
+
+    # ── master ──
+    def master_key(self, name):
+        key = self._master_keys.get(name)
+        if key is None:
+            spec = self.masters[name]
+            if "source" in spec:
+                code = _sha256((self.root / spec["source"]).read_bytes())
+            else:
+                code = _sha256(FAVICON_SCRIPT.read_bytes())
+            key = self._master_keys[name] = _key(PIPELINE_VERSION, spec, code)
+        return key
+
+    def master(self, name):
+        img = self._master_images.get(name)
+        if img is not None:
+            return img
+        spec = self.masters[name]
+        size = spec.get("size", 1024)
+        cached = self.cache_dir / f"master-{self.master_key(name)[:16]}.png"
+        if cached.is_file():
+            img = Image.open(cached)
+            img.load()
+        else:
+            if "source" in spec:
+                img = Image.open(self.root / spec["source"]).convert("RGBA")
+                if img.size != (size, size):
+                    img = img.resize((size, size), Image.LANCZOS)
+            else:
+                img = self.favicon.render_master(size, spec.get("supersample", self.favicon.SUPERSAMPLE),
+                                                 spec.get("font"))
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            img.save(cached, format="PNG")
+            print(f"🔄 Dựng master '{name}' ({size}px) → {cached.name}")
+        self._master_images[name] = img
+        return img
+
+    def sized(self, name, size):
+        img = self._sized.get((name, size))
+        if img is None:
+            self.prepare(name, [size])
+            img = self._sized[(name, size)]
+        return img
+
+    def prepare(self, name, sizes):
+        """Thu nhỏ một lần mọi kích thước còn thiếu của master name."""
+        missing = sorted({s for s in sizes if (name, s) not in self._sized})
+        if missing:
+            for size, img in self.favicon.render_sizes(self.master(name), missing).items():
+                self._sized[(name, size)] = img
+
+    # ── target ──
+    @staticmethod
+    def icon_sizes(target):
+        if target.get("type") == "ico":
+            return list(target["sizes"])
+        if "size" in target:
+            return [target["size"]]
+        side = min(target["width"], target["height"])
+        return [max(1, round(side * target.get("scale", 1.0)))]
+
+    def target_key(self, target):
+        return _key(self.master_key(target["master"]), target)
+
+    def is_fresh(self, target):
+        entry = self.state.get(target["path"])
+        path = self.root / target["path"]
+        if not entry or not path.is_file() or entry.get("key") != self.target_key(target):
+            return False
+        st = path.stat()
+        return entry.get("stat") == [st.st_size, st.st_mtime_ns]
+
+    def build_target(self, target):
+        path = self.root / target["path"]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        name = target["master"]
+        tmp = path.with_name(path.name + ".tmp")
+        if target["type"] == "ico":
+            self.favicon.save_ico({s: self.sized(name, s) for s in target["sizes"]}, tmp)
+        elif target["type"] == "png":
+            icon = self.sized(name, self.icon_sizes(target)[0])
+            if "size" in target:
+                img = icon
+            else:
+                img = Image.new("RGBA", (target["width"], target["height"]), (0, 0, 0, 0))
+                img.paste(icon, ((img.width - icon.width) // 2, (img.height - icon.height) // 2), icon)
+            img.save(tmp, format="PNG", optimize=True)
+        else:
+            raise ValueError(f"Kiểu target không hỗ trợ: {target['type']!r}")
+        os.replace(tmp, path)
+        st = path.stat()
+        self.state[target["path"]] = {"key": self.target_key(target), "stat": [st.st_size, st.st_mtime_ns]}
+
+    def run(self, force=False, only=None, dry_run=False):
+        """Dựng các target cũ/thiếu. Trả về (danh sách đã dựng, số bỏ qua)."""
+        selected = [t for t in self.targets if not only or t["master"] in only]
+        for target in selected:
+            if target["master"] not in self.masters:
+                raise ValueError(f"Target {target['path']} dùng master không có: {target['master']!r}")
+        stale = [t for t in selected if force or not self.is_fresh(t)]
+        if dry_run:
+            return stale, len(selected) - len(stale)
+        by_master = {}
+        for target in stale:
+            by_master.setdefault(target["master"], []).extend(self.icon_sizes(target))
+        for name, sizes in by_master.items():
+            self.prepare(name, sizes)
+        try:
+            for target in stale:
+                self.build_target(target)
+                print(f"✅ {target['path']}")
+        finally:
+            if stale:
+                self._save_state()
+                self._prune_masters()
+        return stale, len(selected) - len(stale)
+
+    def _prune_masters(self):
+        """Xóa master cache không còn ứng với master nào trong manifest."""
+        keep = {f"master-{self.master_key(name)[:16]}.png" for name in self.masters}
+        for path in self.cache_dir.glob("master-*.png"):
+            if path.name not in keep:
+                path.unlink()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dựng icon/logo từ manifest, bỏ qua target không đổi")
+    parser.add_argument("-m", "--manifest", default=str(DEFAULT_MANIFEST), help="File manifest JSON")
+    parser.add_argument("--force", action="store_true", help="Dựng lại mọi target")
+    parser.add_argument("--only", action="append", help="Chỉ dựng target của master này (lặp được)")
+    parser.add_argument("--list", action="store_true", help="Chỉ liệt kê target cần dựng lại")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.manifest):
+        print(f"❌ Không tìm thấy manifest: {args.manifest}")
+        sys.exit(1)
+    pipeline = IconPipeline(args.manifest)
+    try:
+        built, skipped = pipeline.run(force=args.force, only=args.only, dry_run=args.list)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if args.list:
+        for target in built:
+            print(f"🔄 {target['path']}  ({target['master']}, {target['type']})")
+        print(f"📂 {len(built)} target cần dựng, {skipped} không đổi")
+    else:
+        print(f"🎉 Đã dựng {len(built)} target, bỏ qua {skipped} target không đổi")
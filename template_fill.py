@@ -0,0 +1,415 @@
+"""
+Điền template hàng loạt: template-store.json × dữ liệu CSV/JSONL → Markdown/DOCX
+
+- Mỗi template được biên dịch MỘT lần thành kế hoạch điền (FillPlan): các đoạn chữ
+  cố định xen kẽ vị trí placeholder [Họ và tên], [Địa danh]... → điền một hàng chỉ
+  là nối chuỗi, không regex/replace lặp lại.
+- DOCX: template được dựng một lần bằng helper của docs/demo/convert_to_word.py
+  (setup_page, add_para) thành bộ khung .docx; word/document.xml được cắt sẵn tại
+  các placeholder, các part khác giữ nguyên byte → mỗi hàng chỉ ghi lại zip.
+- Dữ liệu đọc dạng luồng (CSV/JSONL), kiểm tra required_fields của template,
+  chia lô gửi vào process pool; số lô đang chạy có giới hạn nên bộ nhớ không tăng
+  theo số hàng.
+
+Cột dữ liệu:
+    store_id           template dùng cho hàng (hoặc --template cho cả file)
+    <nhãn placeholder> "Họ và tên", "Địa danh", "XÃ/PHƯỜNG/THỊ TRẤN"... — khớp đúng
+                       nhãn trước, sau đó không phân biệt hoa thường
+    <required_fields>  from_org, person_name... — bắt buộc có giá trị; --map ánh xạ
+                       field → nhãn (vd {"person_name": "Họ và tên"})
+Placeholder không có dữ liệu (kể cả ô trống [  ]) được giữ nguyên.
+
+Cách dùng:
+    python template_fill.py dieu-dong.csv --template store-cv-dieu-dong -o out/
+    python template_fill.py rows.jsonl -o out/ --format md,docx -j 8 \\
+        --map field-map.json --name "{store_id}-{person_name}"
+    python template_fill.py --plan store-cv-dieu-dong       # xem các placeholder
+
+    from template_fill import compile_plan, fill_text
+    plan = compile_plan(store.get("store-cv-dieu-dong"))
+    text = fill_text(plan, {"Họ và tên": "Nguyễn Văn A"})
+"""
+import os
+import re
+import sys
+import csv
+import json
+import zipfile
+import argparse
+import tempfile
+from io import BytesIO
+from itertools import islice
+from pathlib import Path
+from typing import NamedTuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from template_store import DEFAULT_STORE, TemplateStore
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEMO_DIR = SCRIPT_DIR / "docs" / "demo"
+DEFAULT_NAME = "{store_id}-{index:05d}"
+BATCH_SIZE = 200
+
+_PLACEHOLDER_RE = re.compile(r'\[([^\[\]\n]{1,80})\]')
+# Ký tự vùng riêng (Private Use) đánh dấu slot trong bộ khung DOCX
+_SLOT_OPEN, _SLOT_CLOSE = "\ue000", "\ue001"
+_SLOT_RE = re.compile(f"{_SLOT_OPEN}(\\d+){_SLOT_CLOSE}")
+_XML_INVALID_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+_MD_LINE_ESCAPE_RE = re.compile(r'^([#>+*-]|\d+[.)])')
+_MD_INLINE_ESCAPE_RE = re.compile(r'([\\`*_\[\]<>|])')
+_FILENAME_BAD_RE = re.compile(r'[\\/:*?"<>|\x00-\x1f]+')
+
+
+class FillPlan(NamedTuple):
+    store_id: str
+    literals: tuple    # n+1 đoạn chữ cố định
+    slots: tuple       # n nhãn placeholder (nội dung trong ngoặc vuông)
+    required: tuple    # required_fields của template
+
+
+def compile_plan(template: dict) -> FillPlan:
+    """Quét template_content một lần → các đoạn chữ cố định + vị trí placeholder."""
+    content = template.get("template_content", "")
+    literals, slots, pos = [], [], 0
+    for m in _PLACEHOLDER_RE.finditer(content):
+        literals.append(content[pos:m.start()])
+        slots.append(m.group(1))
+        pos = m.end()
+    literals.append(content[pos:])
+    return FillPlan(template.get("store_id", ""), tuple(literals), tuple(slots),
+                    tuple(template.get("required_fields") or ()))
+
+
+def _fold(key):
+    return str(key).strip().casefold()
+
+
+def resolve_values(plan: FillPlan, row: dict) -> list:
+    """Giá trị cho từng slot: khớp đúng nhãn → khớp không phân biệt hoa thường → giữ [nhãn]."""
+    folded = None
+    values = []
+    for label in plan.slots:
+        value = row.get(label)
+        if value is None or value == "":
+            if folded is None:
+                folded = {_fold(k): v for k, v in row.items() if v not in (None, "")}
+            value = folded.get(_fold(label))
+        values.append(f"[{label}]" if value is None or value == "" else str(value))
+    return values
+
+
+def missing_fields(plan: FillPlan, row: dict, field_map=None) -> list:
+    """required_fields chưa có giá trị (tính cả nhãn được --map ánh xạ tới)."""
+    field_map = field_map or {}
+    missing = []
+    for field in plan.required:
+        value = row.get(field)
+        if (value is None or str(value).strip() == "") and field in field_map:
+            value = row.get(field_map[field])
+        if value is None or str(value).strip() == "":
+            missing.append(field)
+    return missing
+
+
+def _interleave(literals, values):
+    parts = [literals[0]]
+    for value, literal in zip(values, literals[1:]):
+        parts.append(value)
+        parts.append(literal)
+    return "".join(parts)
+
+
+def fill_text(plan: FillPlan, row: dict) -> str:
+    return _interleave(plan.literals, resolve_values(plan, row))
+
+
+# ═══ Markdown ═══
+# Giữ nguyên bố cục dòng của văn bản hành chính: xuống dòng cứng (hai dấu cách cuối
+# dòng), thụt đầu dòng bằng NBSP, thoát ký tự đầu dòng để "-------" hay "- Lưu VT"
+# không thành heading/bullet.
+def _md_line(line):
+    stripped = line.lstrip(" ")
+    indent = "\u00a0" * (len(line) - len(stripped))
+    return indent + _MD_LINE_ESCAPE_RE.sub(r'\\\1', stripped)
+
+
+def to_markdown(text):
+    lines = text.split("\n")
+    out = []
+    for i, line in enumerate(lines):
+        if not line.strip():
+            out.append("")
+            continue
+        nxt = lines[i + 1] if i + 1 < len(lines) else ""
+        out.append(_md_line(line) + ("  " if nxt.strip() else ""))
+    return "\n".join(out).rstrip() + "\n"
+
+
+def fill_markdown(plan: FillPlan, row: dict) -> str:
+    values = [_MD_INLINE_ESCAPE_RE.sub(r'\\\1', v) for v in resolve_values(plan, row)]
+    return to_markdown(_interleave(plan.literals, values))
+
+
+# ═══ DOCX ═══
+class DocxPlan(NamedTuple):
+    base: bytes        # zip đã nén sẵn mọi part trừ word/document.xml
+    segments: tuple    # n+1 đoạn XML cố định của document.xml
+    slot_order: tuple  # chỉ số slot tương ứng giữa các đoạn
+
+
+def compile_docx(plan: FillPlan) -> DocxPlan:
+    """Dựng bộ khung .docx bằng helper convert_to_word (mỗi dòng một đoạn), cắt sẵn document.xml."""
+    if str(DEMO_DIR) not in sys.path:
+        sys.path.insert(0, str(DEMO_DIR))
+    from docx import Document
+    from docx.shared import Pt
+    from docx.oxml.ns import qn
+    from convert_to_word import setup_page, add_para
+
+    marked = _interleave(plan.literals,
+                         [f"{_SLOT_OPEN}{i}{_SLOT_CLOSE}" for i in range(len(plan.slots))])
+    doc = Document()
+    setup_page(doc)
+    for line in marked.split("\n"):
+        add_para(doc, line).paragraph_format.space_after = Pt(0)
+    for t in doc.element.body.iter(qn('w:t')):
+        t.set('{http://www.w3.org/XML/1998/namespace}space', 'preserve')
+    buf = BytesIO()
+    doc.save(buf)
+
+    # Nén các part cố định (styles.xml ~350 KB...) một lần; mỗi văn bản chỉ nén thêm document.xml
+    base = BytesIO()
+    with zipfile.ZipFile(buf) as src, zipfile.ZipFile(base, "w", zipfile.ZIP_DEFLATED) as dst:
+        names = sorted((n for n in src.namelist() if n != "word/document.xml"),
+                       key=lambda n: n != "[Content_Types].xml")
+        for name in names:
+            dst.writestr(name, src.read(name))
+        xml = src.read("word/document.xml").decode("utf-8")
+    pieces = _SLOT_RE.split(xml)
+    return DocxPlan(base.getvalue(), tuple(pieces[0::2]), tuple(int(i) for i in pieces[1::2]))
+
+
+def _xml_text(value):
+    value = _XML_INVALID_RE.sub("", value)
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def write_docx(docx_plan: DocxPlan, plan: FillPlan, row: dict, path):
+    values = [_xml_text(v) for v in resolve_values(plan, row)]
+    xml = _interleave(docx_plan.segments, [values[i] for i in docx_plan.slot_order])
+    buf = BytesIO(docx_plan.base)
+    with zipfile.ZipFile(buf, "a", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("word/document.xml", xml)
+    _write_atomic(path, buf.getvalue())
+
+
+def _write_atomic(path, data: bytes):
+    """Ghi qua file tạm riêng (mkstemp) cùng thư mục rồi os.replace — không job nào dùng chung file tạm."""
+    fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+# ═══ Dữ liệu vào ═══
+def iter_rows(path, delimiter=","):
+    """Đọc luồng từng hàng từ CSV hoặc JSONL (mỗi dòng một object)."""
+    if str(path).lower().endswith((".jsonl", ".ndjson")):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            yield from csv.DictReader(f, delimiter=delimiter)
+
+
+def _format_name(pattern, row, index):
+    """Tên file (không đuôi) cho một hàng; cột không có trong hàng → ValueError."""
+    try:
+        name = pattern.format_map({**row, "index": index})
+    except KeyError as e:
+        raise ValueError(f"--name: hàng không có cột {e.args[0]!r}")
+    except (IndexError, ValueError) as e:
+        raise ValueError(f"--name không hợp lệ: {pattern!r} ({e})")
+    return _FILENAME_BAD_RE.sub("_", name).strip(" .") or f"{index:05d}"
+
+
+def _apply_field_map(row, field_map):
+    """Chép giá trị field sang nhãn placeholder tương ứng (nếu nhãn chưa có giá trị)."""
+    for field, label in field_map.items():
+        if row.get(field) not in (None, "") and row.get(label) in (None, ""):
+            row[label] = row[field]
+
+
+# ═══ Worker ═══
+_store = None
+_plans = {}
+_docx_plans = {}
+_field_map = {}
+
+
+def _init_worker(store_path, field_map, save_index=True):
+    global _store, _field_map
+    _store = TemplateStore(store_path, save_index=save_index)
+    _field_map = field_map or {}
+    _plans.clear()
+    _docx_plans.clear()
+
+
+def _plan_for(store_id):
+    plan = _plans.get(store_id)
+    if plan is None:
+        if store_id not in _store:
+            raise KeyError(f"không có template {store_id!r}")
+        plan = _plans[store_id] = compile_plan(_store.get(store_id))
+    return plan
+
+
+def _fill_batch(batch, output_dir, formats):
+    """batch: [(index, row, tên file)] → [(index, đường dẫn hoặc None, lỗi hoặc None)]."""
+    results = []
+    for index, row, name in batch:
+        store_id = row.get("store_id", "")
+        try:
+            plan = _plan_for(store_id)
+            missing = missing_fields(plan, row, _field_map)
+            if missing:
+                raise ValueError(f"thiếu required_fields: {', '.join(missing)}")
+            base = os.path.join(output_dir, name)
+            if "md" in formats:
+                _write_atomic(f"{base}.md", fill_markdown(plan, row).encode("utf-8"))
+            if "docx" in formats:
+                docx_plan = _docx_plans.get(store_id)
+                if docx_plan is None:
+                    docx_plan = _docx_plans[store_id] = compile_docx(plan)
+                write_docx(docx_plan, plan, row, f"{base}.docx")
+            results.append((index, base, None))
+        except Exception as e:
+            results.append((index, None, str(e)))
+    return results
+
+
+def fill_all(rows, output_dir, store_path=DEFAULT_STORE, formats=("docx",), jobs=1,
+             name_pattern=DEFAULT_NAME, template=None, field_map=None, batch_size=BATCH_SIZE):
+    """
+    Điền mọi hàng của rows (iterable dict). Trả về (số file điền được, [(hàng, lỗi)]).
+    Hàng được đánh số từ 1 theo thứ tự đọc.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    done, errors = 0, []
+    names = {}    # tên file (normcase) → hàng đầu tiên dùng tên đó
+
+    def batches():
+        # Tên file tính ở tiến trình chính: phát hiện được hai hàng trùng tên
+        # (ghi đè lẫn nhau) dù chúng nằm ở hai lô/hai worker khác nhau.
+        numbered = enumerate(rows, 1)
+        while True:
+            chunk = list(islice(numbered, batch_size))
+            if not chunk:
+                return
+            batch = []
+            for index, row in chunk:
+                if template and not row.get("store_id"):
+                    row["store_id"] = template
+                _apply_field_map(row, field_map or {})
+                try:
+                    name = _format_name(name_pattern, row, index)
+                except ValueError as e:
+                    errors.append((index, str(e)))
+                    continue
+                first = names.setdefault(os.path.normcase(name), index)
+                if first != index:
+                    errors.append((index, f"trùng tên file {name!r} với hàng {first} — sửa --name"))
+                    continue
+                batch.append((index, row, name))
+            if batch:
+                yield batch
+
+    def collect(results):
+        nonlocal done
+        for index, base, error in results:
+            if error:
+                errors.append((index, error))
+            else:
+                done += 1
+
+    if jobs <= 1:
+        _init_worker(str(store_path), field_map)
+        for batch in batches():
+            collect(_fill_batch(batch, output_dir, formats))
+        return done, errors
+
+    # Dựng/ghi index cache một lần ở tiến trình cha; worker chỉ đọc, không ghi đè lẫn nhau
+    TemplateStore(store_path)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(str(store_path), field_map, False)) as pool:
+        pending = set()
+        for batch in batches():
+            # Giới hạn số lô đang chờ để không đọc hết file dữ liệu vào bộ nhớ
+            if len(pending) >= jobs * 2:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    collect(fut.result())
+            pending.add(pool.submit(_fill_batch, batch, output_dir, formats))
+        for fut in pending:
+            collect(fut.result())
+    return done, errors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Điền template hàng loạt → Markdown/DOCX")
+    parser.add_argument("data", nargs="?", help="File dữ liệu .csv hoặc .jsonl")
+    parser.add_argument("--store", default=str(DEFAULT_STORE), help="Đường dẫn template-store.json")
+    parser.add_argument("-t", "--template", help="store_id dùng cho mọi hàng không có cột store_id")
+    parser.add_argument("-o", "--output-dir", default="filled", help="Thư mục ghi kết quả")
+    parser.add_argument("--format", default="docx", help="md, docx hoặc md,docx")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Số tiến trình")
+    parser.add_argument("--name", default=DEFAULT_NAME, help=f'Mẫu tên file (mặc định "{DEFAULT_NAME}")')
+    parser.add_argument("--map", help="JSON ánh xạ required field → nhãn placeholder")
+    parser.add_argument("--delimiter", default=",", help="Ký tự phân cách CSV")
+    parser.add_argument("--plan", metavar="STORE_ID", help="In các placeholder của một template rồi thoát")
+    args = parser.parse_args()
+
+    if not Path(args.store).is_file():
+        print(f"❌ Không tìm thấy store: {args.store}")
+        sys.exit(1)
+    if args.plan:
+        store = TemplateStore(args.store)
+        if args.plan not in store:
+            print(f"❌ Không có template: {args.plan}")
+            sys.exit(1)
+        plan = compile_plan(store.get(args.plan))
+        labels = sorted(set(plan.slots), key=plan.slots.index)
+        print(f"🔎 {plan.store_id}: {len(plan.slots)} placeholder, {len(labels)} nhãn")
+        for label in labels:
+            print(f"  [{label}] × {plan.slots.count(label)}")
+        print(f"  required_fields: {', '.join(plan.required) or '(không có)'}")
+        sys.exit(0)
+    if not args.data or not os.path.isfile(args.data):
+        print(f"❌ Không tìm thấy file dữ liệu: {args.data}")
+        sys.exit(1)
+    formats = tuple(f.strip() for f in args.format.split(",") if f.strip())
+    if not formats or set(formats) - {"md", "docx"}:
+        print(f"❌ --format chỉ nhận md, docx: {args.format}")
+        sys.exit(1)
+    field_map = {}
+    if args.map:
+        with open(args.map, encoding="utf-8") as f:
+            field_map = json.load(f)
+
+    done, errors = fill_all(iter_rows(args.data, args.delimiter), args.output_dir, args.store,
+                            formats, args.jobs, args.name, args.template, field_map)
+    for index, error in sorted(errors)[:50]:
+        print(f"❌ Hàng {index}: {error}")
+    if len(errors) > 50:
+        print(f"⚠️ ... và {len(errors) - 50} hàng lỗi khác")
+    print(f"🎉 Đã điền {done} văn bản ({', '.join(formats)}) → {args.output_dir}"
+          + (f", {len(errors)} hàng lỗi" if errors else ""))
+    if errors:
+        sys.exit(1)
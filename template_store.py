@@ -0,0 +1,430 @@
+"""
+Thư viện đọc template-store.json theo kiểu index + nạp lười
+
+- Header index gọn (store_id, name, type, category, tags, version, updated_at)
+  được cache ra file cạnh store (template-store.idx.json) → mở store chỉ đọc index,
+  lọc theo type/category/tag không phải parse template_content/ai_prompt.
+- Thân template nạp lười theo byte offset (seek + read đúng một object JSON).
+- refresh(): khi file đổi (store_version/updated_at/mtime) chỉ parse lại các
+  template có nội dung đổi (so digest từng object), template khác giữ nguyên header.
+
+Định dạng template-store.json không đổi — app C# (TemplateStoreService) vẫn đọc như cũ.
+
+Cách dùng:
+    python template_store.py list                          # liệt kê header
+    python template_store.py list --type QuyetDinh --tag "khen thưởng"
+    python template_store.py show store-cv-dieu-dong       # in template_content
+    python template_store.py index                         # build lại index cache
+    python template_store.py diff old.json new.json -o delta.json.gz
+    python template_store.py apply delta.json.gz           # vá store local tại chỗ
+
+    from template_store import TemplateStore
+    store = TemplateStore("template-store.json")
+    for h in store.find(category="Nội vụ"):
+        print(h.store_id, h.name)
+    store.get("store-cv-dieu-dong")["template_content"]
+"""
+
+import os
+import re
+import sys
+import json
+import gzip
+import hashlib
+import tempfile
+import argparse
+from collections import OrderedDict
+from pathlib import Path
+from typing import NamedTuple
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_STORE = SCRIPT_DIR / "template-store.json"
+INDEX_SUFFIX = ".idx.json"
+INDEX_VERSION = 1
+DELTA_VERSION = 1
+BODY_CACHE_SIZE = 64
+
+# Token JSON đủ để lần cấu trúc: chuỗi (bỏ qua nội dung), ngoặc, dấu ':'
+_TOKEN_RE = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\]:]', re.DOTALL)
+
+
+class TemplateHeader(NamedTuple):
+    store_id: str
+    name: str
+    type: str
+    category: str
+    tags: tuple
+    version: int
+    updated_at: str
+    offset: int     # byte offset của object trong file store
+    length: int     # số byte của object
+    digest: str     # blake2b của object (bỏ khoảng trắng) — để biết template nào đổi
+
+
+class StoreLayout(NamedTuple):
+    meta: dict      # các khóa top-level trừ "templates" (store_version, updated_at, ...)
+    spans: list     # [(offset, length)] của từng template theo thứ tự trong file
+
+
+def scan_store(data: bytes) -> StoreLayout:
+    """Tìm byte span của từng object trong mảng "templates" mà không parse thân template."""
+    depth = 0
+    key = None
+    last_string = None
+    array_start = array_end = None
+    obj_start = None
+    spans = []
+    for m in _TOKEN_RE.finditer(data):
+        tok = m.group()
+        c = tok[:1]
+        if c == b'"':
+            last_string = tok
+        elif c == b':':
+            if depth == 1:
+                key = last_string
+        elif c in b'{[':
+            if depth == 1 and c == b'[' and key == b'"templates"':
+                array_start = m.start()
+            elif depth == 2 and array_start is not None and array_end is None and c == b'{':
+                obj_start = m.start()
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 2 and obj_start is not None and c == b'}':
+                spans.append((obj_start, m.end() - obj_start))
+                obj_start = None
+            elif depth == 1 and array_start is not None and array_end is None:
+                array_end = m.end()
+    if array_start is None or array_end is None:
+        raise ValueError("Không tìm thấy mảng \"templates\" trong store")
+    meta = json.loads(data[:array_start] + b"[]" + data[array_end:])
+    meta.pop("templates", None)
+    return StoreLayout(meta, spans)
+
+
+_WS_OUTSIDE_STRINGS_RE = re.compile(rb'("(?:[^"\\]|\\.)*")|\s+', re.DOTALL)
+
+
+def _digest(raw: bytes) -> str:
+    """Digest của object, bỏ qua khoảng trắng ngoài chuỗi (đổi indent không tính là đổi nội dung)."""
+    compact = _WS_OUTSIDE_STRINGS_RE.sub(lambda m: m.group(1) or b"", raw)
+    return hashlib.blake2b(compact, digest_size=12).hexdigest()
+
+
+def _header_from(raw: bytes, offset: int, digest: str) -> TemplateHeader:
+    t = json.loads(raw)
+    return TemplateHeader(
+        store_id=t.get("store_id", ""), name=t.get("name", ""), type=t.get("type", ""),
+        category=t.get("category", ""), tags=tuple(t.get("tags") or ()),
+        version=int(t.get("version", 1)), updated_at=t.get("updated_at", ""),
+        offset=offset, length=len(raw), digest=digest,
+    )
+
+
+class TemplateStore:
+    """Header index + nạp lười thân template từ một file template-store.json.
+
+    save_index=False: chỉ đọc — vẫn dùng index cache nếu còn khớp nhưng không
+    ghi <store>.idx.json (snapshot bất kỳ, thư mục chỉ đọc).
+    """
+
+    def __init__(self, path=DEFAULT_STORE, index_path=None, cache_size=BODY_CACHE_SIZE, save_index=True):
+        self.path = Path(path)
+        self.index_path = Path(index_path) if index_path else self.path.with_suffix(INDEX_SUFFIX)
+        self.cache_size = cache_size
+        self.save_index = save_index
+        self.meta = {}
+        self.headers = {}           # store_id → TemplateHeader, giữ thứ tự trong file
+        self._stat = None
+        self._bodies = OrderedDict()
+        self._by_type = {}
+        self._by_category = {}
+        self._by_tag = {}
+        if not self._load_index():
+            self.refresh()
+
+    # ── index cache ──
+    def _file_stat(self):
+        st = self.path.stat()
+        return [st.st_size, st.st_mtime_ns]
+
+    def _load_index(self) -> bool:
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if cached.get("index_version") != INDEX_VERSION or cached.get("stat") != self._file_stat():
+            return False
+        self.meta = cached["meta"]
+        self._stat = cached["stat"]
+        self._set_headers(TemplateHeader(*h[:4], tuple(h[4]), *h[5:]) for h in cached["headers"])
+        return True
+
+    def _save_index(self) -> bool:
+        """Ghi index cache qua file tạm riêng (mkstemp): nhiều tiến trình cùng ghi
+        không giẫm lên nhau. Index chỉ là cache — ghi lỗi thì cảnh báo, không dừng."""
+        tmp = None
+        try:
+            fd, tmp = tempfile.mkstemp(suffix=".tmp", prefix=self.index_path.name + ".",
+                                       dir=self.index_path.parent)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"index_version": INDEX_VERSION, "stat": self._stat, "meta": self.meta,
+                           "headers": [list(h) for h in self.headers.values()]},
+                          f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, self.index_path)
+            return True
+        except OSError as e:
+            if tmp and os.path.exists(tmp):
+                os.unlink(tmp)
+            print(f"⚠️ Không ghi được index cache {self.index_path}: {e}", file=sys.stderr)
+            return False
+
+    def _set_headers(self, headers):
+        self.headers = OrderedDict((h.store_id, h) for h in headers)
+        self._by_type, self._by_category, self._by_tag = {}, {}, {}
+        for h in self.headers.values():
+            self._by_type.setdefault(h.type, []).append(h.store_id)
+            self._by_category.setdefault(h.category, []).append(h.store_id)
+            for tag in h.tags:
+                self._by_tag.setdefault(tag.lower(), []).append(h.store_id)
+
+    # ── reload ──
+    @property
+    def store_version(self):
+        return self.meta.get("store_version")
+
+    @property
+    def updated_at(self):
+        return self.meta.get("updated_at")
+
+    def refresh(self, force=False) -> dict:
+        """
+        Đọc lại store nếu file đổi. Chỉ parse các template có digest mới.
+        Trả về {"added": [...], "changed": [...], "removed": [...]} (store_id).
+        """
+        stat = self._file_stat()
+        if not force and stat == self._stat:
+            return {"added": [], "changed": [], "removed": []}
+        data = self.path.read_bytes()
+        layout = scan_store(data)
+        old_by_digest = {h.digest: h for h in self.headers.values()}
+        headers = []
+        for offset, length in layout.spans:
+            raw = data[offset:offset + length]
+            digest = _digest(raw)
+            old = old_by_digest.get(digest)
+            headers.append(old._replace(offset=offset, length=length) if old else _header_from(raw, offset, digest))
+
+        old_ids = self.headers
+        new_ids = {h.store_id: h for h in headers}
+        diff = {
+            "added": [i for i in new_ids if i not in old_ids],
+            "changed": [i for i, h in new_ids.items() if i in old_ids and old_ids[i].digest != h.digest],
+            "removed": [i for i in old_ids if i not in new_ids],
+        }
+        for store_id in diff["changed"] + diff["removed"]:
+            self._bodies.pop(store_id, None)
+        self.meta = layout.meta
+        self._stat = stat
+        self._set_headers(headers)
+        if self.save_index:
+            self._save_index()
+        return diff
+
+    # ── truy vấn ──
+    def __len__(self):
+        return len(self.headers)
+
+    def __contains__(self, store_id):
+        return store_id in self.headers
+
+    def __iter__(self):
+        return iter(self.headers.values())
+
+    def find(self, type: str = None, category: str = None, tag: str = None,
+             text: str = None) -> list:
+        """Lọc header theo type/category/tag (khớp chính xác) và text (chứa trong name)."""
+        ids = None
+        for table, value in ((self._by_type, type), (self._by_category, category),
+                             (self._by_tag, tag.lower() if tag else None)):
+            if value is None:
+                continue
+            found = table.get(value, ())
+            ids = set(found) if ids is None else ids.intersection(found)
+        result = [h for h in self.headers.values() if ids is None or h.store_id in ids]
+        if text:
+            needle = text.lower()
+            result = [h for h in result if needle in h.name.lower()]
+        return result
+
+    def get(self, store_id: str) -> dict:
+        """Object template đầy đủ (đọc đúng span của nó trong file)."""
+        body = self._bodies.get(store_id)
+        if body is not None:
+            self._bodies.move_to_end(store_id)
+            return body
+        header = self.headers[store_id]
+        with open(self.path, "rb") as f:
+            f.seek(header.offset)
+            raw = f.read(header.length)
+        if _digest(raw) != header.digest:
+            # File đã đổi sau lần refresh cuối — nạp lại index rồi đọc lại
+            self.refresh(force=True)
+            return self.get(store_id)
+        body = json.loads(raw)
+        self._bodies[store_id] = body
+        if len(self._bodies) > self.cache_size:
+            self._bodies.popitem(last=False)
+        return body
+
+    def content(self, store_id: str) -> str:
+        return self.get(store_id).get("template_content", "")
+
+
+# ── delta giữa hai snapshot store ──
+def _base_of(meta: dict) -> dict:
+    return {"store_version": meta.get("store_version"), "updated_at": meta.get("updated_at")}
+
+
+def diff_stores(old: TemplateStore, new: TemplateStore) -> dict:
+    """
+    Delta từ snapshot old → new theo store_id/version.
+
+    Template mới hoặc có version khác được gửi nguyên object; template cùng version
+    nhưng nội dung khác (quên tăng version) cũng được gửi. Chỉ thân các template
+    đó được đọc từ new — còn lại so trên header.
+    """
+    upsert = []
+    for h in new:
+        old_h = old.headers.get(h.store_id)
+        if old_h is None or old_h.version != h.version or old_h.digest != h.digest:
+            upsert.append(new.get(h.store_id))
+    remove = [store_id for store_id in old.headers if store_id not in new.headers]
+    delta = {
+        "delta_version": DELTA_VERSION,
+        "base": _base_of(old.meta),
+        "meta": new.meta,
+        "upsert": upsert,
+        "remove": remove,
+    }
+    order = list(new.headers)
+    kept = [i for i in old.headers if i in new.headers]
+    if order != kept + [i for i in order if i not in old.headers]:
+        delta["order"] = order   # chỉ gửi khi thứ tự khác cách áp mặc định
+    return delta
+
+
+def write_delta(delta: dict, path):
+    """Ghi delta (JSON gọn; nén gzip nếu tên file kết thúc .gz)."""
+    data = json.dumps(delta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    path = str(path)
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+def read_delta(path) -> dict:
+    path = str(path)
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        delta = json.loads(f.read())
+    if delta.get("delta_version") != DELTA_VERSION:
+        raise ValueError(f"delta_version không hỗ trợ: {delta.get('delta_version')}")
+    return delta
+
+
+def apply_delta(store_path, delta: dict, force=False) -> dict:
+    """
+    Vá template-store.json tại chỗ (ghi file tạm rồi os.replace).
+
+    Store local phải đúng bản base của delta (store_version + updated_at), trừ khi
+    force=True. Trả về {"upserted": n, "removed": n}.
+    """
+    store_path = Path(store_path)
+    with open(store_path, encoding="utf-8") as f:
+        store = json.load(f)
+    base = _base_of(store)
+    if not force and base != delta["base"]:
+        raise ValueError(f"Store local ({base}) không khớp base của delta ({delta['base']})")
+
+    templates = OrderedDict((t.get("store_id"), t) for t in store.get("templates", []))
+    removed = sum(1 for store_id in delta["remove"] if templates.pop(store_id, None) is not None)
+    for t in delta["upsert"]:
+        templates[t["store_id"]] = t
+    if "order" in delta:
+        templates = OrderedDict((i, templates[i]) for i in delta["order"] if i in templates)
+
+    result = dict(delta["meta"])
+    result["templates"] = list(templates.values())
+    tmp = store_path.with_name(store_path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    os.replace(tmp, store_path)
+    return {"upserted": len(delta["upsert"]), "removed": removed}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Đọc template-store.json qua header index")
+    parser.add_argument("--store", default=str(DEFAULT_STORE), help="Đường dẫn template-store.json")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_list = sub.add_parser("list", help="Liệt kê template (chỉ đọc header)")
+    p_list.add_argument("--type", help="Lọc theo type (CongVan, QuyetDinh, ...)")
+    p_list.add_argument("--category", help="Lọc theo category")
+    p_list.add_argument("--tag", help="Lọc theo tag")
+    p_list.add_argument("--text", help="Tìm trong tên template")
+    p_show = sub.add_parser("show", help="In template_content của một template")
+    p_show.add_argument("store_id")
+    p_show.add_argument("--json", action="store_true", help="In cả object JSON")
+    sub.add_parser("index", help="Build lại index cache")
+    p_diff = sub.add_parser("diff", help="Tạo delta giữa hai snapshot store")
+    p_diff.add_argument("old", help="Snapshot cũ")
+    p_diff.add_argument("new", help="Snapshot mới")
+    p_diff.add_argument("-o", "--output", required=True, help="File delta (.json hoặc .json.gz)")
+    p_apply = sub.add_parser("apply", help="Áp delta vào store local (--store)")
+    p_apply.add_argument("delta", help="File delta (.json hoặc .json.gz)")
+    p_apply.add_argument("--force", action="store_true", help="Bỏ qua kiểm tra base")
+    args = parser.parse_args()
+
+    if args.command == "diff":
+        for path in (args.old, args.new):
+            if not Path(path).is_file():
+                print(f"❌ Không tìm thấy store: {path}")
+                sys.exit(1)
+        delta = diff_stores(TemplateStore(args.old, save_index=False), TemplateStore(args.new, save_index=False))
+        size = write_delta(delta, args.output)
+        full = Path(args.new).stat().st_size
+        print(f"✅ Delta: {len(delta['upsert'])} cập nhật, {len(delta['remove'])} xóa → {args.output} "
+              f"({Path(args.output).stat().st_size:,} byte; JSON {size:,} / store {full:,} byte)")
+        sys.exit(0)
+
+    if not Path(args.store).is_file():
+        print(f"❌ Không tìm thấy store: {args.store}")
+        sys.exit(1)
+    if args.command == "apply":
+        try:
+            stats = apply_delta(args.store, read_delta(args.delta), force=args.force)
+        except (OSError, ValueError) as e:
+            print(f"❌ Không áp được delta: {e}")
+            sys.exit(1)
+        print(f"✅ Đã vá {args.store}: {stats['upserted']} cập nhật, {stats['removed']} xóa")
+        sys.exit(0)
+    store = TemplateStore(args.store)
+
+    if args.command == "index":
+        store.refresh(force=True)
+        print(f"✅ Đã index {len(store)} template (store_version={store.store_version}, "
+              f"updated_at={store.updated_at}) → {store.index_path}")
+    elif args.command == "list":
+        rows = store.find(args.type, args.category, args.tag, args.text)
+        for h in rows:
+            print(f"  {h.store_id:<32} v{h.version:<3} {h.type:<12} {h.category:<14} {h.name}")
+        print(f"📂 {len(rows)}/{len(store)} template")
+    else:
+        if args.store_id not in store:
+            print(f"❌ Không có template: {args.store_id}")
+            sys.exit(1)
+        body = store.get(args.store_id)
+        print(json.dumps(body, ensure_ascii=False, indent=2) if args.json else body.get("template_content", ""))